@@ -1,38 +1,81 @@
-from fastapi import FastAPI
-from fastapi.responses import RedirectResponse, HTMLResponse
-from pymongo import MongoClient
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Header, Request
+from fastapi.responses import RedirectResponse, HTMLResponse, JSONResponse, Response
+from motor.motor_asyncio import AsyncIOMotorClient
 from dotenv import load_dotenv
 from cryptography.fernet import Fernet
-import os, requests, time
+import asyncio, json, os, time
+import httpx
+
+from webhook_signing import repo_webhook_secret, verify_signature
 
 # Load environment variables
 load_dotenv()
 
-app = FastAPI()
-mongo = MongoClient(os.getenv("MONGO_URI"))
-users = mongo.gitbot.users
-
 CLIENT_ID = os.getenv("GITHUB_CLIENT_ID")
 CLIENT_SECRET = os.getenv("GITHUB_CLIENT_SECRET")
 BACKEND = os.getenv("BACKEND_URL")
 ENCRYPTION_KEY = os.getenv("ENCRYPTION_KEY")
+MONGO_URI = os.getenv("MONGO_URI")
+MONGO_DB = os.getenv("MONGO_DB", "gitbot")
+
+# Overridable so the backend can be pointed at a local GitHub stand-in
+GITHUB_OAUTH_URL = os.getenv("GITHUB_OAUTH_URL", "https://github.com/login/oauth")
+GITHUB_API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com")
+
+HTTP_MAX_CONNECTIONS = int(os.getenv("BACKEND_HTTP_MAX_CONNECTIONS", "100"))
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "50"))
+
+# Webhook fan-out: each repository's hook secret is derived from this one, and the bot token posts to Discord
+WEBHOOK_SECRET = os.getenv("GITHUB_WEBHOOK_SECRET")
+DISCORD_BOT_TOKEN = os.getenv("TOKEN")
+DISCORD_API_URL = os.getenv("DISCORD_API_URL", "https://discord.com/api/v10")
+WEBHOOK_QUEUE_SIZE = int(os.getenv("WEBHOOK_QUEUE_SIZE", "1000"))
+# Events arriving within this window are sent to each channel together
+WEBHOOK_BATCH_WINDOW = float(os.getenv("WEBHOOK_BATCH_WINDOW", "2"))
+WEBHOOK_EVENTS = ("push", "pull_request", "issues", "release")
+DISCORD_MAX_EMBEDS = 10
 
 fernet = Fernet(ENCRYPTION_KEY)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One pooled HTTP client and one Mongo pool for the lifetime of the process
+    app.state.http = httpx.AsyncClient(
+        timeout=15,
+        limits=httpx.Limits(max_connections=HTTP_MAX_CONNECTIONS, max_keepalive_connections=HTTP_MAX_CONNECTIONS),
+    )
+    app.state.mongo = AsyncIOMotorClient(MONGO_URI, maxPoolSize=MONGO_MAX_POOL_SIZE)
+    app.state.users = app.state.mongo[MONGO_DB].users
+    app.state.webhook_subscriptions = app.state.mongo[MONGO_DB].webhook_subscriptions
+    app.state.webhook_queue = asyncio.Queue(WEBHOOK_QUEUE_SIZE)
+    app.state.webhook_deliveries = OrderedDict()
+    worker = asyncio.create_task(fan_out(app))
+    yield
+    worker.cancel()
+    await app.state.http.aclose()
+    app.state.mongo.close()
+
+app = FastAPI(lifespan=lifespan)
+
 @app.get("/auth")
-def auth(discord: str):
+async def auth(discord: str):
     redirect_uri = f"https://{BACKEND}/callback?discord={discord}"
     auth_url = (
-        f"https://github.com/login/oauth/authorize"
+        f"{GITHUB_OAUTH_URL}/authorize"
         f"?client_id={CLIENT_ID}&redirect_uri={redirect_uri}&scope=repo"
     )
     return RedirectResponse(auth_url)
 
 @app.get("/callback")
-def callback(code: str, discord: str):
+async def callback(request: Request, code: str, discord: str):
+    http = request.app.state.http
+    users = request.app.state.users
+
     # Step 1: Exchange code for token
-    token_res = requests.post(
-        "https://github.com/login/oauth/access_token",
+    token_res = await http.post(
+        f"{GITHUB_OAUTH_URL}/access_token",
         headers={"Accept": "application/json"},
         data={
             "client_id": CLIENT_ID,
@@ -47,8 +90,8 @@ def callback(code: str, discord: str):
         return HTMLResponse("❌ Failed to get token", status_code=400)
 
     # Step 2: Fetch user info
-    user_res = requests.get(
-        "https://api.github.com/user",
+    user_res = await http.get(
+        f"{GITHUB_API_URL}/user",
         headers={"Authorization": f"token {access_token}"}
     )
     user_json = user_res.json()
@@ -60,7 +103,7 @@ def callback(code: str, discord: str):
     encrypted_token = fernet.encrypt(access_token.encode())
 
     # Step 4: Save encrypted token to DB
-    users.update_one(
+    await users.update_one(
         {"discord_id": discord},
         {
             "$set": {
@@ -76,3 +119,154 @@ def callback(code: str, discord: str):
 
     return RedirectResponse(f"https://thegitbot.vercel.app/auth/complete?discord={user_json['login']}")
 
+@app.post("/webhook")
+async def webhook(
+    request: Request,
+    x_github_event: str = Header(None),
+    x_github_delivery: str = Header(None),
+    x_hub_signature_256: str = Header(None),
+):
+    body = await request.body()
+    # The signature is checked against the secret of the repository the payload names
+    try:
+        payload = json.loads(body)
+        repo = payload["repository"]["full_name"]
+    except (ValueError, KeyError, TypeError):
+        return JSONResponse({"error": "not a repository event"}, status_code=400)
+    if not WEBHOOK_SECRET or not verify_signature(repo_webhook_secret(WEBHOOK_SECRET, repo), body, x_hub_signature_256):
+        return JSONResponse({"error": "bad signature"}, status_code=401)
+    if x_github_event not in WEBHOOK_EVENTS:
+        # Includes GitHub's "ping" on hook creation
+        return Response(status_code=204)
+
+    # GitHub retries and manual redeliveries reuse the delivery ID
+    deliveries = request.app.state.webhook_deliveries
+    if x_github_delivery in deliveries:
+        return Response(status_code=202)
+    try:
+        request.app.state.webhook_queue.put_nowait((x_github_event, payload))
+    except asyncio.QueueFull:
+        # GitHub records the failure, and the delivery can be redelivered later
+        return JSONResponse({"error": "busy"}, status_code=503)
+    if x_github_delivery:
+        deliveries[x_github_delivery] = True
+        if len(deliveries) > WEBHOOK_QUEUE_SIZE:
+            deliveries.popitem(last=False)
+    return Response(status_code=202)
+
+def describe_event(event: str, payload: dict):
+    """Discord embed for a webhook payload, or None for actions not worth posting."""
+    repo = payload["repository"]["full_name"]
+    sender = payload.get("sender", {}).get("login", "someone")
+    action = payload.get("action")
+
+    if event == "push":
+        commits = payload.get("commits") or []
+        if not commits:
+            return None
+        branch = payload["ref"].rpartition("/")[2]
+        lines = [
+            f"[`{commit['id'][:7]}`]({commit['url']}) {commit['message'].splitlines()[0][:80]}"
+            for commit in commits[:5]
+        ]
+        if len(commits) > 5:
+            lines.append(f"...and {len(commits) - 5} more")
+        return {
+            "title": f"[{repo}] {len(commits)} new commit(s) to {branch}",
+            "url": payload.get("compare"),
+            "description": "\n".join(lines),
+            "color": 0x7289DA,
+            "footer": {"text": f"Pushed by {sender}"},
+        }
+    if event == "pull_request":
+        if action not in ("opened", "closed", "reopened", "ready_for_review"):
+            return None
+        pr = payload["pull_request"]
+        if action == "closed" and pr.get("merged"):
+            action = "merged"
+        return {
+            "title": f"[{repo}] Pull request {action}: #{pr['number']} {pr['title']}"[:256],
+            "url": pr["html_url"],
+            "color": 0x6f42c1 if action == "merged" else 0x2ecc71 if action != "closed" else 0xe74c3c,
+            "footer": {"text": f"by {sender}"},
+        }
+    if event == "issues":
+        if action not in ("opened", "closed", "reopened"):
+            return None
+        issue = payload["issue"]
+        return {
+            "title": f"[{repo}] Issue {action}: #{issue['number']} {issue['title']}"[:256],
+            "url": issue["html_url"],
+            "color": 0x2ecc71 if action != "closed" else 0xe74c3c,
+            "footer": {"text": f"by {sender}"},
+        }
+    if event == "release":
+        if action != "published":
+            return None
+        release = payload["release"]
+        return {
+            "title": f"[{repo}] Release published: {release.get('name') or release['tag_name']}"[:256],
+            "url": release["html_url"],
+            "description": (release.get("body") or "")[:500],
+            "color": 0xf1c40f,
+            "footer": {"text": f"by {sender}"},
+        }
+    return None
+
+async def post_embeds(http: httpx.AsyncClient, channel_id: str, embeds: list):
+    url = f"{DISCORD_API_URL}/channels/{channel_id}/messages"
+    headers = {"Authorization": f"Bot {DISCORD_BOT_TOKEN}"}
+    for i in range(0, len(embeds), DISCORD_MAX_EMBEDS):
+        payload = {"embeds": embeds[i:i + DISCORD_MAX_EMBEDS]}
+        # One retry when Discord rate limits the channel
+        for attempt in range(2):
+            res = await http.post(url, headers=headers, json=payload)
+            if res.status_code != 429 or attempt:
+                break
+            await asyncio.sleep(float(res.json().get("retry_after", 1)))
+        if res.status_code >= 400:
+            print(f"[webhook] Posting to channel {channel_id} failed ({res.status_code}): {res.text[:200]}")
+            return
+
+async def fan_out(app: FastAPI):
+    """Drain the webhook queue, grouping events by channel into one message per batch window."""
+    queue = app.state.webhook_queue
+    while True:
+        batch = [await queue.get()]
+        deadline = asyncio.get_running_loop().time() + WEBHOOK_BATCH_WINDOW
+        while True:
+            remaining = deadline - asyncio.get_running_loop().time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+        events = []
+        for event, payload in batch:
+            # One malformed payload only costs its own event
+            try:
+                embed = describe_event(event, payload)
+                if embed is not None:
+                    repository = payload["repository"]
+                    events.append((event, repository["full_name"].lower(), bool(repository.get("private")), embed))
+            except Exception as e:
+                print(f"[webhook] Skipped a {event} event: {type(e).__name__}: {e}")
+        if not events:
+            continue
+
+        try:
+            repos = list({repo for _, repo, _, _ in events})
+            by_channel = {}
+            async for sub in app.state.webhook_subscriptions.find({"repo": {"$in": repos}}, {"_id": 0, "repo": 1, "channel_id": 1, "events": 1, "private": 1}):
+                for event, repo, private, embed in events:
+                    # Private activity only goes to channels whose subscriber was checked against the private repo
+                    if private and not sub.get("private"):
+                        continue
+                    if repo == sub["repo"] and event in sub.get("events", WEBHOOK_EVENTS):
+                        by_channel.setdefault(sub["channel_id"], []).append(embed)
+
+            await asyncio.gather(*(post_embeds(app.state.http, channel_id, embeds) for channel_id, embeds in by_channel.items()))
+        except Exception as e:
+            print(f"[webhook] Dropped a batch of {len(batch)} event(s): {type(e).__name__}: {e}")
@@ -0,0 +1,92 @@
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Bounded mapping that evicts the least recently used entry first."""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+
+    def get(self, key, default=None):
+        try:
+            self._data.move_to_end(key)
+        except KeyError:
+            return default
+        return self._data[key]
+
+    def set(self, key, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        return self._data.pop(key, default)
+
+    def clear(self):
+        self._data.clear()
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+
+class TTLCache(LRUCache):
+    """LRUCache whose entries also expire `ttl` seconds after they are set."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        super().__init__(maxsize)
+        self.ttl = ttl
+
+    def get(self, key, default=None):
+        item = super().get(key)
+        if item is None:
+            return default
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            super().pop(key)
+            return default
+        return value
+
+    def set(self, key, value):
+        super().set(key, (time.monotonic() + self.ttl, value))
+
+    def pop(self, key, default=None):
+        item = super().pop(key)
+        return default if item is None else item[1]
+
+
+class SizedLRUCache(LRUCache):
+    """LRUCache bounded by the total `size(value)` of its entries rather than their count."""
+
+    def __init__(self, max_bytes: int, size=len):
+        super().__init__(maxsize=float("inf"))
+        self.max_bytes = max_bytes
+        self.size = size
+        self.bytes = 0
+
+    def set(self, key, value):
+        self.pop(key)
+        nbytes = self.size(value)
+        if nbytes > self.max_bytes:
+            return
+        super().set(key, value)
+        self.bytes += nbytes
+        while self.bytes > self.max_bytes:
+            _, evicted = self._data.popitem(last=False)
+            self.bytes -= self.size(evicted)
+
+    def pop(self, key, default=None):
+        if key not in self._data:
+            return default
+        value = super().pop(key)
+        self.bytes -= self.size(value)
+        return value
+
+    def clear(self):
+        super().clear()
+        self.bytes = 0
@@ -0,0 +1,60 @@
+import io
+import discord
+from discord import app_commands
+from discord.ext import commands
+import metrics
+
+class Admin(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+
+    @app_commands.command(name="metrics", description="Dump bot metrics (bot owner only)")
+    async def metrics(self, interaction: discord.Interaction):
+        if not await self.bot.is_owner(interaction.user):
+            embed = discord.Embed(title="Error", description="❌ Only the bot owner can use this command.", color=discord.Color.red())
+            return await interaction.response.send_message(embed=embed, ephemeral=True)
+
+        embed = discord.Embed(title="📈 GitBot Metrics", color=discord.Color.blurple())
+
+        rows = []
+        for (command,), series in metrics.command_seconds.values.items():
+            count, total = series[-1], series[-2]
+            rows.append((count, f"`/{command}` – {count} runs, avg {total / count * 1000:.0f} ms"))
+        rows.sort(reverse=True)
+        embed.add_field(name="Commands", value="\n".join(line for _, line in rows[:10]) or "No commands yet.", inline=False)
+
+        upstream = {}
+        for (service, _, status, _), count in metrics.upstream_total.values.items():
+            upstream.setdefault(service, {}).setdefault(str(status), 0)
+            upstream[service][str(status)] += count
+        lines = [f"**{service}** – " + ", ".join(f"{status}: {count}" for status, count in sorted(statuses.items())) for service, statuses in sorted(upstream.items())]
+        embed.add_field(name="Upstream calls", value="\n".join(lines) or "No calls yet.", inline=False)
+
+        cache = self.bot.github.cache.stats()
+        embed.add_field(
+            name="GitHub client",
+            value=f"{cache['hits']} hits, {cache['misses']} misses, {cache['not_modified']} revalidated (304), {self.bot.github.coalesced} coalesced, {cache['entries']} cached responses ({cache['bytes'] / 2**20:.1f} MB)",
+            inline=False,
+        )
+
+        credentials = self.bot.credentials.stats()
+        embed.add_field(
+            name="Credential cache",
+            value=f"{credentials['hits']} hits, {credentials['misses']} misses ({credentials['hit_rate']:.0%}), {credentials['entries']} cached",
+            inline=False,
+        )
+
+        budgets = sorted((remaining, scope, resource) for (scope, resource), remaining in metrics.github_ratelimit_remaining.values.items())
+        lines = [
+            f"`{scope[:8]}/{resource}` – {remaining}/{metrics.github_ratelimit_limit.values.get((scope, resource), '?')} left"
+            for remaining, scope, resource in budgets[:5]
+        ]
+        throttled = sum(metrics.github_ratelimit_throttled.values.values())
+        lines.append(f"{throttled} request(s) waited for quota")
+        embed.add_field(name="GitHub rate limits (lowest first)", value="\n".join(lines), inline=False)
+
+        dump = discord.File(io.BytesIO(metrics.registry.render().encode()), filename="metrics.txt")
+        await interaction.response.send_message(embed=embed, file=dump, ephemeral=True)
+
+async def setup(bot):
+    await bot.add_cog(Admin(bot))
@@ -2,28 +2,24 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 import os
-from motor.motor_asyncio import AsyncIOMotorClient
 
 class Auth(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.client_id = os.getenv("GITHUB_CLIENT_ID")
         self.backend_base_url = os.getenv("BACKEND_BASE_URL", "http://localhost:2000")
-        self.mongo_client = AsyncIOMotorClient(os.getenv("MONGO_URI"))
-        self.users_collection = self.mongo_client.gitbot.users
-        from token_handler import TokenHandler
-        self.token_handler = TokenHandler()
 
     @app_commands.command(name="auth", description="Link your GitHub account with GitBot")
     async def auth(self, interaction: discord.Interaction):
         try:
             await interaction.response.defer(ephemeral=True)
             discord_id = str(interaction.user.id)
-            user = await self.users_collection.find_one({"discord_id": discord_id})
+            self.bot.credentials.invalidate(discord_id)
+            user = await self.bot.credentials.get_user(discord_id)
             if user:
                 await interaction.followup.send(
                     "✅ You are already linked to GitHub user: "
-                    f"`{user.get('github_user', 'unknown')}`",
+                    f"`{user.github_user or 'unknown'}`",
                     ephemeral=True,
                 )
                 return
@@ -55,8 +51,9 @@ class Auth(commands.Cog):
         try:
             await interaction.response.defer(ephemeral=True)
             discord_id = str(interaction.user.id)
-            result = await self.users_collection.delete_one({"discord_id": discord_id})
-            if result.deleted_count:
+            deleted = await self.bot.user_store.delete(discord_id)
+            self.bot.credentials.invalidate(discord_id)
+            if deleted:
                 await interaction.followup.send("✅ You have been unlinked from GitHub.", ephemeral=True)
             else:
                 await interaction.followup.send("ℹ️ You were not linked to any GitHub account.", ephemeral=True)
@@ -2,51 +2,64 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 import httpx
+import re
 from datetime import datetime
 
 COLOR_PURPLE = 0x9b59b6
+SHA_RE = re.compile(r"[0-9a-f]{7,40}")
 
 class CommitInfoCommand(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
+    async def fetch_commit(self, repo, sha):
+        # A commit named by its SHA never changes, so it is kept on disk across restarts;
+        # branch names and other refs always go to GitHub
+        key = f"{repo.lower()}@{sha.lower()}"
+        cacheable = SHA_RE.fullmatch(sha.lower()) is not None
+        if cacheable:
+            data = await self.bot.git_objects.get_json("commit", key)
+            if data is not None:
+                return data
+        r = await self.bot.github.get(f"/repos/{repo}/commits/{sha}")
+        r.raise_for_status()
+        data = r.json()
+        if cacheable and data["sha"].startswith(sha.lower()):
+            data = {"sha": data["sha"], "html_url": data["html_url"], "commit": {"message": data["commit"]["message"], "author": data["commit"]["author"]}}
+            await self.bot.git_objects.put_json("commit", key, data)
+        return data
+
     @app_commands.command(name="commit", description="Shows information about a specific commit in a GitHub repository.")
     @app_commands.describe(repo="The repository in the format `owner/repo` (e.g., `myferr/x3`).", sha="The SHA of the commit.")
     async def commit(self, interaction: discord.Interaction, repo: str, sha: str):
         await interaction.response.defer()
-        headers = {"Accept": "application/vnd.github.v3+json"}
-        async with httpx.AsyncClient() as client:
-            url = f"https://api.github.com/repos/{repo}/commits/{sha}"
-            try:
-                r = await client.get(url, headers=headers)
-                r.raise_for_status()
-            except httpx.HTTPStatusError as e:
-                if e.response.status_code == 404:
-                    await interaction.followup.send(f"Could not find commit with SHA `{sha}` for repository `{repo}`.")
-                else:
-                    await interaction.followup.send(f"An error occurred while fetching the commit: {e}")
-                return
-            except httpx.RequestError as e:
-                await interaction.followup.send(f"An error occurred while making the request: {e}")
-                return
-
-            data = r.json()
+        try:
+            data = await self.fetch_commit(repo, sha)
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 404:
+                await interaction.followup.send(f"Could not find commit with SHA `{sha}` for repository `{repo}`.")
+            else:
+                await interaction.followup.send(f"An error occurred while fetching the commit: {e}")
+            return
+        except httpx.RequestError as e:
+            await interaction.followup.send(f"An error occurred while making the request: {e}")
+            return
 
-            commit_message = data["commit"]["message"]
-            commit_author = data["commit"]["author"]["name"]
-            commit_date = datetime.strptime(data["commit"]["author"]["date"], "%Y-%m-%dT%H:%M:%SZ").strftime("%Y-%m-%d %H:%M:%S UTC")
-            commit_url = data["html_url"]
+        commit_message = data["commit"]["message"]
+        commit_author = data["commit"]["author"]["name"]
+        commit_date = datetime.strptime(data["commit"]["author"]["date"], "%Y-%m-%dT%H:%M:%SZ").strftime("%Y-%m-%d %H:%M:%S UTC")
+        commit_url = data["html_url"]
             
-            embed = discord.Embed(
-                title=f"Commit: {sha[:7]} for {repo}",
-                url=commit_url,
-                description=commit_message,
-                color=COLOR_PURPLE
-            )
-            embed.add_field(name="Author", value=commit_author, inline=True)
-            embed.add_field(name="Date", value=commit_date, inline=True)
+        embed = discord.Embed(
+            title=f"Commit: {sha[:7]} for {repo}",
+            url=commit_url,
+            description=commit_message,
+            color=COLOR_PURPLE
+        )
+        embed.add_field(name="Author", value=commit_author, inline=True)
+        embed.add_field(name="Date", value=commit_date, inline=True)
 
-            await interaction.followup.send(embed=embed)
+        await interaction.followup.send(embed=embed)
 
 async def setup(bot):
     await bot.add_cog(CommitInfoCommand(bot))
@@ -3,15 +3,21 @@
 import discord
 from discord import app_commands
 from discord.ext import commands
-import aiohttp
 import base64
+import io
 import os
-from dotenv import load_dotenv
-from pymongo import MongoClient
-
-load_dotenv()
-mongo = MongoClient(os.getenv("MONGO_URI"))
-GITHUB_API = "https://api.github.com"
+import tempfile
+from typing import Optional
+from caching import SizedLRUCache
+from tree_renderer import TREE_OUTPUT_BUDGET, CompactTree, TreeListing
+
+RAW_MEDIA_TYPE = "application/vnd.github.raw"
+VIEW_PAGE_CHARS = 1900
+# Blobs up to this size are fetched whole and cached; larger ones are streamed
+INLINE_BLOB_BYTES = int(os.getenv("FILE_INLINE_BLOB_BYTES", str(1024 * 1024)))
+ATTACHMENT_MAX_BYTES = int(os.getenv("FILE_ATTACHMENT_MAX_BYTES", str(10 * 1024 * 1024)))
+# Estimated bytes of compact recursive trees kept for /file tree, keyed by commit SHA
+TREE_CACHE_BYTES = int(os.getenv("FILE_TREE_CACHE_BYTES", str(64 * 1024 * 1024)))
 
 class FileModal(discord.ui.Modal):
     def __init__(self, title, repo, path, token, is_edit, default_content=""):
@@ -30,25 +36,21 @@ class FileModal(discord.ui.Modal):
         self.add_item(self.content)
 
     async def on_submit(self, interaction: discord.Interaction):
-        headers = {
-            "Authorization": f"token {self.token}",
-            "Accept": "application/vnd.github+json"
-        }
+        github = interaction.client.github
+        headers = {"Accept": "application/vnd.github+json"}
 
-        url = f"{GITHUB_API}/repos/{self.repo}/contents/{self.path}"
+        url = f"/repos/{self.repo}/contents/{self.path}"
         commit_msg = self.commit_msg.value or ("Edited via GitBot" if self.is_edit else "Created via GitBot")
         branch = self.branch.value
 
         sha = None
         if self.is_edit:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f"{url}?ref={branch}", headers=headers) as r:
-                    if r.status == 200:
-                        data = await r.json()
-                        sha = data.get("sha")
-                    else:
-                        embed = discord.Embed(title="Error", description="❌ Could not fetch file SHA.", color=discord.Color.red())
-                        return await interaction.response.send_message(embed=embed)
+            r = await github.get(f"{url}?ref={branch}", token=self.token, headers=headers)
+            if r.status_code == 200:
+                sha = r.json().get("sha")
+            else:
+                embed = discord.Embed(title="Error", description="❌ Could not fetch file SHA.", color=discord.Color.red())
+                return await interaction.response.send_message(embed=embed)
 
         payload = {
             "message": commit_msg,
@@ -58,32 +60,312 @@ class FileModal(discord.ui.Modal):
         if sha:
             payload["sha"] = sha
 
-        async with aiohttp.ClientSession() as session:
-            async with session.put(url, headers=headers, json=payload) as r:
-                if r.status in (200, 201):
-                    verb = "updated" if self.is_edit else "created"
-                    embed = discord.Embed(title="Success", description=f"✅ Successfully {verb} `{self.path}` on `{branch}`.", color=discord.Color.green())
-                    await interaction.response.send_message(embed=embed)
-                else:
-                    text = await r.text()
-                    embed = discord.Embed(title="GitHub Error", description=f"""❌ GitHub error:
+        r = await github.put(url, token=self.token, headers=headers, json=payload)
+        if r.status_code in (200, 201):
+            verb = "updated" if self.is_edit else "created"
+            embed = discord.Embed(title="Success", description=f"✅ Successfully {verb} `{self.path}` on `{branch}`.", color=discord.Color.green())
+            await interaction.response.send_message(embed=embed)
+        else:
+            text = r.text
+            embed = discord.Embed(title="GitHub Error", description=f"""❌ GitHub error:
 ```
 {text}
 ```""", color=discord.Color.red())
-                    await interaction.response.send_message(embed=embed)
+            await interaction.response.send_message(embed=embed)
+
+
+class TreePaginator(discord.ui.View):
+    def __init__(self, listing, title, truncated=False):
+        super().__init__(timeout=300)
+        self.listing = listing
+        self.title = title
+        self.truncated = truncated
+        self.page_starts = [0]
+        self.page = 0
+        self.text, self.next_start = listing.render(0)
+
+        self.prev_button = discord.ui.Button(label="⏪ Prev", style=discord.ButtonStyle.secondary)
+        self.next_button = discord.ui.Button(label="Next ⏩", style=discord.ButtonStyle.secondary)
+
+        self.prev_button.callback = self.prev_page
+        self.next_button.callback = self.next_page
+
+        self.add_item(self.prev_button)
+        self.add_item(self.next_button)
+
+        self.update_button_states()
+
+    def update_button_states(self):
+        self.prev_button.disabled = self.page <= 0
+        self.next_button.disabled = self.next_start >= len(self.listing)
+
+    def format_embed(self):
+        embed = discord.Embed(title=self.title, description=f"```\n{self.text}\n```", color=discord.Color.blue())
+        start = self.page_starts[self.page]
+        footer = f"Page {self.page + 1} • entries {start + 1}-{self.next_start} of {len(self.listing)}"
+        if self.truncated:
+            footer += " • GitHub truncated this tree"
+        embed.set_footer(text=footer)
+        return embed
+
+    async def show(self, interaction: discord.Interaction, page: int):
+        if page == len(self.page_starts):
+            self.page_starts.append(self.next_start)
+        self.page = page
+        self.text, self.next_start = self.listing.render(self.page_starts[page])
+        self.update_button_states()
+        await interaction.response.edit_message(embed=self.format_embed(), view=self)
+
+    async def prev_page(self, interaction: discord.Interaction):
+        if self.page > 0:
+            await self.show(interaction, self.page - 1)
+        else:
+            await interaction.response.defer()
+
+    async def next_page(self, interaction: discord.Interaction):
+        if self.next_start < len(self.listing):
+            await self.show(interaction, self.page + 1)
+        else:
+            await interaction.response.defer()
+
+
+class LinePages:
+    def __init__(self, lines, first_line, total_lines=None, budget=VIEW_PAGE_CHARS):
+        self.total_lines = total_lines
+        self.pages = []
+        chunk, used, start = [], 0, first_line
+        for number, line in enumerate(lines, first_line):
+            if len(line) >= budget:
+                line = line[:budget - 2] + "…"
+            if chunk and used + len(line) + 1 > budget:
+                self.pages.append((start, number - 1, "\n".join(chunk)))
+                chunk, used, start = [], 0, number
+            chunk.append(line)
+            used += len(line) + 1
+        if chunk:
+            self.pages.append((start, first_line + len(lines) - 1, "\n".join(chunk)))
+
+    def has_next(self, page):
+        return page + 1 < len(self.pages)
+
+    async def page(self, page):
+        first, last, text = self.pages[page]
+        footer = f"Page {page + 1}/{len(self.pages)} • lines {first}-{last}"
+        if self.total_lines is not None:
+            footer += f" of {self.total_lines}"
+        return text, footer
+
+
+class RangePages:
+    # Pages through a large blob with HTTP Range requests, one page-sized slice at a time
+    def __init__(self, cog, repo, entry, token, budget=VIEW_PAGE_CHARS):
+        self.cog = cog
+        self.repo = repo
+        self.entry = entry
+        self.token = token
+        self.budget = budget
+        self.offsets = [0]
+        self.binary = False
+
+    def has_next(self, page):
+        return page + 1 < len(self.offsets) and self.offsets[page + 1] < self.entry["size"]
+
+    async def page(self, page):
+        start = self.offsets[page]
+        data = await self.cog.read_range(self.repo, self.entry["sha"], start, self.budget, self.token)
+        if data is None:
+            return None
+        if page == 0 and b"\0" in data:
+            self.binary = True
+        end = len(data)
+        if start + end < self.entry["size"]:
+            # End the page on a line break, or at least on a UTF-8 character boundary
+            newline = data.rfind(b"\n")
+            if newline != -1:
+                end = newline + 1
+            else:
+                while end > 1 and data[end - 1] & 0xC0 == 0x80:
+                    end -= 1
+                if end > 1 and data[end - 1] >= 0xC0:
+                    end -= 1
+        if page + 1 == len(self.offsets):
+            self.offsets.append(start + end)
+        text = data[:end].decode(errors="replace").rstrip("\n")
+        return text, f"Page {page + 1} • bytes {start + 1}-{start + end} of {self.entry['size']}"
+
+
+class FileViewPaginator(discord.ui.View):
+    def __init__(self, source, title, extension):
+        super().__init__(timeout=300)
+        self.source = source
+        self.title = title
+        self.extension = extension
+        self.page = 0
+        self.text = ""
+        self.footer = ""
+
+        self.prev_button = discord.ui.Button(label="⏪ Prev", style=discord.ButtonStyle.secondary)
+        self.next_button = discord.ui.Button(label="Next ⏩", style=discord.ButtonStyle.secondary)
+
+        self.prev_button.callback = self.prev_page
+        self.next_button.callback = self.next_page
+
+        self.add_item(self.prev_button)
+        self.add_item(self.next_button)
+
+    async def load(self, page):
+        result = await self.source.page(page)
+        if result is None:
+            return False
+        self.page = page
+        self.text, self.footer = result
+        self.prev_button.disabled = self.page <= 0
+        self.next_button.disabled = not self.source.has_next(self.page)
+        return True
+
+    def format_embed(self):
+        embed = discord.Embed(title=self.title, description=f"```{self.extension}\n{self.text}\n```", color=discord.Color.blue())
+        embed.set_footer(text=self.footer)
+        return embed
+
+    async def show(self, interaction: discord.Interaction, page: int):
+        await interaction.response.defer()
+        if not await self.load(page):
+            return await interaction.followup.send("❌ Could not fetch this part of the file.", ephemeral=True)
+        await interaction.edit_original_response(embed=self.format_embed(), view=self)
+
+    async def prev_page(self, interaction: discord.Interaction):
+        if self.page > 0:
+            await self.show(interaction, self.page - 1)
+        else:
+            await interaction.response.defer()
+
+    async def next_page(self, interaction: discord.Interaction):
+        if self.source.has_next(self.page):
+            await self.show(interaction, self.page + 1)
+        else:
+            await interaction.response.defer()
 
 
 class File(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        from token_handler import TokenHandler
-        self.token_handler = TokenHandler()
+        self.trees = SizedLRUCache(TREE_CACHE_BYTES, size=lambda tree: tree.nbytes)
 
     file_group = app_commands.Group(name="file", description="Manage GitHub repository files")
 
     async def get_user_token(self, discord_id: int):
-        user = mongo.gitbot.users.find_one({"discord_id": str(discord_id)})
-        return self.token_handler.decrypt(user.get("token")) if user and user.get("token") else None
+        return await self.bot.credentials.get_token(discord_id)
+
+    async def resolve_commit(self, repo: str, ref: str, token: str):
+        # The sha media type returns just the commit SHA, and is revalidated with a cheap 304
+        r = await self.bot.github.get(f"/repos/{repo}/commits/{ref}", token=token, headers={"Accept": "application/vnd.github.sha"})
+        if r.status_code != 200:
+            return None, r.status_code
+        return r.text.strip(), r.status_code
+
+    async def get_tree(self, repo: str, commit_sha: str, token: str):
+        # A commit's tree never changes, so it is parsed once, truncated or not
+        tree = self.trees.get(commit_sha)
+        if tree is not None:
+            return tree
+        data = await self.bot.git_objects.get_json("tree", commit_sha)
+        if data is None:
+            r = await self.bot.github.get(f"/repos/{repo}/git/trees/{commit_sha}?recursive=1", token=token, cache=False)
+            if r.status_code != 200:
+                return None
+            data = r.json()
+            await self.bot.git_objects.put("tree", commit_sha, r.content)
+        tree = CompactTree(data)
+        self.trees.set(commit_sha, tree)
+        return tree
+
+    async def find_blob(self, repo: str, ref: str, path: str, token: str):
+        # One contents call names the blob SHA; the response cache revalidates it with an ETag
+        r = await self.bot.github.get(f"/repos/{repo}/contents/{path.strip('/')}?ref={ref}", token=token, headers={"Accept": "application/vnd.github+json"})
+        data = r.json() if r.status_code == 200 else None
+        if isinstance(data, dict) and data.get("type") == "file":
+            return data
+        return None
+
+    async def get_blob(self, repo: str, entry: dict, token: str):
+        data = await self.bot.git_objects.get("blob", entry["sha"])
+        if data is None:
+            if entry.get("encoding") == "base64" and entry.get("content"):
+                # The contents API inlines files up to 1 MB, which saves fetching the blob again
+                data = base64.b64decode(entry["content"])
+            else:
+                r = await self.bot.github.get(f"/repos/{repo}/git/blobs/{entry['sha']}", token=token, headers={"Accept": RAW_MEDIA_TYPE}, cache=False)
+                if r.status_code != 200:
+                    return None
+                data = r.content
+            await self.bot.git_objects.put("blob", entry["sha"], data)
+        return data
+
+    async def read_range(self, repo: str, blob_sha: str, start: int, length: int, token: str):
+        headers = {"Accept": RAW_MEDIA_TYPE, "Range": f"bytes={start}-{start + length - 1}"}
+        async with self.bot.github.stream("GET", f"/repos/{repo}/git/blobs/{blob_sha}", token=token, headers=headers) as r:
+            if r.status_code not in (200, 206):
+                return None
+            # A plain 200 means the Range header was ignored; skip ahead on the stream instead
+            skip = start if r.status_code == 200 else 0
+            buf = bytearray()
+            async for chunk in r.aiter_bytes():
+                if skip:
+                    if len(chunk) <= skip:
+                        skip -= len(chunk)
+                        continue
+                    chunk, skip = chunk[skip:], 0
+                buf += chunk
+                if len(buf) >= length:
+                    break
+            return bytes(buf[:length])
+
+    async def read_lines(self, repo: str, blob_sha: str, start_line: int, end_line: Optional[int], token: str):
+        # Stream from the top, keeping only the requested lines and stopping once past them
+        lines = []
+        kept = 0
+        number = 1
+        pending = b""
+        async with self.bot.github.stream("GET", f"/repos/{repo}/git/blobs/{blob_sha}", token=token, headers={"Accept": RAW_MEDIA_TYPE}) as r:
+            if r.status_code != 200:
+                return None
+            async for chunk in r.aiter_bytes():
+                *complete, pending = (pending + chunk).split(b"\n")
+                for line in complete:
+                    if number >= start_line:
+                        lines.append(line.decode(errors="replace"))
+                        kept += len(line) + 1
+                    number += 1
+                    if (end_line is not None and number > end_line) or kept >= INLINE_BLOB_BYTES:
+                        return lines
+        if pending and number >= start_line:
+            lines.append(pending.decode(errors="replace"))
+        return lines
+
+    async def send_attachment(self, interaction: discord.Interaction, repo: str, path: str, entry: dict, token: str):
+        if entry["size"] > ATTACHMENT_MAX_BYTES:
+            embed = discord.Embed(title="Error", description=f"❌ `{path}` is too large to attach ({entry['size']} bytes).", color=discord.Color.red())
+            return await interaction.followup.send(embed=embed)
+
+        if entry["size"] <= INLINE_BLOB_BYTES:
+            data = await self.get_blob(repo, entry, token)
+            fp = io.BytesIO(data) if data is not None else None
+        else:
+            # Spool the download straight to a temp file rather than buffering it in memory
+            fp = tempfile.SpooledTemporaryFile(max_size=INLINE_BLOB_BYTES)
+            async with self.bot.github.stream("GET", f"/repos/{repo}/git/blobs/{entry['sha']}", token=token, headers={"Accept": RAW_MEDIA_TYPE}) as r:
+                if r.status_code == 200:
+                    async for chunk in r.aiter_bytes():
+                        fp.write(chunk)
+                    fp.seek(0)
+                else:
+                    fp.close()
+                    fp = None
+        if fp is None:
+            embed = discord.Embed(title="Error", description="❌ Could not fetch file.", color=discord.Color.red())
+            return await interaction.followup.send(embed=embed)
+        await interaction.followup.send(content=f"📄 `{path}` ({entry['size']} bytes)", file=discord.File(fp, filename=path.rsplit("/", 1)[-1]))
 
     @file_group.command(name="create", description="Create a new file in a repository")
     @app_commands.describe(repo="owner/repo", path="Path to the file")
@@ -102,19 +384,12 @@ class File(commands.Cog):
             embed = discord.Embed(title="Error", description="❌ Link your GitHub account first.", color=discord.Color.red())
             return await interaction.response.send_message(embed=embed)
 
-        headers = {
-            "Authorization": f"token {token}",
-            "Accept": "application/vnd.github+json"
-        }
-        url = f"{GITHUB_API}/repos/{repo}/contents/{path}?ref=main"
-
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers) as r:
-                if r.status != 200:
-                    embed = discord.Embed(title="Error", description="❌ Could not fetch file.", color=discord.Color.red())
-                    return await interaction.response.send_message(embed=embed)
-                data = await r.json()
-                content = base64.b64decode(data["content"]).decode()
+        entry = await self.find_blob(repo, "main", path, token)
+        data = await self.get_blob(repo, entry, token) if entry else None
+        if data is None:
+            embed = discord.Embed(title="Error", description="❌ Could not fetch file.", color=discord.Color.red())
+            return await interaction.response.send_message(embed=embed)
+        content = data.decode(errors="replace")
 
         await interaction.response.send_modal(FileModal("Edit File", repo, path, token, is_edit=True, default_content=content))
 
@@ -126,145 +401,127 @@ class File(commands.Cog):
             embed = discord.Embed(title="Error", description="❌ Link your GitHub account first.", color=discord.Color.red())
             return await interaction.response.send_message(embed=embed)
 
-        headers = {
-            "Authorization": f"token {token}",
-            "Accept": "application/vnd.github+json"
-        }
-        url = f"{GITHUB_API}/repos/{repo}/contents/{path}?ref={branch}"
-
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers) as r:
-                if r.status != 200:
-                    embed = discord.Embed(title="Error", description="❌ File not found.", color=discord.Color.red())
-                    return await interaction.response.send_message(embed=embed)
-                data = await r.json()
-                sha = data.get("sha")
-
-            async with session.delete(f"{GITHUB_API}/repos/{repo}/contents/{path}", headers=headers, json={
-                "message": commit_msg,
-                "sha": sha,
-                "branch": branch
-            }) as r:
-                if r.status == 200:
-                    embed = discord.Embed(title="Success", description="✅ File deleted.", color=discord.Color.green())
-                    await interaction.response.send_message(embed=embed)
-                else:
-                    embed = discord.Embed(title="Error", description="❌ Failed to delete file.", color=discord.Color.red())
-                    await interaction.response.send_message(embed=embed)
+        headers = {"Accept": "application/vnd.github+json"}
+        url = f"/repos/{repo}/contents/{path}?ref={branch}"
+
+        r = await self.bot.github.get(url, token=token, headers=headers)
+        if r.status_code != 200:
+            embed = discord.Embed(title="Error", description="❌ File not found.", color=discord.Color.red())
+            return await interaction.response.send_message(embed=embed)
+        sha = r.json().get("sha")
+
+        r = await self.bot.github.delete(f"/repos/{repo}/contents/{path}", token=token, headers=headers, json={
+            "message": commit_msg,
+            "sha": sha,
+            "branch": branch
+        })
+        if r.status_code == 200:
+            embed = discord.Embed(title="Success", description="✅ File deleted.", color=discord.Color.green())
+            await interaction.response.send_message(embed=embed)
+        else:
+            embed = discord.Embed(title="Error", description="❌ Failed to delete file.", color=discord.Color.red())
+            await interaction.response.send_message(embed=embed)
 
     @file_group.command(name="view", description="View the contents of a file")
-    @app_commands.describe(repo="owner/repo", path="Path to the file", branch="Branch name")
-    async def view(self, interaction: discord.Interaction, repo: str, path: str, branch: str = "main"):
+    @app_commands.describe(
+        repo="owner/repo",
+        path="Path to the file",
+        branch="Branch name",
+        start_line="First line to show",
+        end_line="Last line to show",
+        attach="Send the whole file as an attachment",
+    )
+    async def view(self, interaction: discord.Interaction, repo: str, path: str, branch: str = "main", start_line: Optional[app_commands.Range[int, 1]] = None, end_line: Optional[app_commands.Range[int, 1]] = None, attach: bool = False):
         token = await self.get_user_token(interaction.user.id)
         if not token:
             embed = discord.Embed(title="Error", description="❌ Link your GitHub account first.", color=discord.Color.red())
             return await interaction.response.send_message(embed=embed)
+        if start_line and end_line and end_line < start_line:
+            embed = discord.Embed(title="Error", description="❌ `end_line` must not be before `start_line`.", color=discord.Color.red())
+            return await interaction.response.send_message(embed=embed)
 
-        headers = {
-            "Authorization": f"token {token}",
-            "Accept": "application/vnd.github+json"
-        }
-        url = f"{GITHUB_API}/repos/{repo}/contents/{path}?ref={branch}"
-
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers) as r:
-                if r.status != 200:
-                    embed = discord.Embed(title="Error", description="❌ Could not fetch file.", color=discord.Color.red())
-                    return await interaction.response.send_message(embed=embed)
-                data = await r.json()
-                content = base64.b64decode(data["content"]).decode()
-
-        if len(content) > 1900:
-            content = content[:1900] + "\n... (truncated)"
+        await interaction.response.defer()
+        entry = await self.find_blob(repo, branch, path, token)
+        if entry is None:
+            embed = discord.Embed(title="Error", description="❌ Could not fetch file.", color=discord.Color.red())
+            return await interaction.followup.send(embed=embed)
+        if attach:
+            return await self.send_attachment(interaction, repo, path, entry, token)
+
+        first = start_line or 1
+        if entry["size"] <= INLINE_BLOB_BYTES:
+            data = await self.get_blob(repo, entry, token)
+            if data is not None and b"\0" in data[:8000]:
+                return await self.send_attachment(interaction, repo, path, entry, token)
+            lines = data.decode(errors="replace").splitlines() if data is not None else None
+            total = len(lines) if lines is not None else None
+            if lines is not None:
+                lines = lines[first - 1:end_line]
+            source = LinePages(lines, first, total) if lines is not None else None
+        elif start_line or end_line:
+            lines = await self.read_lines(repo, entry["sha"], first, end_line, token)
+            source = LinePages(lines, first) if lines is not None else None
+        else:
+            source = RangePages(self, repo, entry, token)
+
+        if source is None:
+            embed = discord.Embed(title="Error", description="❌ Could not fetch file.", color=discord.Color.red())
+            return await interaction.followup.send(embed=embed)
+        if isinstance(source, LinePages) and not source.pages:
+            embed = discord.Embed(title="Error", description=f"❌ `{path}` has no lines in that range.", color=discord.Color.red())
+            return await interaction.followup.send(embed=embed)
 
         file_extension = path.split('.')[-1] if '.' in path else ''
-        embed = discord.Embed(title=f"Content of `{path}`", description=f"```{file_extension}\n{content}\n```", color=discord.Color.blue())
-        await interaction.response.send_message(embed=embed)
+        view = FileViewPaginator(source, f"Content of `{path}`", file_extension)
+        if not await view.load(0):
+            embed = discord.Embed(title="Error", description="❌ Could not fetch file.", color=discord.Color.red())
+            return await interaction.followup.send(embed=embed)
+        if getattr(source, "binary", False):
+            return await self.send_attachment(interaction, repo, path, entry, token)
+        await interaction.followup.send(embed=view.format_embed(), view=view)
 
     @file_group.command(name="tree", description="Lists an ASCII styled file tree of the given repository")
-    @app_commands.describe(repo="owner/repo (e.g. myferr/gitbot)", branch="Branch name (default: main)")
-    async def tree(self, interaction: discord.Interaction, repo: str, branch: str = "main"):
+    @app_commands.describe(
+        repo="owner/repo (e.g. myferr/gitbot)",
+        branch="Branch name (default: the repository's default branch)",
+        path="Only show this subdirectory (e.g. src/utils)",
+        pattern="Only show files matching this glob (e.g. *.py)",
+        depth="Maximum depth to show"
+    )
+    async def tree(self, interaction: discord.Interaction, repo: str, branch: Optional[str] = None, path: Optional[str] = None, pattern: Optional[str] = None, depth: Optional[app_commands.Range[int, 1, 50]] = None):
         token = await self.get_user_token(interaction.user.id)
         if not token:
             embed = discord.Embed(title="Error", description="❌ Link your GitHub account first.", color=discord.Color.red())
             return await interaction.response.send_message(embed=embed)
 
-        headers = {
-            "Authorization": f"token {token}",
-            "Accept": "application/vnd.github.v3+json"
-        }
-        
-        # Get the SHA of the default branch's tree
-        repo_url = f"{GITHUB_API}/repos/{repo}"
-        async with aiohttp.ClientSession() as session:
-            async with session.get(repo_url, headers=headers) as r:
-                if r.status != 200:
-                    embed = discord.Embed(title="Error", description=f"❌ Could not fetch repository info for `{repo}`. Status: {r.status}", color=discord.Color.red())
-                    return await interaction.response.send_message(embed=embed)
-                repo_data = await r.json()
-                default_branch = repo_data.get("default_branch", "main") # Use default_branch from repo info
-
-        tree_url = f"{GITHUB_API}/repos/{repo}/git/trees/{default_branch}?recursive=1"
-
-        async with aiohttp.ClientSession() as session:
-            async with session.get(tree_url, headers=headers) as r:
-                if r.status != 200:
-                    embed = discord.Embed(title="Error", description=f"❌ Could not fetch tree for `{repo}` on branch `{default_branch}`. Status: {r.status}", color=discord.Color.red())
-                    return await interaction.response.send_message(embed=embed)
-                tree_data = await r.json()
-
-        tree_output = self.generate_tree_string(tree_data.get("tree", []))
-
-        if len(tree_output) > 1900:
-            tree_output = tree_output[:1900] + "\n... (truncated)"
-
-        embed = discord.Embed(title=f"File Tree for `{repo}`", description=f"```\n{tree_output}\n```", color=discord.Color.blue())
-        await interaction.response.send_message(embed=embed)
-
-    def generate_tree_string(self, tree_data):
-        tree = {}
-        for item in tree_data:
-            path_parts = item["path"].split("/")
-            current_level = tree
-            for part in path_parts:
-                if part not in current_level:
-                    current_level[part] = {}
-                current_level = current_level[part]
-            current_level["_type"] = item["type"]
-
-        def build_ascii_tree_recursive(node, indent_prefix="", is_last_parent=False):
-            output = ""
-            sorted_keys = sorted([k for k in node.keys() if k != "_type"])
-
-            for i, key in enumerate(sorted_keys):
-                is_last_child = (i == len(sorted_keys) - 1)
-                item_type = node[key].get("_type")
-
-                line_prefix = "└── " if is_last_child else "├── "
-                output += f"{indent_prefix}{line_prefix}{key}"
-
-                if item_type == "blob":
-                    output += "\n"
-                else: # It's a directory
-                    output += "/\n"
-                    new_indent_prefix = indent_prefix + ("    " if is_last_parent else "│   ")
-                    output += build_ascii_tree_recursive(node[key], new_indent_prefix, is_last_child)
-            return output
-
-        final_output = ""
-        root_keys = sorted([k for k in tree.keys() if k != "_type"])
-        for i, key in enumerate(root_keys):
-            is_last_root_item = (i == len(root_keys) - 1)
-            item_type = tree[key].get("_type")
-
-            if item_type == "blob":
-                final_output += f"{key}\n"
-            else: # It's a directory
-                final_output += f"{key}/\n"
-                initial_child_indent = "    " if is_last_root_item else "│   "
-                final_output += build_ascii_tree_recursive(tree[key], initial_child_indent, is_last_root_item)
-
-        return final_output
+        await interaction.response.defer()
+        if branch is None:
+            # Get the repository's default branch
+            repo_url = f"/repos/{repo}"
+            r = await self.bot.github.get(repo_url, token=token)
+            if r.status_code != 200:
+                embed = discord.Embed(title="Error", description=f"❌ Could not fetch repository info for `{repo}`. Status: {r.status_code}", color=discord.Color.red())
+                return await interaction.followup.send(embed=embed)
+            repo_data = r.json()
+            branch = repo_data.get("default_branch", "main") # Use default_branch from repo info
+
+        commit_sha, status = await self.resolve_commit(repo, branch, token)
+        tree_data = await self.get_tree(repo, commit_sha, token) if commit_sha else None
+        if tree_data is None:
+            embed = discord.Embed(title="Error", description=f"❌ Could not fetch tree for `{repo}` on branch `{branch}`. Status: {status}", color=discord.Color.red())
+            return await interaction.followup.send(embed=embed)
+
+        listing = TreeListing(tree_data, subdir=path or "", pattern=pattern, max_depth=depth)
+        if not len(listing):
+            embed = discord.Embed(title="Error", description="❌ No files matched.", color=discord.Color.red())
+            return await interaction.followup.send(embed=embed)
+
+        title = f"File Tree for `{repo}`" + (f" (`{path.strip('/')}/`)" if path else "")
+        view = TreePaginator(listing, title, truncated=tree_data.truncated)
+        await interaction.followup.send(embed=view.format_embed(), view=view)
+
+    def generate_tree_string(self, tree_data, budget: int = TREE_OUTPUT_BUDGET):
+        return TreeListing(tree_data).render(0, budget)[0]
 
     async def cog_load(self):
         pass
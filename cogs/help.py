@@ -1,25 +1,14 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-from pymongo import MongoClient
-import os
-
-# Mongo setup (adjust if you're already using a global db client elsewhere)
-MONGO_URI = os.getenv("MONGO_URI")
-mongo = MongoClient(MONGO_URI)
-users_col = mongo.gitbot.users
 
 class Help(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        from token_handler import TokenHandler
-        self.token_handler = TokenHandler()
 
     @app_commands.command(name="help", description="List all GitBot commands")
     async def help(self, interaction: discord.Interaction):
-        token_handler = self.token_handler
-        user = users_col.find_one({"discord_id": str(interaction.user.id)})
-        token = token_handler.decrypt(user.get("token")) if user and user.get("token") else None
+        token = await self.bot.credentials.get_token(interaction.user.id)
         is_authed = bool(token)
 
         auth_status = "✅ You are authenticated!" if is_authed else "❌ You are not authenticated.\nUse `/auth` to link your GitHub account."
@@ -113,10 +102,21 @@ class Help(commands.Cog):
             inline=False
         )
 
+        embed.add_field(
+            name="👀 Watch",
+            value=(
+                "`/watch add` – Post a repo's live activity in this channel.\n"
+                "`/watch remove` – Stop posting a repo's activity.\n"
+                "`/watch list` – List watched repos in this server."
+            ),
+            inline=False
+        )
+
         embed.add_field(
             name="👋 You",
             value=(
                 "`/notifications` – DM your GitHub unread notifications.\n"
+                "`/notify on` / `/notify off` – Get new notifications DMed as they arrive.\n"
                 "/profile` – View a GitHub user's profile information."
             ),
             inline=False
@@ -1,17 +1,15 @@
 import discord
 from discord import app_commands
 from discord.ext import commands
-import httpx
 from datetime import datetime
-from motor.motor_asyncio import AsyncIOMotorClient
-import os
+from records import CommentRecord
 
 COLOR_BLUE = 0x3498db
 
 class CommentPaginator(discord.ui.View):
     def __init__(self, comments, page_size=5):
         super().__init__(timeout=300)
-        self.comments = comments
+        self.comments = [CommentRecord(comment) for comment in comments]
         self.page_size = page_size
         self.page = 0
 
@@ -40,10 +38,7 @@ class CommentPaginator(discord.ui.View):
         end = min(start + self.page_size, len(self.comments))
 
         for comment in self.comments[start:end]:
-            user = comment["user"]["login"]
-            created_at = comment["created_at"][:10]
-            body = comment["body"][:500] + ("..." if len(comment["body"]) > 500 else "")
-            embed.add_field(name=f"{user} — {created_at}", value=body or "*No content*", inline=False)
+            embed.add_field(name=f"{comment.user} — {comment.created_at}", value=comment.body or "*No content*", inline=False)
 
         embed.set_footer(text=f"Showing {start + 1}-{end} of {len(self.comments)}")
         return embed
@@ -77,18 +72,13 @@ class NewIssueModal(discord.ui.Modal, title="Create a New GitHub Issue"):
 
     async def on_submit(self, interaction: discord.Interaction):
         owner, repo_name = self.repo.split('/')
-        url = f"https://api.github.com/repos/{owner}/{repo_name}/issues"
-        headers = {
-            "Authorization": f"token {self.token}",
-            "Accept": "application/vnd.github.v3+json"
-        }
+        url = f"/repos/{owner}/{repo_name}/issues"
         json_data = {
             "title": self.title_input.value,
             "body": self.body_input.value
         }
-        async with httpx.AsyncClient() as client:
-            res = await client.post(url, headers=headers, json=json_data)
-            data = res.json()
+        res = await interaction.client.github.post(url, token=self.token, json=json_data)
+        data = res.json()
 
         if res.status_code == 201:
             await interaction.response.send_message(f"✅ Issue created: [{data['title']}]({data['html_url']})", ephemeral=True)
@@ -99,72 +89,64 @@ class NewIssueModal(discord.ui.Modal, title="Create a New GitHub Issue"):
 class Issue(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.mongo_client = AsyncIOMotorClient(os.getenv("MONGO_URI"))
-        self.users_collection = self.mongo_client.gitbot.users
-        from token_handler import TokenHandler
-        self.token_handler = TokenHandler()
 
     issue_group = app_commands.Group(name="issue", description="Commands for GitHub issues")
 
     async def _fetch_and_display_issue_list(self, interaction: discord.Interaction, owner: str, repo_name: str, state: str):
-        headers = {"Accept": "application/vnd.github.v3+json"}
-        url = f"https://api.github.com/repos/{owner}/{repo_name}/issues?state={state}"
-        async with httpx.AsyncClient() as client:
-            r = await client.get(url, headers=headers)
-            if r.status_code != 200:
-                await interaction.followup.send(f"Could not fetch {state} issues for `{owner}/{repo_name}`. Status: {r.status_code}")
-                return
-            issues_data = r.json()
-
-            if not issues_data:
-                await interaction.followup.send(f"No {state} issues found for `{owner}/{repo_name}`.")
-                return
-
-            embed = discord.Embed(
-                title=f"{state.capitalize()} Issues for {owner}/{repo_name}",
-                color=COLOR_BLUE
-            )
-            for issue_item in issues_data:
-                title = issue_item["title"]
-                number = issue_item["number"]
-                html_url = issue_item["html_url"]
-                user = issue_item["user"]["login"]
-                embed.add_field(name=f"#{number}: {title}", value=f"Opened by {user} ([Link]({html_url}))", inline=False)
-
-            await interaction.followup.send(embed=embed)
+        url = f"/repos/{owner}/{repo_name}/issues?state={state}"
+        r = await self.bot.github.get(url)
+        if r.status_code != 200:
+            await interaction.followup.send(f"Could not fetch {state} issues for `{owner}/{repo_name}`. Status: {r.status_code}")
+            return
+        issues_data = r.json()
+
+        if not issues_data:
+            await interaction.followup.send(f"No {state} issues found for `{owner}/{repo_name}`.")
+            return
+
+        embed = discord.Embed(
+            title=f"{state.capitalize()} Issues for {owner}/{repo_name}",
+            color=COLOR_BLUE
+        )
+        for issue_item in issues_data:
+            title = issue_item["title"]
+            number = issue_item["number"]
+            html_url = issue_item["html_url"]
+            user = issue_item["user"]["login"]
+            embed.add_field(name=f"#{number}: {title}", value=f"Opened by {user} ([Link]({html_url}))", inline=False)
+
+        await interaction.followup.send(embed=embed)
 
     async def _fetch_and_display_single_issue(self, interaction: discord.Interaction, owner: str, repo_name: str, issue_id: int):
-        headers = {"Accept": "application/vnd.github.v3+json"}
-        url = f"https://api.github.com/repos/{owner}/{repo_name}/issues/{issue_id}"
-        async with httpx.AsyncClient() as client:
-            r = await client.get(url, headers=headers)
-            if r.status_code != 200:
-                await interaction.followup.send(f"Could not find issue `#{issue_id}` in `{owner}/{repo_name}`. Status: {r.status_code}")
-                return
-            issue_data = r.json()
-
-            title = issue_data["title"]
-            number = issue_data["number"]
-            user = issue_data["user"]["login"]
-            state = issue_data["state"]
-            html_url = issue_data["html_url"]
-            created_at = datetime.strptime(issue_data["created_at"], "%Y-%m-%dT%H:%M:%SZ").strftime("%Y-%m-%d %H:%M:%S UTC")
-            body = issue_data["body"] if issue_data["body"] else "No description provided."
-            comments = issue_data["comments"]
-
-            embed = discord.Embed(
-                title=f"Issue #{number}: {title}",
-                url=html_url,
-                description=body,
-                color=COLOR_BLUE
-            )
-            embed.add_field(name="Repository", value=f"{owner}/{repo_name}", inline=True)
-            embed.add_field(name="Status", value=state.capitalize(), inline=True)
-            embed.add_field(name="Opened By", value=user, inline=True)
-            embed.add_field(name="Created At", value=created_at, inline=False)
-            embed.add_field(name="Comments", value=str(comments), inline=True)
-
-            await interaction.followup.send(embed=embed)
+        url = f"/repos/{owner}/{repo_name}/issues/{issue_id}"
+        r = await self.bot.github.get(url)
+        if r.status_code != 200:
+            await interaction.followup.send(f"Could not find issue `#{issue_id}` in `{owner}/{repo_name}`. Status: {r.status_code}")
+            return
+        issue_data = r.json()
+
+        title = issue_data["title"]
+        number = issue_data["number"]
+        user = issue_data["user"]["login"]
+        state = issue_data["state"]
+        html_url = issue_data["html_url"]
+        created_at = datetime.strptime(issue_data["created_at"], "%Y-%m-%dT%H:%M:%SZ").strftime("%Y-%m-%d %H:%M:%S UTC")
+        body = issue_data["body"] if issue_data["body"] else "No description provided."
+        comments = issue_data["comments"]
+
+        embed = discord.Embed(
+            title=f"Issue #{number}: {title}",
+            url=html_url,
+            description=body,
+            color=COLOR_BLUE
+        )
+        embed.add_field(name="Repository", value=f"{owner}/{repo_name}", inline=True)
+        embed.add_field(name="Status", value=state.capitalize(), inline=True)
+        embed.add_field(name="Opened By", value=user, inline=True)
+        embed.add_field(name="Created At", value=created_at, inline=False)
+        embed.add_field(name="Comments", value=str(comments), inline=True)
+
+        await interaction.followup.send(embed=embed)
 
     @issue_group.command(name="open", description="Get information on open GitHub issues")
     @app_commands.describe(
@@ -210,9 +192,7 @@ class Issue(commands.Cog):
     async def issue_close(self, interaction: discord.Interaction, repo: str, issue_id: int):
         await interaction.response.defer(ephemeral=True)
 
-        discord_id = str(interaction.user.id)
-        user = await self.users_collection.find_one({"discord_id": discord_id})
-        token = self.token_handler.decrypt(user.get("token")) if user and user.get("token") else None
+        token = await self.bot.credentials.get_token(interaction.user.id)
         if not token:
             await interaction.followup.send("❌ You must link your GitHub account using `/auth` before closing issues.", ephemeral=True)
             return
@@ -223,17 +203,12 @@ class Issue(commands.Cog):
             await interaction.followup.send("Invalid repository format. Use `owner/repo`.", ephemeral=True)
             return
 
-        url = f"https://api.github.com/repos/{owner}/{repo_name}/issues/{issue_id}"
-        headers = {
-            "Authorization": f"token {token}",
-            "Accept": "application/vnd.github.v3+json"
-        }
+        url = f"/repos/{owner}/{repo_name}/issues/{issue_id}"
         json_data = {
             "state": "closed"
         }
-        async with httpx.AsyncClient() as client:
-            res = await client.patch(url, headers=headers, json=json_data)
-            data = res.json()
+        res = await self.bot.github.patch(url, token=token, json=json_data)
+        data = res.json()
 
         if res.status_code == 200 and data.get("state") == "closed":
             await interaction.followup.send(f"✅ Issue #{issue_id} has been closed.", ephemeral=True)
@@ -246,9 +221,7 @@ class Issue(commands.Cog):
         repo="Repository in the form of owner/repo (e.g. myferr/x3)"
     )
     async def issue_new(self, interaction: discord.Interaction, repo: str):
-        discord_id = str(interaction.user.id)
-        user = await self.users_collection.find_one({"discord_id": discord_id})
-        token = self.token_handler.decrypt(user.get("token")) if user and user.get("token") else None
+        token = await self.bot.credentials.get_token(interaction.user.id)
         if not token:
             await interaction.response.send_message("❌ You must link your GitHub account using `/auth` before creating issues.", ephemeral=True)
             return
@@ -266,20 +239,19 @@ class Issue(commands.Cog):
             await interaction.followup.send("Invalid repository format. Use `owner/repo`.")
             return
 
-        url = f"https://api.github.com/repos/{owner}/{repo_name}/issues/{issue_id}/comments"
-        async with httpx.AsyncClient() as client:
-            r = await client.get(url, headers={"Accept": "application/vnd.github.v3+json"})
-            if r.status_code != 200:
-                await interaction.followup.send(f"❌ Failed to fetch comments. ({r.status_code})")
-                return
+        url = f"/repos/{owner}/{repo_name}/issues/{issue_id}/comments"
+        r = await self.bot.github.get(url)
+        if r.status_code != 200:
+            await interaction.followup.send(f"❌ Failed to fetch comments. ({r.status_code})")
+            return
 
-            comments = r.json()
-            if not comments:
-                await interaction.followup.send("💬 No comments found.")
-                return
+        comments = r.json()
+        if not comments:
+            await interaction.followup.send("💬 No comments found.")
+            return
 
-            paginator = CommentPaginator(comments)
-            await interaction.followup.send(embed=paginator.format_embed(), view=paginator)
+        paginator = CommentPaginator(comments)
+        await interaction.followup.send(embed=paginator.format_embed(), view=paginator)
 
 
     @issue_group.command(name="comment", description="Post a comment on a GitHub issue (requires authentication)")
@@ -287,9 +259,7 @@ class Issue(commands.Cog):
     async def issue_comment(self, interaction: discord.Interaction, repo: str, issue_id: int, comment: str):
         await interaction.response.defer(ephemeral=True)
 
-        discord_id = str(interaction.user.id)
-        user = await self.users_collection.find_one({"discord_id": discord_id})
-        token = self.token_handler.decrypt(user.get("token")) if user and user.get("token") else None
+        token = await self.bot.credentials.get_token(interaction.user.id)
         if not token:
             await interaction.followup.send("❌ You must link your GitHub account using `/auth`.", ephemeral=True)
             return
@@ -299,18 +269,12 @@ class Issue(commands.Cog):
             await interaction.followup.send("Invalid repository format. Use `owner/repo`.", ephemeral=True)
             return
 
-        url = f"https://api.github.com/repos/{owner}/{repo_name}/issues/{issue_id}/comments"
-        headers = {
-            "Authorization": f"token {token}",
-            "Accept": "application/vnd.github.v3+json"
-        }
-
-        async with httpx.AsyncClient() as client:
-            r = await client.post(url, headers=headers, json={"body": comment})
-            if r.status_code == 201:
-                await interaction.followup.send("✅ Comment posted successfully.", ephemeral=True)
-            else:
-                await interaction.followup.send(f"❌ Failed to post comment. ({r.status_code})", ephemeral=True)
+        url = f"/repos/{owner}/{repo_name}/issues/{issue_id}/comments"
+        r = await self.bot.github.post(url, token=token, json={"body": comment})
+        if r.status_code == 201:
+            await interaction.followup.send("✅ Comment posted successfully.", ephemeral=True)
+        else:
+            await interaction.followup.send(f"❌ Failed to post comment. ({r.status_code})", ephemeral=True)
 
 
 async def setup(bot):
@@ -1,37 +1,94 @@
 import discord
 from discord import app_commands
 from discord.ext import commands
-import httpx
-from motor.motor_asyncio import AsyncIOMotorClient
-import os
+from notification_poller import NotificationPoller
 
 COLOR_PURPLE = 0x9b59b6
 
+def html_url(api_url):
+    # GitHub API URLs for notifications subject are API URLs; transform to HTML URLs:
+    # For issues/PRs, replace api.github.com/repos/.../issues/123 with github.com/.../issues/123
+    if not api_url:
+        return ""
+    return api_url.replace("api.github.com/repos", "github.com").replace("/pulls/", "/pull/")
+
+def format_notifications(notifications, limit=10, heading="Here are your latest GitHub notifications:"):
+    # Format a message with up to `limit` notifications to avoid spamming
+    lines = []
+    for notif in notifications[:limit]:
+        repo_name = notif["repository"]["full_name"]
+        subject = notif["subject"]["title"]
+        notif_type = notif["subject"]["type"]
+        url = html_url(notif["subject"].get("url"))
+        lines.append(f"- **[{repo_name}]** {notif_type}: [{subject}]({url})")
+
+    message = heading + "\n\n" + "\n".join(lines)
+    if len(notifications) > limit:
+        message += f"\n\nAnd {len(notifications)-limit} more..."
+    return message
+
 class GitHubNotifications(commands.Cog):
+    notify_group = app_commands.Group(name="notify", description="Push new GitHub notifications to your DMs")
+
     def __init__(self, bot):
         self.bot = bot
-        self.users = AsyncIOMotorClient(os.getenv("MONGO_URI")).gitbot.users
-        from token_handler import TokenHandler
-        self.token_handler = TokenHandler()
+        self.poller = NotificationPoller(bot, self.deliver)
+
+    async def cog_load(self):
+        # Cogs load before login, when the poller could not wait for the bot to be ready yet
+        if self.bot.is_ready():
+            self.poller.start()
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        # Fires again after reconnects; start polling only once
+        if self.poller.task is None:
+            self.poller.start()
+
+    async def cog_unload(self):
+        self.poller.stop()
+
+    async def deliver(self, discord_id, notifications):
+        user = self.bot.get_user(int(discord_id)) or await self.bot.fetch_user(int(discord_id))
+        try:
+            await user.send(format_notifications(notifications, heading="🔔 New GitHub notifications:"))
+        except discord.Forbidden:
+            # DMs closed; stop polling rather than retrying every interval
+            await self.poller.unsubscribe(discord_id)
+
+    @notify_group.command(name="on", description="DM me new GitHub notifications as they arrive")
+    async def notify_on(self, interaction: discord.Interaction):
+        await interaction.response.defer(ephemeral=True)
+        if not await self.bot.credentials.get_token(interaction.user.id) or not await self.poller.subscribe(interaction.user.id):
+            await interaction.followup.send("⚠️ You must authenticate first using `/auth`.", ephemeral=True)
+            return
+        await interaction.followup.send("🔔 I'll DM you new GitHub notifications as they arrive. Use `/notify off` to stop.", ephemeral=True)
+
+    @notify_group.command(name="off", description="Stop DMing new GitHub notifications")
+    async def notify_off(self, interaction: discord.Interaction):
+        await interaction.response.defer(ephemeral=True)
+        await self.poller.unsubscribe(interaction.user.id)
+        await interaction.followup.send("🔕 I'll no longer DM you new GitHub notifications.", ephemeral=True)
+
+    @notify_group.command(name="status", description="Show whether new GitHub notifications are DMed to you")
+    async def notify_status(self, interaction: discord.Interaction):
+        subscription = self.poller.subscriptions.get(str(interaction.user.id))
+        if subscription is None:
+            message = "🔕 Notification DMs are off. Use `/notify on` to enable them."
+        else:
+            message = f"🔔 Notification DMs are on; next check <t:{int(subscription.due)}:R>."
+        await interaction.response.send_message(message, ephemeral=True)
 
     @app_commands.command(name="notifications", description="Get your GitHub notifications via DM.")
     async def notifications(self, interaction: discord.Interaction):
         await interaction.response.defer(ephemeral=True)
 
-        user = await self.users.find_one({"discord_id": str(interaction.user.id)})
-        if not user or "token" not in user:
+        token = await self.bot.credentials.get_token(interaction.user.id)
+        if not token:
             await interaction.followup.send("⚠️ You must authenticate first using `/auth`.", ephemeral=True)
             return
 
-        token_handler = self.token_handler
-        token = token_handler.decrypt(user["token"]) if user and user.get("token") else None
-        headers = {
-            "Authorization": f"token {token}",
-            "Accept": "application/vnd.github.v3+json",
-        }
-
-        async with httpx.AsyncClient() as client:
-            res = await client.get("https://api.github.com/notifications", headers=headers)
+        res = await self.bot.github.get("/notifications", token=token)
 
         if res.status_code != 200:
             await interaction.followup.send(f"❌ Failed to fetch notifications (status {res.status_code}).", ephemeral=True)
@@ -42,23 +99,7 @@ class GitHubNotifications(commands.Cog):
             await interaction.followup.send("📭 You have no unread GitHub notifications.", ephemeral=True)
             return
 
-        # Format a message with up to 10 notifications to avoid spamming
-        lines = []
-        for notif in notifications[:10]:
-            repo_name = notif["repository"]["full_name"]
-            subject = notif["subject"]["title"]
-            notif_type = notif["subject"]["type"]
-            url = notif["subject"].get("url") or ""
-            # GitHub API URLs for notifications subject are API URLs; transform to HTML URLs:
-            # For issues/PRs, replace api.github.com/repos/.../issues/123 with github.com/.../issues/123
-            if url:
-                url = url.replace("api.github.com/repos", "github.com").replace("/pulls/", "/pull/")
-                url = url.replace("issues/", "issues/")
-            lines.append(f"- **[{repo_name}]** {notif_type}: [{subject}]({url})")
-
-        message = "Here are your latest GitHub notifications:\n\n" + "\n".join(lines)
-        if len(notifications) > 10:
-            message += f"\n\nAnd {len(notifications)-10} more..."
+        message = format_notifications(notifications)
 
         try:
             await interaction.user.send(message)
@@ -2,11 +2,8 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 from discord.ui import View, Button
-import httpx
 from datetime import datetime
-from motor.motor_asyncio import AsyncIOMotorClient
-import os
-from token_handler import TokenHandler
+from records import CommentRecord
 
 COLOR_BLUE = 0x3498db
 
@@ -14,7 +11,7 @@ COLOR_BLUE = 0x3498db
 class CommentPaginator(discord.ui.View):
     def __init__(self, comments, page_size=5):
         super().__init__(timeout=300)
-        self.comments = comments
+        self.comments = [CommentRecord(comment) for comment in comments]
         self.page_size = page_size
         self.page = 0
 
@@ -43,10 +40,7 @@ class CommentPaginator(discord.ui.View):
         end = min(start + self.page_size, len(self.comments))
 
         for comment in self.comments[start:end]:
-            user = comment["user"]["login"]
-            created_at = comment["created_at"][:10]
-            body = comment["body"][:500] + ("..." if len(comment["body"]) > 500 else "")
-            embed.add_field(name=f"{user} — {created_at}", value=body or "*No content*", inline=False)
+            embed.add_field(name=f"{comment.user} — {comment.created_at}", value=comment.body or "*No content*", inline=False)
 
         embed.set_footer(text=f"Showing {start + 1}-{end} of {len(self.comments)}")
         return embed
@@ -72,62 +66,44 @@ class CommentPaginator(discord.ui.View):
 class PullRequest(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.mongo_client = AsyncIOMotorClient(os.getenv("MONGO_URI"))
-        self.users_collection = self.mongo_client.gitbot.users
-        from token_handler import TokenHandler
-        self.token_handler = TokenHandler()
 
     pr_group = app_commands.Group(name="pr", description="Commands for GitHub pull requests")
 
     async def _fetch_and_display_pr_list(self, interaction: discord.Interaction, owner: str, repo_name: str, state: str):
-        discord_id = str(interaction.user.id)
-        user = await self.users_collection.find_one({"discord_id": discord_id})
-        token = self.token_handler.decrypt(user.get("token")) if user and user.get("token") else None
-
-        headers = {"Accept": "application/vnd.github.v3+json"}
-        if token:
-            headers["Authorization"] = f"token {token}"
-
-        url = f"https://api.github.com/repos/{owner}/{repo_name}/pulls?state={state}"
-        async with httpx.AsyncClient() as client:
-            r = await client.get(url, headers=headers)
-            if r.status_code != 200:
-                await interaction.followup.send(f"Could not fetch {state} pull requests for `{owner}/{repo_name}`. Status: {r.status_code}")
-                return
-            prs_data = r.json()
-
-            if not prs_data:
-                await interaction.followup.send(f"No {state} pull requests found for `{owner}/{repo_name}`.")
-                return
-
-            embed = discord.Embed(
-                title=f"{state.capitalize()} Pull Requests for {owner}/{repo_name}",
-                color=COLOR_BLUE
-            )
-            for pr_item in prs_data:
-                title = pr_item["title"]
-                number = pr_item["number"]
-                html_url = pr_item["html_url"]
-                user_login = pr_item["user"]["login"]
-
-            await interaction.followup.send(embed=embed)
+        token = await self.bot.credentials.get_token(interaction.user.id)
+
+        url = f"/repos/{owner}/{repo_name}/pulls?state={state}"
+        r = await self.bot.github.get(url, token=token)
+        if r.status_code != 200:
+            await interaction.followup.send(f"Could not fetch {state} pull requests for `{owner}/{repo_name}`. Status: {r.status_code}")
+            return
+        prs_data = r.json()
+
+        if not prs_data:
+            await interaction.followup.send(f"No {state} pull requests found for `{owner}/{repo_name}`.")
+            return
+
+        embed = discord.Embed(
+            title=f"{state.capitalize()} Pull Requests for {owner}/{repo_name}",
+            color=COLOR_BLUE
+        )
+        for pr_item in prs_data:
+            title = pr_item["title"]
+            number = pr_item["number"]
+            html_url = pr_item["html_url"]
+            user_login = pr_item["user"]["login"]
+
+        await interaction.followup.send(embed=embed)
 
     async def _fetch_and_display_single_pr(self, interaction: discord.Interaction, owner: str, repo_name: str, pr_id: int):
-        discord_id = str(interaction.user.id)
-        user = await self.users_collection.find_one({"discord_id": discord_id})
-        token = self.token_handler.decrypt(user.get("token")) if user and user.get("token") else None
-
-        headers = {"Accept": "application/vnd.github.v3+json"}
-        if token:
-            headers["Authorization"] = f"token {token}"
-
-        url = f"https://api.github.com/repos/{owner}/{repo_name}/pulls/{pr_id}"
-        async with httpx.AsyncClient() as client:
-            r = await client.get(url, headers=headers)
-            if r.status_code != 200:
-                await interaction.followup.send(f"Could not find pull request `#{pr_id}` in `{owner}/{repo_name}`. Status: {r.status_code}")
-                return
-            pr_data = r.json()
+        token = await self.bot.credentials.get_token(interaction.user.id)
+
+        url = f"/repos/{owner}/{repo_name}/pulls/{pr_id}"
+        r = await self.bot.github.get(url, token=token)
+        if r.status_code != 200:
+            await interaction.followup.send(f"Could not find pull request `#{pr_id}` in `{owner}/{repo_name}`. Status: {r.status_code}")
+            return
+        pr_data = r.json()
 
         title = pr_data["title"]
         number = pr_data["number"]
@@ -200,9 +176,7 @@ class PullRequest(commands.Cog):
     )
     async def pr_merge(self, interaction: discord.Interaction, repo: str, pr_id: int):
         await interaction.response.defer(ephemeral=True)
-        discord_id = str(interaction.user.id)
-        user = await self.users_collection.find_one({"discord_id": discord_id})
-        token = self.token_handler.decrypt(user.get("token")) if user and user.get("token") else None
+        token = await self.bot.credentials.get_token(interaction.user.id)
         if not token:
             await interaction.followup.send("❌ You must link your GitHub account using `/auth` before merging PRs.", ephemeral=True)
             return
@@ -213,14 +187,9 @@ class PullRequest(commands.Cog):
             await interaction.followup.send("Invalid repository format. Use `owner/repo`.", ephemeral=True)
             return
 
-        url = f"https://api.github.com/repos/{owner}/{repo_name}/pulls/{pr_id}/merge"
-        headers = {
-            "Authorization": f"token {token}",
-            "Accept": "application/vnd.github.v3+json"
-        }
-        async with httpx.AsyncClient() as client:
-            res = await client.put(url, headers=headers)
-            data = res.json()
+        url = f"/repos/{owner}/{repo_name}/pulls/{pr_id}/merge"
+        res = await self.bot.github.put(url, token=token)
+        data = res.json()
 
         if res.status_code == 200 and data.get("merged"):
             await interaction.followup.send(f"✅ PR #{pr_id} has been merged successfully.", ephemeral=True)
@@ -237,9 +206,7 @@ class PullRequest(commands.Cog):
     )
     async def pr_close(self, interaction: discord.Interaction, repo: str, pr_id: int):
         await interaction.response.defer(ephemeral=True)
-        discord_id = str(interaction.user.id)
-        user = await self.users_collection.find_one({"discord_id": discord_id})
-        token = self.token_handler.decrypt(user.get("token")) if user and user.get("token") else None
+        token = await self.bot.credentials.get_token(interaction.user.id)
         if not token:
             await interaction.followup.send("❌ You must link your GitHub account using `/auth` before closing PRs.", ephemeral=True)
             return
@@ -250,15 +217,10 @@ class PullRequest(commands.Cog):
             await interaction.followup.send("Invalid repository format. Use `owner/repo`.", ephemeral=True)
             return
 
-        url = f"https://api.github.com/repos/{owner}/{repo_name}/pulls/{pr_id}"
-        headers = {
-            "Authorization": f"token {token}",
-            "Accept": "application/vnd.github.v3+json"
-        }
+        url = f"/repos/{owner}/{repo_name}/pulls/{pr_id}"
         json_data = {"state": "closed"}
-        async with httpx.AsyncClient() as client:
-            res = await client.patch(url, headers=headers, json=json_data)
-            data = res.json()
+        res = await self.bot.github.patch(url, token=token, json=json_data)
+        data = res.json()
 
         if res.status_code == 200 and data.get("state") == "closed":
             await interaction.followup.send(f"✅ PR #{pr_id} has been closed.", ephemeral=True)
@@ -270,9 +232,7 @@ class PullRequest(commands.Cog):
     @app_commands.describe(repo="owner/repo", pr_id="Pull request number", comment="Your comment text")
     async def pr_comment(self, interaction: discord.Interaction, repo: str, pr_id: int, comment: str):
         await interaction.response.defer(ephemeral=True)
-        discord_id = str(interaction.user.id)
-        user = await self.users_collection.find_one({"discord_id": discord_id})
-        token = self.token_handler.decrypt(user.get("token")) if user and user.get("token") else None
+        token = await self.bot.credentials.get_token(interaction.user.id)
         if not token:
             await interaction.followup.send("❌ You must link your GitHub account using `/auth` to comment.", ephemeral=True)
             return
@@ -282,18 +242,12 @@ class PullRequest(commands.Cog):
         except ValueError:
             return await interaction.followup.send("Invalid repository format. Use `owner/repo`.", ephemeral=True)
 
-        url = f"https://api.github.com/repos/{owner}/{repo_name}/issues/{pr_id}/comments"
-        headers = {
-            "Authorization": f"token {token}",
-            "Accept": "application/vnd.github.v3+json"
-        }
-
-        async with httpx.AsyncClient() as client:
-            r = await client.post(url, headers=headers, json={"body": comment})
-            if r.status_code == 201:
-                await interaction.followup.send("✅ Comment posted successfully.", ephemeral=True)
-            else:
-                await interaction.followup.send(f"❌ Failed to post comment. ({r.status_code})", ephemeral=True)
+        url = f"/repos/{owner}/{repo_name}/issues/{pr_id}/comments"
+        r = await self.bot.github.post(url, token=token, json={"body": comment})
+        if r.status_code == 201:
+            await interaction.followup.send("✅ Comment posted successfully.", ephemeral=True)
+        else:
+            await interaction.followup.send(f"❌ Failed to post comment. ({r.status_code})", ephemeral=True)
 
     @pr_group.command(name="comments", description="List comments on a pull request")
     @app_commands.describe(repo="owner/repo", pr_id="Pull request number")
@@ -304,18 +258,17 @@ class PullRequest(commands.Cog):
         except ValueError:
             return await interaction.followup.send("Invalid repository format. Use `owner/repo`.")
 
-        url = f"https://api.github.com/repos/{owner}/{repo_name}/issues/{pr_id}/comments"
-        async with httpx.AsyncClient() as client:
-            r = await client.get(url, headers={"Accept": "application/vnd.github.v3+json"})
-            if r.status_code != 200:
-                return await interaction.followup.send(f"❌ Failed to fetch comments. ({r.status_code})")
+        url = f"/repos/{owner}/{repo_name}/issues/{pr_id}/comments"
+        r = await self.bot.github.get(url)
+        if r.status_code != 200:
+            return await interaction.followup.send(f"❌ Failed to fetch comments. ({r.status_code})")
 
-            comments = r.json()
-            if not comments:
-                return await interaction.followup.send("💬 No comments found.")
+        comments = r.json()
+        if not comments:
+            return await interaction.followup.send("💬 No comments found.")
 
-            paginator = CommentPaginator(comments)
-            await interaction.followup.send(embed=paginator.format_embed(), view=paginator)
+        paginator = CommentPaginator(comments)
+        await interaction.followup.send(embed=paginator.format_embed(), view=paginator)
 
 
 async def setup(bot):
@@ -1,7 +1,6 @@
 import discord
 from discord import app_commands
 from discord.ext import commands
-import httpx
 
 COLOR_ORANGE = 0xe67e22
 
@@ -13,14 +12,12 @@ class Profile(commands.Cog):
     @app_commands.describe(username="The GitHub username of the user you want to look up (e.g., octocat).")
     async def profile(self, interaction: discord.Interaction, username: str):
         await interaction.response.defer()
-        headers = {"Accept": "application/vnd.github.v3+json"}
-        async with httpx.AsyncClient() as client:
-            url = f"https://api.github.com/users/{username}"
-            r = await client.get(url, headers=headers)
-            if r.status_code != 200:
-                await interaction.followup.send(f"Could not find GitHub user `{username}`")
-                return
-            data = r.json()
+        url = f"/users/{username}"
+        r = await self.bot.github.get(url)
+        if r.status_code != 200:
+            await interaction.followup.send(f"Could not find GitHub user `{username}`")
+            return
+        data = r.json()
 
         name = data.get("name") or username
         login = data["login"]
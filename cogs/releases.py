@@ -2,27 +2,52 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 import httpx
-from datetime import datetime
+from github_client import PageCursor
+from github_ratelimit import RateLimitExceeded
+from records import ReleaseRecord
 
 COLOR_PURPLE = 0x9b59b6
+API_PAGE_SIZE = 30
 
 class ReleasePaginator(discord.ui.View):
-    def __init__(self, releases, repo_name):
+    def __init__(self, cursor, releases, repo_name):
         super().__init__(timeout=180)
-        self.releases = releases
+        self.cursor = cursor
+        self.releases = [ReleaseRecord(release) for release in releases]
         self.repo_name = repo_name
         self.current_page = 0
         self.releases_per_page = 5
+        self._prefetch_if_needed()
 
     def _get_page_content(self):
         start_index = self.current_page * self.releases_per_page
         end_index = start_index + self.releases_per_page
         return self.releases[start_index:end_index]
 
+    def _prefetch_if_needed(self):
+        # Start loading the next API page once the user reaches the last buffered page
+        if (self.current_page + 2) * self.releases_per_page > len(self.releases):
+            self.cursor.prefetch()
+
+    def _needs_fetch(self, page):
+        return page * self.releases_per_page >= len(self.releases) and self.cursor.has_more
+
+    async def _load_page(self, page):
+        while self._needs_fetch(page):
+            self.releases.extend(ReleaseRecord(release) for release in await self.cursor.next_page())
+        return page * self.releases_per_page < len(self.releases)
+
+    async def _reply(self, interaction, message):
+        if interaction.response.is_done():
+            await interaction.followup.send(message, ephemeral=True)
+        else:
+            await interaction.response.send_message(message, ephemeral=True)
+
     def _create_embed(self):
         page_releases = self._get_page_content()
+        total = f"/{self.total_pages}" if not self.cursor.has_more else ""
         embed = discord.Embed(
-            title=f"Releases for {self.repo_name} (Page {self.current_page + 1}/{self.total_pages})",
+            title=f"Releases for {self.repo_name} (Page {self.current_page + 1}{total})",
             color=COLOR_PURPLE
         )
         if not page_releases:
@@ -30,11 +55,7 @@ class ReleasePaginator(discord.ui.View):
             return embed
 
         for release in page_releases:
-            release_name = release.get("name", release.get("tag_name", "N/A"))
-            release_tag = release["tag_name"]
-            release_date = datetime.strptime(release["published_at"], "%Y-%m-%dT%H:%M:%SZ").strftime("%Y-%m-%d")
-            release_url = release["html_url"]
-            embed.add_field(name=f"{release_name} ({release_tag})", value=f"Published: {release_date} | [View Release]({release_url})", inline=False)
+            embed.add_field(name=f"{release.name} ({release.tag})", value=f"Published: {release.date} | [View Release]({release.url})", inline=False)
         return embed
 
     @discord.ui.button(label="Previous", style=discord.ButtonStyle.blurple, custom_id="previous_release_page")
@@ -47,11 +68,26 @@ class ReleasePaginator(discord.ui.View):
 
     @discord.ui.button(label="Next", style=discord.ButtonStyle.blurple, custom_id="next_release_page")
     async def next_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if self.current_page < self.total_pages - 1:
-            self.current_page += 1
-            await interaction.response.edit_message(embed=self._create_embed(), view=self)
+        if self._needs_fetch(self.current_page + 1):
+            await interaction.response.defer()
+        try:
+            has_next = await self._load_page(self.current_page + 1)
+        except (httpx.HTTPError, RateLimitExceeded) as e:
+            await self._reply(interaction, f"An error occurred while fetching more releases: {e}")
+            return
+        if not has_next:
+            await self._reply(interaction, "You are on the last page.")
+            return
+
+        self.current_page += 1
+        self._prefetch_if_needed()
+        if interaction.response.is_done():
+            await interaction.edit_original_response(embed=self._create_embed(), view=self)
         else:
-            await interaction.response.send_message("You are on the last page.", ephemeral=True)
+            await interaction.response.edit_message(embed=self._create_embed(), view=self)
+
+    async def on_timeout(self):
+        self.cursor.close()
 
     @property
     def total_pages(self):
@@ -65,39 +101,24 @@ class ReleasesCommand(commands.Cog):
     @app_commands.describe(repo="The repository in the format `owner/repo` (e.g., `myferr/x3`).")
     async def releases(self, interaction: discord.Interaction, repo: str):
         await interaction.response.defer()
-        headers = {"Accept": "application/vnd.github.v3+json"}
-        all_releases = []
-        page = 1
-        while True:
-            async with httpx.AsyncClient() as client:
-                url = f"https://api.github.com/repos/{repo}/releases?per_page=100&page={page}"
-                try:
-                    r = await client.get(url, headers=headers)
-                    r.raise_for_status()
-                except httpx.HTTPStatusError as e:
-                    if e.response.status_code == 404 and page == 1:
-                        await interaction.followup.send(f"Could not find releases for repository `{repo}`. It might not have any releases or the repository does not exist.")
-                        return
-                    elif e.response.status_code == 404: # No more pages
-                        break
-                    else:
-                        await interaction.followup.send(f"An error occurred while fetching releases: {e}")
-                        return
-                except httpx.RequestError as e:
-                    await interaction.followup.send(f"An error occurred while making the request: {e}")
-                    return
-
-                data = r.json()
-                if not data:
-                    break
-                all_releases.extend(data)
-                page += 1
-
-        if not all_releases:
+        cursor = PageCursor(self.bot.github, f"/repos/{repo}/releases?per_page={API_PAGE_SIZE}")
+        try:
+            releases = await cursor.next_page()
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 404:
+                await interaction.followup.send(f"Could not find releases for repository `{repo}`. It might not have any releases or the repository does not exist.")
+            else:
+                await interaction.followup.send(f"An error occurred while fetching releases: {e}")
+            return
+        except httpx.RequestError as e:
+            await interaction.followup.send(f"An error occurred while making the request: {e}")
+            return
+
+        if not releases:
             await interaction.followup.send(f"No releases found for repository `{repo}`.")
             return
 
-        view = ReleasePaginator(all_releases, repo)
+        view = ReleasePaginator(cursor, releases, repo)
         await interaction.followup.send(embed=view._create_embed(), view=view)
 
 async def setup(bot):
@@ -1,10 +1,7 @@
 import discord
 from discord import app_commands
 from discord.ext import commands
-import httpx
 from datetime import datetime
-from motor.motor_asyncio import AsyncIOMotorClient
-import os
 
 COLOR_PURPLE = 0x9b59b6
 
@@ -56,13 +53,7 @@ class RepoCreateModal(discord.ui.Modal, title="Create GitHub Repository"):
         if license_key:
             payload["license_template"] = license_key
 
-        headers = {
-            "Authorization": f"token {self.token}",
-            "Accept": "application/vnd.github+json",
-        }
-
-        async with httpx.AsyncClient() as client:
-            res = await client.post("https://api.github.com/user/repos", headers=headers, json=payload)
+        res = await interaction.client.github.post("/user/repos", token=self.token, json=payload)
 
         if res.status_code == 201:
             repo = res.json()
@@ -83,9 +74,6 @@ class RepoCreateModal(discord.ui.Modal, title="Create GitHub Repository"):
 class RepoCommands(commands.GroupCog, name="repo"):
     def __init__(self, bot):
         self.bot = bot
-        self.users = AsyncIOMotorClient(os.getenv("MONGO_URI")).gitbot.users
-        from token_handler import TokenHandler
-        self.token_handler = TokenHandler()
 
     @app_commands.command(name="view", description="View GitHub repository information.")
     @app_commands.describe(repo="Format `owner/repo`.")
@@ -97,35 +85,30 @@ class RepoCommands(commands.GroupCog, name="repo"):
             await interaction.followup.send("Invalid repository format. Use `owner/repo`.", ephemeral=True)
             return
 
-        url = f"https://api.github.com/repos/{owner}/{name}"
-        headers = {"Accept": "application/vnd.github.v3+json"}
+        url = f"/repos/{owner}/{name}"
+        res = await self.bot.github.get(url)
 
-        async with httpx.AsyncClient() as client:
-            res = await client.get(url, headers=headers)
+        if res.status_code == 404:
+            user = await self.bot.credentials.get_user(interaction.user.id)
+            if not user or not user.token:
+                await interaction.followup.send("Repo not found or private. Use `/auth` to authenticate.", ephemeral=True)
+                return
 
-            if res.status_code == 404:
-                user = await self.users.find_one({"discord_id": str(interaction.user.id)})
-                if not user or "token" not in user:
-                    await interaction.followup.send("Repo not found or private. Use `/auth` to authenticate.", ephemeral=True)
-                    return
+            res = await self.bot.github.get(url, token=user.token)
 
-                token = user["token"]
-                headers["Authorization"] = f"token {token}"
-                res = await client.get(url, headers=headers)
-
-                if res.status_code == 200:
-                    data = res.json()
-                    if data.get("private") and data.get("owner", {}).get("login", "").lower() != user.get("github_user", "").lower():
-                        await interaction.followup.send("This is a private repo and you are not the owner.", ephemeral=True)
-                        return
-                else:
-                    await interaction.followup.send(f"Repo not found. Status: {res.status_code}", ephemeral=True)
+            if res.status_code == 200:
+                data = res.json()
+                if data.get("private") and data.get("owner", {}).get("login", "").lower() != (user.github_user or "").lower():
+                    await interaction.followup.send("This is a private repo and you are not the owner.", ephemeral=True)
                     return
-            elif res.status_code != 200:
-                await interaction.followup.send(f"GitHub API error: {res.status_code}", ephemeral=True)
-                return
             else:
-                data = res.json()
+                await interaction.followup.send(f"Repo not found. Status: {res.status_code}", ephemeral=True)
+                return
+        elif res.status_code != 200:
+            await interaction.followup.send(f"GitHub API error: {res.status_code}", ephemeral=True)
+            return
+        else:
+            data = res.json()
 
         updated = datetime.strptime(data["updated_at"], "%Y-%m-%dT%H:%M:%SZ")
         embed = discord.Embed(
@@ -145,17 +128,13 @@ class RepoCommands(commands.GroupCog, name="repo"):
 
     @app_commands.command(name="create", description="Create a new GitHub repository (modal).")
     async def create(self, interaction: discord.Interaction):
-        user = await self.users.find_one({"discord_id": str(interaction.user.id)})
-        if not user or "token" not in user:
+        token = await self.bot.credentials.get_token(interaction.user.id)
+        if not token:
             await interaction.response.send_message("⚠️ You must authenticate first using `/auth`.", ephemeral=True)
             return
 
-        token_handler = self.token_handler
-        token = token_handler.decrypt(user["token"]) if user and user.get("token") else None
-
         # Fetch license keys to validate input
-        async with httpx.AsyncClient() as client:
-            lic_res = await client.get("https://api.github.com/licenses?per_page=100", headers={"Accept": "application/vnd.github.v3+json"})
+        lic_res = await self.bot.github.get("/licenses?per_page=100")
 
         valid_licenses = set()
         if lic_res.status_code == 200:
@@ -1,32 +1,205 @@
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
 import aiohttp
 import discord
 from discord import app_commands
 from discord.ext import commands
+from caching import LRUCache
+from inference import OLLAMA_MODEL, InferenceQueue, QueueFull, stream_generate
+from review_diff import REVIEW_CHUNK_TOKENS, chunk_diff, parse_diff
+
+# Discord allows roughly five edits per message every five seconds
+REVIEW_EDIT_INTERVAL = float(os.getenv("REVIEW_EDIT_INTERVAL", "1.5"))
+REVIEW_CACHE_SIZE = int(os.getenv("REVIEW_CACHE_SIZE", "512"))
+# Bump whenever a prompt template changes so cached reviews are regenerated
+PROMPT_VERSION = 2
+# Map-reduce PR reviews: at most this many chunks of one review wait for or hold a
+# model slot at once (the inference queue still caps calls overall), at most this many chunks
+REVIEW_MAP_CONCURRENCY = int(os.getenv("REVIEW_MAP_CONCURRENCY", "2"))
+REVIEW_MAX_CHUNKS = int(os.getenv("REVIEW_MAX_CHUNKS", "12"))
+
+
+class ReviewControls(discord.ui.View):
+    def __init__(self, owner_id, task):
+        super().__init__(timeout=None)
+        self.owner_id = owner_id
+        self.task = task
+        self.cancelled = False
+
+        self.cancel_button = discord.ui.Button(label="Cancel", style=discord.ButtonStyle.danger)
+        self.cancel_button.callback = self.cancel
+        self.add_item(self.cancel_button)
+
+    async def cancel(self, interaction: discord.Interaction):
+        if interaction.user.id != self.owner_id:
+            return await interaction.response.send_message("❌ Only the person who asked for this review can cancel it.", ephemeral=True)
+        self.cancelled = True
+        self.task.cancel()
+        await interaction.response.defer()
+
 
 class Review(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.session = None
+        self.queue = InferenceQueue()
+        self.reviews = LRUCache(REVIEW_CACHE_SIZE)
+
+    async def cog_load(self):
         self.session = aiohttp.ClientSession()
 
-    def cog_unload(self):
-        self.bot.loop.create_task(self.session.close())
+    async def cog_unload(self):
+        await self.session.close()
 
     async def fetch_github_json(self, url):
         headers = {"Accept": "application/vnd.github+json"}
-        async with self.session.get(url, headers=headers) as resp:
-            if resp.status != 200:
-                return None
-            return await resp.json()
-
-    async def generate_review(self, prompt: str):
-        async with self.session.post(
-            "http://localhost:11434/api/generate",
-            json={"model": "mistral", "prompt": prompt, "stream": False}
-        ) as resp:
-            if resp.status != 200:
-                return "⚠️ Error generating review."
-            data = await resp.json()
-            return data.get("response", "⚠️ No response from model.")
+        resp = await self.bot.github.get(url, headers=headers)
+        if resp.status_code != 200:
+            return None
+        return resp.json()
+
+    async def fetch_pr_diff(self, repository, number):
+        headers = {"Accept": "application/vnd.github.diff"}
+        async with self.bot.github.stream("GET", f"/repos/{repository}/pulls/{number}", headers=headers) as r:
+            if r.status_code != 200:
+                return None, False
+            return await parse_diff(r.aiter_lines())
+
+    async def generate_in_turn(self, prompt, turn):
+        async with turn():
+            async for piece in stream_generate(self.session, prompt):
+                yield piece
+
+    async def review_diff(self, prompt, chunks, set_status, timings, turn):
+        # Map: review each chunk on its own; reduce: merge the notes into one streamed review.
+        # Every model call takes its own turn in the inference queue, so parallel chunks share its capacity
+        semaphore = asyncio.Semaphore(REVIEW_MAP_CONCURRENCY)
+        done = 0
+
+        async def review_chunk(index, chunk):
+            nonlocal done
+            chunk_prompt = f"""You are reviewing part {index + 1} of {len(chunks)} of a pull request diff. Point out bugs, risky changes and missing tests in this part only. Be concise and name the files you refer to.
+
+```diff
+{chunk}
+```
+
+Notes:"""
+            async with semaphore, turn():
+                notes = "".join([piece async for piece in stream_generate(self.session, chunk_prompt)])
+            done += 1
+            await set_status(f"🔎 Reviewed {done}/{len(chunks)} parts of the diff…")
+            return notes
+
+        started = time.perf_counter()
+        await set_status(f"🔎 Reviewing {len(chunks)} parts of the diff…")
+        tasks = [asyncio.create_task(review_chunk(i, chunk)) for i, chunk in enumerate(chunks)]
+        try:
+            notes = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+        timings["map"] = time.perf_counter() - started
+
+        # Keep the combined notes within one chunk's budget
+        room = REVIEW_CHUNK_TOKENS * 4 // max(len(notes), 1)
+        sections = "\n\n".join(f"Part {i + 1}:\n{note.strip()[:room]}" for i, note in enumerate(notes))
+        reduce_prompt = f"""{prompt}
+
+Notes from reviewing the diff in parts:
+
+{sections}
+
+Combine the details above and the notes into one checklist-style evaluation (✅ / ❌) with suggestions:"""
+
+        started = time.perf_counter()
+        async with turn():
+            await set_status("✍️ Writing the review…")
+            async for piece in stream_generate(self.session, reduce_prompt):
+                yield piece
+        timings["reduce"] = time.perf_counter() - started
+
+    async def run_review(self, interaction: discord.Interaction, title: str, color: discord.Color, cache_key: tuple, generate, timings: dict = None):
+        # Keyed by state that changes whenever the reviewed object does, so a hit is never stale
+        cache_key = (PROMPT_VERSION, OLLAMA_MODEL) + cache_key
+        show_timings = timings is not None
+        timings = timings if show_timings else {}
+
+        def render(text, status=None):
+            if len(text) > 4096:
+                text = text[:4095] + "…"
+            embed = discord.Embed(title=title, description=text or None, color=color)
+            embed.set_footer(text=status or f"Powered by {OLLAMA_MODEL} via Ollama")
+            return embed
+
+        cached = self.reviews.get(cache_key)
+        if cached is not None:
+            return await interaction.followup.send(embed=render(cached, f"Powered by {OLLAMA_MODEL} via Ollama • cached"))
+
+        controls = ReviewControls(interaction.user.id, asyncio.current_task())
+        message = await interaction.followup.send(embed=render("", "⏳ Waiting for the model…"), view=controls, wait=True)
+
+        loop = asyncio.get_running_loop()
+        text = ""
+        status = None
+        progress = "✍️ Generating…"
+        last_edit = 0
+
+        async def refresh():
+            nonlocal last_edit
+            if loop.time() - last_edit >= REVIEW_EDIT_INTERVAL:
+                last_edit = loop.time()
+                await message.edit(embed=render(text, progress))
+
+        async def set_status(new_status):
+            nonlocal progress
+            progress = new_status
+            await refresh()
+
+        async def show_position(position):
+            await message.edit(embed=render(text, f"⏳ Queued — position {position}"))
+
+        @asynccontextmanager
+        async def turn():
+            waited = time.perf_counter()
+            async with self.queue.turn(interaction.user.id, on_position=show_position):
+                # Time until the review first reached the model
+                timings.setdefault("queue", time.perf_counter() - waited)
+                await set_status(progress)
+                yield
+
+        started = time.perf_counter()
+        try:
+            async with self.queue.job(interaction.user.id):
+                async for piece in generate(set_status, turn):
+                    text += piece
+                    await refresh()
+            if text:
+                self.reviews.set(cache_key, text)
+            else:
+                text = "⚠️ No response from model."
+        except QueueFull as e:
+            status = f"⚠️ {e}"
+        except asyncio.TimeoutError:
+            status = "⚠️ Timed out waiting for the model."
+        except aiohttp.ClientError:
+            status = "⚠️ Error generating review."
+        except asyncio.CancelledError:
+            if not controls.cancelled:
+                raise
+            asyncio.current_task().uncancel()
+            status = "🛑 Review cancelled."
+
+        controls.stop()
+        timings["total"] = time.perf_counter() - started
+        stages = " • ".join(f"{stage} {seconds:.1f}s" for stage, seconds in timings.items())
+        print(f"[review] {title}: {stages}")
+        if status is None and show_timings:
+            status = f"Powered by {OLLAMA_MODEL} via Ollama • {stages}"
+        await message.edit(embed=render(text, status), view=None)
 
     review = app_commands.Group(name="review", description="AI-powered GitHub repo/PR/issue review")
 
@@ -35,7 +208,7 @@ class Review(commands.Cog):
     async def review_repo(self, interaction: discord.Interaction, repository: str):
         await interaction.response.defer()
 
-        url = f"https://api.github.com/repos/{repository}"
+        url = f"/repos/{repository}"
         data = await self.fetch_github_json(url)
         if not data:
             return await interaction.followup.send("⚠️ Failed to fetch repo info.")
@@ -53,22 +226,15 @@ License: {data.get('license', {}).get('name', 'None')}
 
 Checklist and feedback:"""
 
-        ai_response = await self.generate_review(prompt)
-
-        embed = discord.Embed(
-            title=f"📦 Review of {data['full_name']}",
-            description=ai_response,
-            color=discord.Color.green()
-        )
-        embed.set_footer(text="Powered by Mistral via Ollama")
-        await interaction.followup.send(embed=embed)
+        await self.run_review(interaction, f"📦 Review of {data['full_name']}", discord.Color.green(), ("repo", data["id"], data.get("pushed_at")), lambda set_status, turn: self.generate_in_turn(prompt, turn))
 
     @review.command(name="pr", description="Review a GitHub Pull Request")
     @app_commands.describe(repository="Format: owner/repo", number="Pull Request number")
     async def review_pr(self, interaction: discord.Interaction, repository: str, number: int):
         await interaction.response.defer()
+        started = time.perf_counter()
 
-        url = f"https://api.github.com/repos/{repository}/pulls/{number}"
+        url = f"/repos/{repository}/pulls/{number}"
         data = await self.fetch_github_json(url)
         if not data:
             return await interaction.followup.send("⚠️ Failed to fetch PR info.")
@@ -89,22 +255,34 @@ Body:
 
 Checklist and feedback:"""
 
-        ai_response = await self.generate_review(prompt)
+        timings = {"fetch": time.perf_counter() - started}
 
-        embed = discord.Embed(
-            title=f"🔍 Review of PR #{number} in {repository}",
-            description=ai_response,
-            color=discord.Color.blue()
-        )
-        embed.set_footer(text="Powered by Mistral via Ollama")
-        await interaction.followup.send(embed=embed)
+        async def generate(set_status, turn):
+            # Only fetched once the review cache has missed
+            started = time.perf_counter()
+            await set_status("📥 Reading the diff…")
+            files, truncated = await self.fetch_pr_diff(repository, number)
+            timings["diff"] = time.perf_counter() - started
+            chunks = chunk_diff(files or [])
+            skipped = max(len(chunks) - REVIEW_MAX_CHUNKS, 0)
+            chunks = chunks[:REVIEW_MAX_CHUNKS]
+            note = "\n(Note: the diff was too large to review in full; only the first part was reviewed.)" if truncated or skipped else ""
+            if chunks:
+                pieces = self.review_diff(prompt + note, chunks, set_status, timings, turn)
+            else:
+                pieces = self.generate_in_turn(prompt + note, turn)
+            async for piece in pieces:
+                yield piece
+
+        cache_key = ("pr", data["id"], data["head"]["sha"], data["base"]["sha"], data["state"])
+        await self.run_review(interaction, f"🔍 Review of PR #{number} in {repository}", discord.Color.blue(), cache_key, generate, timings)
 
     @review.command(name="issue", description="Review a GitHub Issue")
     @app_commands.describe(repository="Format: owner/repo", number="Issue number")
     async def review_issue(self, interaction: discord.Interaction, repository: str, number: int):
         await interaction.response.defer()
 
-        url = f"https://api.github.com/repos/{repository}/issues/{number}"
+        url = f"/repos/{repository}/issues/{number}"
         data = await self.fetch_github_json(url)
         if not data:
             return await interaction.followup.send("⚠️ Failed to fetch issue info.")
@@ -121,15 +299,7 @@ Body:
 
 Checklist and suggestions:"""
 
-        ai_response = await self.generate_review(prompt)
-
-        embed = discord.Embed(
-            title=f"🐛 Review of Issue #{number} in {repository}",
-            description=ai_response,
-            color=discord.Color.orange()
-        )
-        embed.set_footer(text="Powered by Mistral via Ollama")
-        await interaction.followup.send(embed=embed)
+        await self.run_review(interaction, f"🐛 Review of Issue #{number} in {repository}", discord.Color.orange(), ("issue", data["id"], data["updated_at"]), lambda set_status, turn: self.generate_in_turn(prompt, turn))
 
 async def setup(bot: commands.Bot):
     await bot.add_cog(Review(bot))
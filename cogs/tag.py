@@ -1,12 +1,8 @@
-import os
 import discord
-import aiohttp
 from discord.ext import commands
 from discord import app_commands, Interaction, ui
-from motor.motor_asyncio import AsyncIOMotorClient
 from typing import Optional
-
-GITHUB_API = "https://api.github.com"
+from records import TagRecord
 
 def make_embed(title: str, description: str, color=discord.Color.blurple()) -> discord.Embed:
     return discord.Embed(title=title, description=description, color=color)
@@ -14,7 +10,7 @@ def make_embed(title: str, description: str, color=discord.Color.blurple()) -> d
 class TagPaginator(ui.View):
     def __init__(self, tags: list[dict], per_page: int = 5):
         super().__init__(timeout=60)
-        self.tags = tags
+        self.tags = [TagRecord(tag) for tag in tags]
         self.per_page = per_page
         self.page = 0
         self.max_page = (len(tags) - 1) // per_page
@@ -29,9 +25,7 @@ class TagPaginator(ui.View):
 
         embed = make_embed(f"Tags Page {self.page + 1}/{self.max_page + 1}", "")
         for tag in current_tags:
-            tag_name = tag['ref'].split('/')[-1]
-            tag_url = tag['url']
-            embed.add_field(name=tag_name, value=f"[View Tag]({tag_url})", inline=False)
+            embed.add_field(name=tag.name, value=f"[View Tag]({tag.url})", inline=False)
         return embed
 
     @ui.button(label="Previous", style=discord.ButtonStyle.primary)
@@ -52,32 +46,35 @@ class TagPaginator(ui.View):
 class Tag(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        mongo = AsyncIOMotorClient(os.getenv("MONGO_URI"))
-        self.users = mongo.gitbot.users
 
     async def get_token(self, discord_id: str) -> Optional[str]:
-        from token_handler import TokenHandler
-        token_handler = TokenHandler()
-        user = await self.users.find_one({"discord_id": discord_id})
-        return token_handler.decrypt(user.get("token")) if user and user.get("token") else None
+        return await self.bot.credentials.get_token(discord_id)
 
     async def github_get(self, url: str, token: Optional[str] = None):
-        headers = {"Authorization": f"token {token}"} if token else {}
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers) as resp:
-                return await resp.json()
+        resp = await self.bot.github.get(url, token=token)
+        return resp.json()
+
+    async def annotated_tag(self, repository: str, sha: str) -> Optional[dict]:
+        # Tag objects are addressed by SHA and never change; refs can move, so only the object is cached
+        data = await self.bot.git_objects.get_json("tag", sha)
+        if data is not None:
+            return data
+        resp = await self.bot.github.get(f"/repos/{repository}/git/tags/{sha}")
+        if resp.status_code != 200:
+            return None
+        data = resp.json()
+        data = {"message": data.get("message"), "tagger": data.get("tagger"), "object": data.get("object")}
+        await self.bot.git_objects.put_json("tag", sha, data)
+        return data
 
     async def github_post(self, url: str, token: str, data: dict):
-        headers = {"Authorization": f"token {token}", "Accept": "application/vnd.github+json"}
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, headers=headers, json=data) as resp:
-                return await resp.json(), resp.status
+        headers = {"Accept": "application/vnd.github+json"}
+        resp = await self.bot.github.post(url, token=token, headers=headers, json=data)
+        return resp.json(), resp.status_code
 
     async def github_delete(self, url: str, token: str):
-        headers = {"Authorization": f"token {token}"}
-        async with aiohttp.ClientSession() as session:
-            async with session.delete(url, headers=headers) as resp:
-                return resp.status
+        resp = await self.bot.github.delete(url, token=token)
+        return resp.status_code
 
     tag_group = app_commands.Group(name="tag", description="GitHub Tag commands")
 
@@ -89,7 +86,7 @@ class Tag(commands.Cog):
         tag: str
     ):
         await interaction.response.defer()
-        url = f"{GITHUB_API}/repos/{repository}/git/ref/tags/{tag}"
+        url = f"/repos/{repository}/git/ref/tags/{tag}"
         data = await self.github_get(url)
 
         if "object" not in data:
@@ -100,6 +97,14 @@ class Tag(commands.Cog):
 
         embed = make_embed(f"Tag: {tag}", f"[View Tag Object]({tag_url})")
         embed.add_field(name="SHA", value=tag_sha)
+        if data["object"].get("type") == "tag":
+            annotated = await self.annotated_tag(repository, tag_sha)
+            if annotated:
+                tagger = annotated.get("tagger") or {}
+                embed.description += f"\n\n{(annotated.get('message') or '').strip()[:1000]}"
+                if tagger:
+                    embed.add_field(name="Tagger", value=f"{tagger.get('name')} ({tagger.get('date')})")
+                embed.add_field(name="Target", value=f"{annotated['object']['type']} `{annotated['object']['sha'][:7]}`")
         embed.set_footer(text=repository)
         await interaction.followup.send(embed=embed)
 
@@ -110,7 +115,7 @@ class Tag(commands.Cog):
         repository: str
     ):
         await interaction.response.defer()
-        url = f"{GITHUB_API}/repos/{repository}/git/refs/tags"
+        url = f"/repos/{repository}/git/refs/tags"
         tags = await self.github_get(url)
 
         if not isinstance(tags, list):
@@ -135,7 +140,7 @@ class Tag(commands.Cog):
             return await interaction.response.send_message("❌ You need to `/auth` first.", ephemeral=True)
 
         await interaction.response.defer()
-        repo_url = f"{GITHUB_API}/repos/{repository}"
+        repo_url = f"/repos/{repository}"
         repo_data = await self.github_get(repo_url, token=token)
         default_branch = repo_data.get("default_branch", "main")
 
@@ -188,7 +193,7 @@ class Tag(commands.Cog):
             return await interaction.response.send_message("❌ You need to `/auth` first.", ephemeral=True)
 
         await interaction.response.defer()
-        url = f"{GITHUB_API}/repos/{repository}/git/refs/tags/{tag}"
+        url = f"/repos/{repository}/git/refs/tags/{tag}"
         status = await self.github_delete(url, token)
 
         if status == 204:
@@ -1,75 +1,156 @@
 import discord
 from discord import app_commands
 from discord.ext import commands
+import asyncio
+import os
 import httpx
 from collections import Counter
+from caching import LRUCache, TTLCache
+from github_client import fetch_all_pages
 
 COLOR_PURPLE = 0x9b59b6
+TOP_MAX_LINES = 20
+TOP_FETCH_CONCURRENCY = int(os.getenv("TOP_FETCH_CONCURRENCY", "8"))
+TOP_CACHE_SIZE = int(os.getenv("TOP_CACHE_SIZE", "1000"))
+# Byte counts cost one /languages request per repo, so only the most recently pushed repos are measured
+TOP_BYTES_MAX_REPOS = int(os.getenv("TOP_BYTES_MAX_REPOS", "300"))
+TOP_REPOS_TTL = float(os.getenv("TOP_REPOS_TTL", "600"))
+
+def language_breakdown(repos, limit=TOP_MAX_LINES):
+    count = Counter(lang for lang in (repo.get("language") for repo in repos) if lang)
+    total = sum(count.values())
+    return "\n".join(
+        f"**{lang}**: {n} ({(n/total*100):.1f}%)"
+        for lang, n in count.most_common(limit)
+    )
+
+def format_size(n):
+    for unit in ("B", "KB", "MB"):
+        if n < 1024:
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} GB"
+
+def bytes_breakdown(totals, limit=TOP_MAX_LINES):
+    total = sum(totals.values())
+    return "\n".join(
+        f"**{lang}**: {format_size(n)} ({(n/total*100):.1f}%)"
+        for lang, n in totals.most_common(limit)
+    )
 
 class Top(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        # username -> {full_name: (pushed_at, {language: bytes})}
+        self.language_bytes = LRUCache(TOP_CACHE_SIZE)
+        # (username, count) -> (repos, total_count); only public repos, so shared by everyone
+        self.top_repos = TTLCache(TOP_CACHE_SIZE, TOP_REPOS_TTL)
+
+    async def search_top_repos(self, username, count, token):
+        key = (username.lower(), count)
+        cached = self.top_repos.get(key)
+        if cached is not None:
+            return cached
+        # `user:` matches organizations too; GitHub sorts, so only `count` repos are transferred
+        r = await self.bot.github.get(
+            "/search/repositories",
+            token=token,
+            params={"q": f"user:{username} is:public fork:true", "sort": "stars", "order": "desc", "per_page": count},
+        )
+        if r.status_code != 200:
+            return None
+        data = r.json()
+        result = (data["items"], data["total_count"])
+        self.top_repos.set(key, result)
+        return result
+
+    async def repo_language_bytes(self, username, repos, token):
+        # Only repos pushed since they were last measured are fetched again
+        cached = self.language_bytes.get(username.lower()) or {}
+        measured = sorted(repos, key=lambda repo: repo.get("pushed_at") or "", reverse=True)[:TOP_BYTES_MAX_REPOS]
+        current = {}
+        stale = []
+        for repo in measured:
+            entry = cached.get(repo["full_name"])
+            if entry is not None and entry[0] == repo.get("pushed_at"):
+                current[repo["full_name"]] = entry
+            else:
+                stale.append(repo)
+
+        semaphore = asyncio.Semaphore(TOP_FETCH_CONCURRENCY)
+
+        async def refresh(repo):
+            async with semaphore:
+                r = await self.bot.github.get(f"/repos/{repo['full_name']}/languages", token=token)
+            if r.status_code == 200:
+                current[repo["full_name"]] = (repo.get("pushed_at"), r.json())
+            elif repo["full_name"] in cached:
+                current[repo["full_name"]] = cached[repo["full_name"]]
+
+        await asyncio.gather(*(refresh(repo) for repo in stale))
+        self.language_bytes.set(username.lower(), current)
+
+        totals = Counter()
+        for _, languages in current.values():
+            totals.update(languages)
+        return totals, len(measured), len(stale)
 
     top = app_commands.Group(name="top", description="Top GitHub info")
 
     @top.command(name="langs", description="Show top used languages for a user")
-    @app_commands.describe(username="GitHub username")
-    async def langs(self, interaction: discord.Interaction, username: str):
+    @app_commands.describe(username="GitHub username", by_bytes="Weigh languages by bytes of code instead of each repo's main language")
+    @app_commands.rename(by_bytes="bytes")
+    async def langs(self, interaction: discord.Interaction, username: str, by_bytes: bool = False):
         await interaction.response.defer()
-        async with httpx.AsyncClient() as client:
-            r = await client.get(f"https://api.github.com/users/{username}/repos")
-            if r.status_code != 200:
-                await interaction.followup.send(f"Could not find GitHub user `{username}`")
-                return
-            repos = r.json()
-
-        langs = []
-        for repo in repos:
-            lang = repo.get("language")
-            if lang:
-                langs.append(lang)
-
-        if not langs:
-            await interaction.followup.send("No languages found.")
+        token = await self.bot.credentials.get_token(interaction.user.id)
+        try:
+            repos = await fetch_all_pages(self.bot.github, f"/users/{username}/repos?per_page=100", token=token, concurrency=TOP_FETCH_CONCURRENCY)
+        except httpx.HTTPStatusError:
+            await interaction.followup.send(f"Could not find GitHub user `{username}`")
             return
 
-        count = Counter(langs)
-        total = sum(count.values())
-        sorted_langs = count.most_common()
-
-        desc = "\n".join(
-            f"**{lang}**: {count} ({(count/total*100):.1f}%)"
-            for lang, count in sorted_langs
-        )
+        if by_bytes:
+            totals, measured, refreshed = await self.repo_language_bytes(username, repos, token)
+            desc = bytes_breakdown(totals)
+            footer = f"Bytes of code in {measured} repositories"
+            if measured < len(repos):
+                footer += f" (the {measured} most recently pushed of {len(repos)})"
+            footer += f" • {refreshed} refreshed"
+        else:
+            desc = language_breakdown(repos)
+            footer = f"Main language of {len(repos)} repositories"
+
+        if not desc:
+            await interaction.followup.send("No languages found.")
+            return
 
         embed = discord.Embed(
             title=f"Top Languages for {username}",
             description=desc,
             color=COLOR_PURPLE
         )
+        embed.set_footer(text=footer)
 
         await interaction.followup.send(embed=embed)
 
-    @top.command(name="repos", description="Show a user's repositories sorted by stars")
-    @app_commands.describe(username="GitHub username")
-    async def repos(self, interaction: discord.Interaction, username: str):
+    @top.command(name="repos", description="Show a user's or organization's repositories sorted by stars")
+    @app_commands.describe(username="GitHub user or organization", count="How many repositories to show")
+    async def repos(self, interaction: discord.Interaction, username: str, count: app_commands.Range[int, 1, 25] = 10):
         await interaction.response.defer()
-        async with httpx.AsyncClient() as client:
-            r = await client.get(f"https://api.github.com/users/{username}/repos")
-            if r.status_code != 200:
-                await interaction.followup.send(f"Could not find GitHub user `{username}`")
-                return
-            repos = r.json()
+        token = await self.bot.credentials.get_token(interaction.user.id)
+        result = await self.search_top_repos(username, count, token)
+        if result is None:
+            await interaction.followup.send(f"Could not find GitHub user `{username}`")
+            return
+        repos, total = result
 
         if not repos:
             await interaction.followup.send("No repositories found.")
             return
 
-        sorted_repos = sorted(repos, key=lambda r: r["stargazers_count"], reverse=True)[:10]
-
         desc = "\n".join(
             f"⭐ {repo['stargazers_count']} — [{repo['name']}]({repo['html_url']})"
-            for repo in sorted_repos
+            for repo in repos
         )
 
         embed = discord.Embed(
@@ -77,6 +158,7 @@ class Top(commands.Cog):
             description=desc,
             color=COLOR_PURPLE
         )
+        embed.set_footer(text=f"Top {len(repos)} of {total} public repositories")
 
         await interaction.followup.send(embed=embed)
 
@@ -0,0 +1,109 @@
+import discord
+from discord import app_commands
+from discord.ext import commands
+import os
+from webhook_signing import repo_webhook_secret
+
+COLOR_PURPLE = 0x9b59b6
+WEBHOOK_EVENTS = ["push", "pull_request", "issues", "release"]
+
+class Watch(commands.Cog):
+    watch_group = app_commands.Group(
+        name="watch",
+        description="Post live GitHub activity to a channel",
+        guild_only=True,
+        default_permissions=discord.Permissions(manage_channels=True),
+    )
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.backend_base_url = os.getenv("BACKEND_BASE_URL", "http://localhost:2000")
+        self.webhook_secret = os.getenv("GITHUB_WEBHOOK_SECRET")
+
+    async def create_hook(self, repo, token):
+        # Needs admin rights on the repository
+        r = await self.bot.github.post(f"/repos/{repo}/hooks", token=token, json={
+            "name": "web",
+            "active": True,
+            "events": WEBHOOK_EVENTS,
+            "config": {
+                "url": f"{self.backend_base_url}/webhook",
+                "content_type": "json",
+                "secret": repo_webhook_secret(self.webhook_secret, repo),
+            },
+        })
+        if r.status_code == 422:
+            # Also sent for invalid configs (e.g. an unreachable URL); only a duplicate hook counts as set up
+            errors = r.json().get("errors") or []
+            return any("already exists" in (error.get("message") or "") for error in errors if isinstance(error, dict))
+        return r.status_code == 201
+
+    @watch_group.command(name="add", description="Post a repository's pushes, PRs, issues and releases in this channel")
+    @app_commands.describe(repo="Repository in the format owner/repo", event="Only post this kind of event")
+    @app_commands.choices(event=[app_commands.Choice(name=name, value=name) for name in WEBHOOK_EVENTS])
+    async def add(self, interaction: discord.Interaction, repo: str, event: str = None):
+        await interaction.response.defer(ephemeral=True)
+        if not self.webhook_secret:
+            await interaction.followup.send("❌ Live activity is not configured on this bot (missing `GITHUB_WEBHOOK_SECRET`).", ephemeral=True)
+            return
+
+        # Only someone who can read the repository may stream its activity into a channel
+        token = await self.bot.credentials.get_token(interaction.user.id)
+        r = await self.bot.github.get(f"/repos/{repo}", token=token)
+        if r.status_code != 200:
+            await interaction.followup.send(f"❌ Could not find `{repo}`, or you do not have access to it.", ephemeral=True)
+            return
+
+        data = r.json()
+        await self.bot.user_store.watch(repo, interaction.channel_id, interaction.guild_id, [event] if event else WEBHOOK_EVENTS, data.get("private", False))
+
+        # The hook secret lets its holder sign events for the repository, so only its admins ever see it
+        if not data.get("permissions", {}).get("admin"):
+            await interaction.followup.send(
+                f"👀 Watching `{repo}` in this channel. Activity arrives once a repository admin has run `/watch add {repo}` "
+                "with a linked account to set up the webhook.",
+                ephemeral=True,
+            )
+            return
+
+        if await self.create_hook(repo, token):
+            await interaction.followup.send(f"👀 Now posting `{repo}` activity in this channel.", ephemeral=True)
+            return
+
+        embed = discord.Embed(
+            title=f"👀 Watching {repo}",
+            description=(
+                "GitBot could not add the webhook itself. "
+                f"Add one under **Settings → Webhooks** and keep the secret private:\n\n"
+                f"**Payload URL:** `{self.backend_base_url}/webhook`\n"
+                "**Content type:** `application/json`\n"
+                f"**Secret:** `{repo_webhook_secret(self.webhook_secret, repo)}`\n"
+                "**Events:** pushes, pull requests, issues and releases"
+            ),
+            color=COLOR_PURPLE,
+        )
+        await interaction.followup.send(embed=embed, ephemeral=True)
+
+    @watch_group.command(name="remove", description="Stop posting a repository's activity in this channel")
+    @app_commands.describe(repo="Repository in the format owner/repo")
+    async def remove(self, interaction: discord.Interaction, repo: str):
+        if await self.bot.user_store.unwatch(repo, interaction.channel_id):
+            await interaction.response.send_message(f"🛑 No longer posting `{repo}` activity here.", ephemeral=True)
+        else:
+            await interaction.response.send_message(f"❌ `{repo}` is not watched in this channel.", ephemeral=True)
+
+    @watch_group.command(name="list", description="List repositories watched in this server")
+    async def list_watched(self, interaction: discord.Interaction):
+        subscriptions = await self.bot.user_store.watched(interaction.guild_id)
+        if not subscriptions:
+            await interaction.response.send_message("No repositories are watched in this server.", ephemeral=True)
+            return
+        desc = "\n".join(
+            f"`{sub['repo']}` → <#{sub['channel_id']}> ({', '.join(sub.get('events', WEBHOOK_EVENTS))})"
+            for sub in subscriptions
+        )
+        embed = discord.Embed(title="Watched Repositories", description=desc[:4096], color=COLOR_PURPLE)
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+async def setup(bot):
+    await bot.add_cog(Watch(bot))
@@ -0,0 +1,63 @@
+import hashlib
+import json
+import os
+
+from discord import Object
+
+# Last synced tree hashes, keyed by application and scope
+COMMAND_HASH_PATH = os.getenv("COMMAND_HASH_PATH", ".command_tree_hashes.json")
+# Comma-separated guild IDs that get an instant per-guild sync of every command
+DEV_GUILD_IDS = [int(guild_id) for guild_id in os.getenv("DEV_GUILD_IDS", "").split(",") if guild_id.strip()]
+FORCE_COMMAND_SYNC = os.getenv("FORCE_COMMAND_SYNC", "0") in ("1", "true", "True")
+
+
+def tree_hash(tree, guild=None) -> str:
+    """Stable SHA-256 of the commands registered for `guild` (None for global)."""
+    payload = []
+    for command in tree.get_commands(guild=guild):
+        try:
+            payload.append(command.to_dict(tree))
+        except TypeError:
+            # discord.py before 2.4 takes no tree argument
+            payload.append(command.to_dict())
+    payload.sort(key=lambda command: (command.get("type", 1), command["name"]))
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _load_hashes(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_hashes(path, hashes):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(hashes, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+async def sync_commands(bot, dev_guild_ids=DEV_GUILD_IDS, path: str = COMMAND_HASH_PATH, force: bool = FORCE_COMMAND_SYNC):
+    """Sync the command tree only where it changed since the last recorded sync.
+
+    Development guilds listed in `dev_guild_ids` receive a copy of the global
+    commands, which Discord applies immediately; the global sync, which can take
+    up to an hour to propagate, is skipped when those guilds are configured.
+    """
+    hashes = _load_hashes(path)
+    scopes = [Object(id=guild_id) for guild_id in dev_guild_ids] or [None]
+    for guild in scopes:
+        if guild is not None:
+            bot.tree.copy_global_to(guild=guild)
+        key = f"{bot.application_id}:{guild.id if guild else 'global'}"
+        digest = tree_hash(bot.tree, guild)
+        where = f"guild {guild.id}" if guild else "global"
+        if not force and hashes.get(key) == digest:
+            print(f"Command tree unchanged ({where}), skipping sync.")
+            continue
+        synced = await bot.tree.sync(guild=guild)
+        hashes[key] = digest
+        _save_hashes(path, hashes)
+        print(f"Synced {len(synced)} command(s) ({where}).")
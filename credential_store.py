@@ -0,0 +1,72 @@
+import os
+from typing import Optional
+
+from caching import TTLCache
+from metrics import credential_lookups
+from token_handler import TokenHandler
+
+CREDENTIAL_TTL = float(os.getenv("CREDENTIAL_CACHE_TTL", "300"))
+CREDENTIAL_CACHE_SIZE = int(os.getenv("CREDENTIAL_CACHE_SIZE", "10000"))
+
+
+class LinkedUser:
+    __slots__ = ("github_user", "token")
+
+    def __init__(self, github_user: Optional[str], token: Optional[str]):
+        self.github_user = github_user
+        self.token = token
+
+
+class CredentialStore:
+    """Resolves Discord IDs to linked GitHub accounts with decrypted tokens.
+
+    Shared by every cog as `bot.credentials`. Lookups read only the fields we
+    need from Mongo and keep the decrypted result in memory for a short TTL, so a
+    user running several commands costs one DB round trip and one decrypt.
+    Users who are not linked are never cached, so a fresh `/auth` takes effect
+    immediately.
+    """
+
+    PROJECTION = {"_id": 0, "github_user": 1, "token": 1}
+
+    def __init__(self, user_store, token_handler: TokenHandler = None, ttl: float = CREDENTIAL_TTL, maxsize: int = CREDENTIAL_CACHE_SIZE):
+        self.user_store = user_store
+        self.token_handler = token_handler or TokenHandler()
+        self.cache = TTLCache(maxsize, ttl)
+        self.hits = 0
+        self.misses = 0
+
+    async def get_user(self, discord_id) -> Optional[LinkedUser]:
+        discord_id = str(discord_id)
+        linked = self.cache.get(discord_id)
+        if linked is not None:
+            self.hits += 1
+            credential_lookups.inc("hit")
+            return linked
+
+        self.misses += 1
+        credential_lookups.inc("miss")
+        user = await self.user_store.find(discord_id, self.PROJECTION)
+        if not user:
+            return None
+        token = self.token_handler.decrypt(user["token"]) if user.get("token") else None
+        linked = LinkedUser(user.get("github_user"), token)
+        if token:
+            self.cache.set(discord_id, linked)
+        return linked
+
+    async def get_token(self, discord_id) -> Optional[str]:
+        linked = await self.get_user(discord_id)
+        return linked.token if linked else None
+
+    def invalidate(self, discord_id):
+        self.cache.pop(str(discord_id))
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.cache),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
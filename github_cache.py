@@ -0,0 +1,124 @@
+import hashlib
+import os
+from collections import OrderedDict
+import httpx
+
+from metrics import github_cache_lookups
+
+RESPONSE_CACHE_SIZE = int(os.getenv("GITHUB_CACHE_SIZE", "2048"))
+RESPONSE_CACHE_MAX_BODY = int(os.getenv("GITHUB_CACHE_MAX_BODY", str(512 * 1024)))
+# Total bytes of bodies and headers held; entries are evicted least recently used first
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("GITHUB_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+# Headers describing the wire encoding of the original body; the cached body is already decoded
+_WIRE_HEADERS = ("content-encoding", "content-length", "transfer-encoding")
+
+
+def token_scope(token):
+    """Stable, non-reversible cache scope for a credential (None means unauthenticated)."""
+    if not token:
+        return "anon"
+    return hashlib.sha256(token.encode()).hexdigest()[:16]
+
+
+class CachedResponse:
+    __slots__ = ("etag", "last_modified", "headers", "content", "size")
+
+    def __init__(self, etag, last_modified, headers, content):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.headers = headers
+        self.content = content
+        self.size = len(content) + sum(len(k) + len(v) for k, v in headers)
+
+
+class ResponseCache:
+    """ETag / Last-Modified store for GitHub GET responses.
+
+    Entries are keyed by URL, Accept header and credential scope so a body fetched
+    with one user's token is never served to another. A stored entry turns the next
+    identical GET into a conditional request; GitHub answers unchanged resources
+    with a 304 that does not count against the rate limit. The cache is bounded
+    both by entry count and by the total size of what it stores.
+    """
+
+    def __init__(self, maxsize: int = RESPONSE_CACHE_SIZE, max_body_bytes: int = RESPONSE_CACHE_MAX_BODY, max_bytes: int = RESPONSE_CACHE_MAX_BYTES):
+        self.maxsize = maxsize
+        self.max_body_bytes = max_body_bytes
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    @staticmethod
+    def key(request: httpx.Request, token=None):
+        return (str(request.url), request.headers.get("Accept", ""), token_scope(token))
+
+    def _get(self, key):
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+        return entry
+
+    def _pop(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry.size
+
+    def _store(self, key, entry: CachedResponse):
+        self._pop(key)
+        self.entries[key] = entry
+        self.bytes += entry.size
+        while len(self.entries) > self.maxsize or self.bytes > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.bytes -= evicted.size
+
+    def prepare(self, key, request: httpx.Request):
+        """Add validators for a cached entry to an outgoing request."""
+        entry = self._get(key)
+        if entry is None:
+            self.misses += 1
+            github_cache_lookups.inc("miss")
+            return
+        self.hits += 1
+        github_cache_lookups.inc("hit")
+        if entry.etag:
+            request.headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            request.headers["If-Modified-Since"] = entry.last_modified
+
+    def resolve(self, key, response: httpx.Response) -> httpx.Response:
+        """Store a fresh response, or rebuild the cached one when GitHub answers 304."""
+        if response.status_code == 304:
+            entry = self._get(key)
+            if entry is None:
+                return response
+            self.not_modified += 1
+            github_cache_lookups.inc("not_modified")
+            headers = httpx.Headers(entry.headers)
+            for name, value in response.headers.items():
+                if name.lower() not in _WIRE_HEADERS:
+                    headers[name] = value
+            return httpx.Response(200, headers=headers, content=entry.content, request=response.request)
+
+        if response.status_code != 200:
+            self._pop(key)
+            return response
+
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if (etag or last_modified) and len(response.content) <= self.max_body_bytes:
+            headers = [(k, v) for k, v in response.headers.multi_items() if k.lower() not in _WIRE_HEADERS]
+            self._store(key, CachedResponse(etag, last_modified, headers, response.content))
+        return response
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self.entries),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+        }
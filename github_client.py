@@ -0,0 +1,284 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager
+import httpx
+
+from github_cache import ResponseCache, token_scope
+from github_ratelimit import PRIORITY_HIGH, PRIORITY_LOW, RateLimiter, RateLimitExceeded
+from metrics import current_command, github_coalesced, track_call
+
+GITHUB_API = os.getenv("GITHUB_API_URL", "https://api.github.com")
+
+# Pool tuning, overridable from the environment
+MAX_CONNECTIONS = int(os.getenv("GITHUB_MAX_CONNECTIONS", "100"))
+MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("GITHUB_MAX_KEEPALIVE_CONNECTIONS", "20"))
+KEEPALIVE_EXPIRY = float(os.getenv("GITHUB_KEEPALIVE_EXPIRY", "30"))
+REQUEST_TIMEOUT = float(os.getenv("GITHUB_TIMEOUT", "15"))
+HTTP2 = os.getenv("GITHUB_HTTP2", "1") not in ("0", "false", "False")
+
+
+class GitHubClient:
+    """Bot-wide keep-alive client for the GitHub API.
+
+    Every cog goes through the instance attached to the bot as `bot.github`
+    instead of opening its own session, so connections to api.github.com are
+    pooled and reused across commands. GETs are transparently revalidated
+    against `self.cache` (see github_cache.py), and every call is gated by
+    `self.limiter` (see github_ratelimit.py). Identical GETs issued while one
+    is already in flight (same URL, headers and credential scope) wait for
+    that request and share its response instead of sending their own.
+    """
+
+    def __init__(
+        self,
+        base_url: str = GITHUB_API,
+        max_connections: int = MAX_CONNECTIONS,
+        max_keepalive_connections: int = MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = KEEPALIVE_EXPIRY,
+        timeout: float = REQUEST_TIMEOUT,
+        http2: bool = HTTP2,
+        cache: ResponseCache = None,
+    ):
+        self.cache = cache if cache is not None else ResponseCache()
+        self.limiter = RateLimiter(httpx.URL(base_url).host)
+        self._in_flight = {}
+        self.coalesced = 0
+        limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        try:
+            self._client = httpx.AsyncClient(base_url=base_url, http2=http2, limits=limits, timeout=timeout)
+        except ImportError:
+            # HTTP/2 needs the optional `h2` package; fall back to HTTP/1.1 keep-alive
+            self._client = httpx.AsyncClient(base_url=base_url, limits=limits, timeout=timeout)
+        self._client.headers.update({
+            "Accept": "application/vnd.github.v3+json",
+            "User-Agent": "gitbot",
+        })
+
+    @staticmethod
+    def _headers(token, headers):
+        merged = dict(headers or {})
+        if token:
+            merged["Authorization"] = f"token {token}"
+        return merged
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        token: str = None,
+        headers: dict = None,
+        cache: bool = True,
+        priority: int = PRIORITY_HIGH,
+        **kwargs,
+    ) -> httpx.Response:
+        request = self._client.build_request(method, url, headers=self._headers(token, headers), **kwargs)
+        if method != "GET":
+            return await self._send(request, token, False, priority)
+
+        key = (str(request.url), tuple(sorted((headers or {}).items())), token_scope(token), cache, priority)
+        task = self._in_flight.get(key)
+        if task is None:
+            # A task of its own, so one caller being cancelled does not fail the others
+            task = asyncio.ensure_future(self._send(request, token, cache, priority))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._landed(key, done))
+        else:
+            self.coalesced += 1
+            github_coalesced.inc(current_command.get())
+        return await asyncio.shield(task)
+
+    def _landed(self, key, task):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            # Marks the error as retrieved even if every caller was cancelled
+            task.exception()
+
+    async def _send(self, request: httpx.Request, token, cache: bool, priority: int) -> httpx.Response:
+        cache_key = None
+        if cache:
+            cache_key = self.cache.key(request, token)
+            self.cache.prepare(cache_key, request)
+
+        limit_key = self.limiter.key(request, token)
+        response = await self._exchange(request, limit_key, priority)
+        if cache_key is None:
+            return response
+        resolved = self.cache.resolve(cache_key, response)
+        if resolved.status_code == 304 and self._drop_validators(request):
+            # The entry was evicted while the conditional request was in flight; ask again for the body
+            resolved = self.cache.resolve(cache_key, await self._exchange(request, limit_key, priority))
+        return resolved
+
+    async def _exchange(self, request: httpx.Request, limit_key, priority: int) -> httpx.Response:
+        async with track_call("github", request.method) as call:
+            # One retry after a short secondary-limit backoff; longer waits surface to the user
+            for attempt in range(2):
+                await self.limiter.acquire(limit_key, priority)
+                response = await self._client.send(request)
+                call.status = response.status_code
+                backoff = self.limiter.update(limit_key, response)
+                if backoff is None:
+                    return response
+                if attempt or (priority == PRIORITY_HIGH and backoff > self.limiter.max_wait):
+                    raise RateLimitExceeded(backoff)
+
+    @staticmethod
+    def _drop_validators(request: httpx.Request) -> bool:
+        dropped = False
+        for name in ("If-None-Match", "If-Modified-Since"):
+            if name in request.headers:
+                del request.headers[name]
+                dropped = True
+        return dropped
+
+    @asynccontextmanager
+    async def stream(
+        self,
+        method: str,
+        url: str,
+        *,
+        token: str = None,
+        headers: dict = None,
+        priority: int = PRIORITY_HIGH,
+        **kwargs,
+    ):
+        """Like `request`, but yields a response whose body is read incrementally; never cached."""
+        request = self._client.build_request(method, url, headers=self._headers(token, headers), **kwargs)
+        limit_key = self.limiter.key(request, token)
+        async with track_call("github", f"{method} stream") as call:
+            for attempt in range(2):
+                await self.limiter.acquire(limit_key, priority)
+                response = await self._client.send(request, stream=True)
+                call.status = response.status_code
+                if response.status_code >= 400:
+                    # Error bodies are small, and telling a secondary limit from a plain 403 needs the text
+                    await response.aread()
+                backoff = self.limiter.update(limit_key, response)
+                if backoff is None:
+                    break
+                await response.aclose()
+                if attempt or (priority == PRIORITY_HIGH and backoff > self.limiter.max_wait):
+                    raise RateLimitExceeded(backoff)
+            try:
+                yield response
+            finally:
+                await response.aclose()
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def put(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("PUT", url, **kwargs)
+
+    async def patch(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("PATCH", url, **kwargs)
+
+    async def delete(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("DELETE", url, **kwargs)
+
+    async def aclose(self):
+        await self._client.aclose()
+
+
+async def fetch_all_pages(github: GitHubClient, url: str, *, token: str = None, headers: dict = None, concurrency: int = 8, max_pages: int = 100) -> list:
+    """Fetch every page of a listing, loading pages 2..N concurrently.
+
+    The first response's `Link: rel="last"` says how many pages there are, so
+    the rest can be requested in parallel (at most `concurrency` at a time)
+    instead of walking `rel="next"` one round trip at a time.
+    """
+    first = await github.get(url, token=token, headers=headers)
+    first.raise_for_status()
+    last_url = first.links.get("last", {}).get("url")
+    if not last_url:
+        return first.json()
+
+    last = httpx.URL(last_url)
+    pages = min(int(last.params.get("page", "1")), max_pages)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(page):
+        async with semaphore:
+            r = await github.get(str(last.copy_set_param("page", str(page))), token=token, headers=headers)
+        r.raise_for_status()
+        return r.json()
+
+    rest = await asyncio.gather(*(fetch(page) for page in range(2, pages + 1)))
+    items = first.json()
+    for page in rest:
+        items.extend(page)
+    return items
+
+
+class PageCursor:
+    """Walks a paginated GitHub listing by following `Link: rel="next"` headers.
+
+    Pages are only requested when asked for; `prefetch()` starts loading the next
+    page in the background at low priority so it is usually ready by the time the
+    user clicks "Next".
+    """
+
+    def __init__(self, github: GitHubClient, url: str, *, token: str = None, headers: dict = None):
+        self.github = github
+        self.token = token
+        self.headers = headers
+        self._next_url = url
+        self._prefetch = None
+
+    @property
+    def has_more(self) -> bool:
+        return self._next_url is not None or self._prefetch is not None
+
+    async def _fetch(self, url, priority):
+        r = await self.github.get(url, token=self.token, headers=self.headers, priority=priority)
+        r.raise_for_status()
+        return r
+
+    async def next_page(self) -> list:
+        if self._prefetch is not None:
+            (url, task), self._prefetch = self._prefetch, None
+            try:
+                r = await task
+            except httpx.HTTPError:
+                # Retry a failed background fetch in the foreground
+                r = await self._fetch_or_restore(url)
+            except BaseException:
+                # Rate limited or cancelled: keep the page so the next call can try again
+                self._next_url = url
+                raise
+        elif self._next_url is not None:
+            url, self._next_url = self._next_url, None
+            r = await self._fetch_or_restore(url)
+        else:
+            return []
+        self._next_url = r.links.get("next", {}).get("url")
+        return r.json()
+
+    async def _fetch_or_restore(self, url):
+        try:
+            return await self._fetch(url, PRIORITY_HIGH)
+        except Exception:
+            self._next_url = url
+            raise
+
+    def prefetch(self):
+        if self._prefetch is None and self._next_url is not None:
+            url, self._next_url = self._next_url, None
+            self._prefetch = (url, asyncio.create_task(self._fetch(url, PRIORITY_LOW)))
+
+    def close(self):
+        if self._prefetch is not None:
+            task = self._prefetch[1]
+            if task.done() and not task.cancelled():
+                task.exception()  # mark a failed prefetch as handled
+            task.cancel()
+            self._prefetch = None
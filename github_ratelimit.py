@@ -0,0 +1,123 @@
+import asyncio
+import os
+import time
+import httpx
+
+from github_cache import token_scope
+from metrics import github_ratelimit_limit, github_ratelimit_remaining, github_ratelimit_throttled
+
+PRIORITY_HIGH = 0  # interactive commands
+PRIORITY_LOW = 1   # prefetching and background work
+
+# Interactive requests wait at most this long for quota before failing fast
+MAX_WAIT = float(os.getenv("GITHUB_RATELIMIT_MAX_WAIT", "5"))
+# Fraction of each budget that low-priority work leaves for interactive commands
+LOW_PRIORITY_RESERVE = float(os.getenv("GITHUB_RATELIMIT_RESERVE", "0.2"))
+# GitHub asks clients to back off at least a minute on secondary limits without Retry-After
+SECONDARY_BACKOFF = 60.0
+
+
+class RateLimitExceeded(Exception):
+    def __init__(self, retry_after: float):
+        self.retry_after = max(0.0, retry_after)
+        super().__init__(f"GitHub rate limit reached. Try again in {int(self.retry_after) + 1} seconds.")
+
+
+class Budget:
+    __slots__ = ("limit", "remaining", "reset_at", "blocked_until")
+
+    def __init__(self):
+        self.limit = None
+        self.remaining = None
+        self.reset_at = 0.0
+        self.blocked_until = 0.0
+
+
+class RateLimiter:
+    """Tracks GitHub quota per credential and resource and gates requests on it.
+
+    Budgets are keyed by `(token scope, resource)`; all unauthenticated calls share
+    the "anon" scope, which is the bot's IP budget. Quota is learned from the
+    X-RateLimit-* headers of every response and decremented optimistically as
+    requests go out, so bursts do not overshoot the remaining budget.
+    """
+
+    def __init__(self, api_host: str, max_wait: float = MAX_WAIT, low_priority_reserve: float = LOW_PRIORITY_RESERVE):
+        self.api_host = api_host
+        self.max_wait = max_wait
+        self.low_priority_reserve = low_priority_reserve
+        self.budgets = {}
+        self.throttled = 0
+
+    def key(self, request: httpx.Request, token=None):
+        if request.url.host != self.api_host:
+            return None
+        path = request.url.path
+        if path.startswith("/search/"):
+            resource = "search"
+        elif path.startswith("/graphql"):
+            resource = "graphql"
+        else:
+            resource = "core"
+        return (token_scope(token), resource)
+
+    def _wait_time(self, budget: Budget, priority: int, now: float) -> float:
+        if budget.blocked_until > now:
+            return budget.blocked_until - now
+        if budget.remaining is None or budget.reset_at <= now:
+            return 0.0
+        floor = 0
+        if priority >= PRIORITY_LOW and budget.limit:
+            floor = int(budget.limit * self.low_priority_reserve)
+        if budget.remaining <= floor:
+            return budget.reset_at - now
+        return 0.0
+
+    async def acquire(self, key, priority: int = PRIORITY_HIGH):
+        if key is None:
+            return
+        budget = self.budgets.setdefault(key, Budget())
+        while True:
+            wait = self._wait_time(budget, priority, time.time())
+            if wait <= 0:
+                if budget.remaining is not None:
+                    budget.remaining -= 1
+                    github_ratelimit_remaining.set(*key, value=budget.remaining)
+                return
+            if priority < PRIORITY_LOW and wait > self.max_wait:
+                raise RateLimitExceeded(wait)
+            self.throttled += 1
+            github_ratelimit_throttled.inc(*key)
+            await asyncio.sleep(wait)
+
+    def update(self, key, response: httpx.Response):
+        """Record quota headers; return a backoff in seconds if GitHub refused the request."""
+        if key is None:
+            return None
+        headers = response.headers
+        resource = headers.get("X-RateLimit-Resource")
+        if resource and resource != key[1]:
+            key = (key[0], resource)
+        budget = self.budgets.setdefault(key, Budget())
+        now = time.time()
+        if "X-RateLimit-Remaining" in headers:
+            budget.limit = int(headers.get("X-RateLimit-Limit", 0)) or budget.limit
+            budget.remaining = int(headers["X-RateLimit-Remaining"])
+            budget.reset_at = float(headers.get("X-RateLimit-Reset", now))
+            github_ratelimit_remaining.set(*key, value=budget.remaining)
+            if budget.limit:
+                github_ratelimit_limit.set(*key, value=budget.limit)
+
+        if response.status_code not in (403, 429):
+            return None
+        retry_after = headers.get("Retry-After")
+        if retry_after is not None:
+            backoff = float(retry_after)
+        elif budget.remaining == 0:
+            backoff = budget.reset_at - now
+        elif response.status_code == 429 or "secondary rate limit" in response.text.lower():
+            backoff = SECONDARY_BACKOFF
+        else:
+            return None  # an ordinary permission error
+        budget.blocked_until = max(budget.blocked_until, now + backoff)
+        return backoff
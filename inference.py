@@ -0,0 +1,192 @@
+import asyncio
+import json
+import os
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+
+import aiohttp
+
+from metrics import track_call
+
+OLLAMA_URL = os.getenv("OLLAMA_URL", "http://localhost:11434")
+OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "mistral")
+OLLAMA_TIMEOUT = float(os.getenv("OLLAMA_TIMEOUT", "300"))
+
+# Queue tuning, overridable from the environment
+INFERENCE_CONCURRENCY = int(os.getenv("OLLAMA_MAX_CONCURRENCY", "1"))
+INFERENCE_MAX_QUEUED = int(os.getenv("OLLAMA_MAX_QUEUED", "20"))
+INFERENCE_MAX_PER_USER = int(os.getenv("OLLAMA_MAX_PER_USER", "2"))
+INFERENCE_QUEUE_TIMEOUT = float(os.getenv("OLLAMA_QUEUE_TIMEOUT", "300"))
+POSITION_POLL_INTERVAL = 2.0
+
+
+class QueueFull(Exception):
+    pass
+
+
+class _Ticket:
+    __slots__ = ("user", "granted")
+
+    def __init__(self, user):
+        self.user = user
+        self.granted = asyncio.get_running_loop().create_future()
+
+
+class InferenceQueue:
+    """Admits model calls a few at a time, serving waiting users round-robin.
+
+    Every user has their own FIFO and whenever a slot frees up the next user in
+    rotation gets it, so one person queueing several reviews cannot starve
+    everyone else. Both the total backlog and each user's share of it are capped.
+
+    A review is admitted as a `job` and then takes a `turn` for every model call
+    it makes, so a review that calls the model several times (possibly in
+    parallel) still never runs more calls than `concurrency` allows. `slot` is
+    both at once, for work that makes a single call.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = INFERENCE_CONCURRENCY,
+        max_queued: int = INFERENCE_MAX_QUEUED,
+        max_per_user: int = INFERENCE_MAX_PER_USER,
+        timeout: float = INFERENCE_QUEUE_TIMEOUT,
+    ):
+        self.concurrency = concurrency
+        self.max_queued = max_queued
+        self.max_per_user = max_per_user
+        self.timeout = timeout
+        self.active = 0
+        self.queued = 0
+        self.waiting = OrderedDict()  # user -> deque of tickets, in rotation order
+        self.per_user = {}  # user -> jobs in progress
+
+    def position(self, ticket) -> int:
+        """1-based place in line under round-robin service."""
+        rank = self.waiting[ticket.user].index(ticket)
+        ahead = 0
+        before = True
+        for user, tickets in self.waiting.items():
+            if user == ticket.user:
+                before = False
+                ahead += rank
+            else:
+                ahead += min(len(tickets), rank + 1 if before else rank)
+        return ahead + 1
+
+    def _enqueue(self, user):
+        if self.queued >= self.max_queued:
+            raise QueueFull("The review queue is full. Try again in a few minutes.")
+        ticket = _Ticket(user)
+        self.waiting.setdefault(user, deque()).append(ticket)
+        self.queued += 1
+        self._dispatch()
+        return ticket
+
+    def _dispatch(self):
+        while self.active < self.concurrency and self.waiting:
+            user, tickets = next(iter(self.waiting.items()))
+            ticket = tickets.popleft()
+            if tickets:
+                self.waiting.move_to_end(user)
+            else:
+                del self.waiting[user]
+            self.queued -= 1
+            self.active += 1
+            ticket.granted.set_result(None)
+
+    def _withdraw(self, ticket):
+        if ticket.granted.done():
+            # Granted a slot but gave up before using it
+            self._release(ticket)
+            return
+        tickets = self.waiting[ticket.user]
+        tickets.remove(ticket)
+        if not tickets:
+            del self.waiting[ticket.user]
+        self.queued -= 1
+
+    def _release(self, ticket):
+        self.active -= 1
+        self._dispatch()
+
+    async def _wait(self, ticket, on_position):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout
+        last = None
+        while not ticket.granted.done():
+            if on_position is not None:
+                position = self.position(ticket)
+                if position != last:
+                    last = position
+                    await on_position(position)
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                raise asyncio.TimeoutError
+            try:
+                await asyncio.wait_for(asyncio.shield(ticket.granted), min(remaining, POSITION_POLL_INTERVAL))
+            except asyncio.TimeoutError:
+                pass
+
+    @asynccontextmanager
+    async def job(self, user):
+        """Admit one piece of work for `user`; raises QueueFull if they already have `max_per_user` in progress."""
+        mine = self.per_user.get(user, 0)
+        if mine >= self.max_per_user:
+            raise QueueFull(f"You already have {mine} reviews in progress. Try again once they finish.")
+        self.per_user[user] = mine + 1
+        try:
+            yield
+        finally:
+            self.per_user[user] -= 1
+            if not self.per_user[user]:
+                del self.per_user[user]
+
+    @asynccontextmanager
+    async def turn(self, user, on_position=None):
+        """Wait for capacity to make one model call; `on_position(n)` is awaited as the place in line changes.
+
+        Raises QueueFull if the queue is at capacity, and asyncio.TimeoutError
+        if no slot frees up within the queue timeout.
+        """
+        ticket = self._enqueue(user)
+        try:
+            await self._wait(ticket, on_position)
+        except BaseException:
+            self._withdraw(ticket)
+            raise
+        try:
+            yield
+        finally:
+            self._release(ticket)
+
+    @asynccontextmanager
+    async def slot(self, user, on_position=None):
+        """A job that makes a single model call: admission and a turn together."""
+        async with self.job(user), self.turn(user, on_position):
+            yield
+
+    def stats(self) -> dict:
+        return {"active": self.active, "queued": self.queued, "users_waiting": len(self.waiting)}
+
+
+async def stream_generate(session: aiohttp.ClientSession, prompt: str, *, url: str = OLLAMA_URL, model: str = OLLAMA_MODEL, timeout: float = OLLAMA_TIMEOUT):
+    """Yield response text from Ollama's /api/generate as it is produced."""
+    async with track_call("ollama", "generate") as call, session.post(
+        f"{url}/api/generate",
+        json={"model": model, "prompt": prompt, "stream": True},
+        timeout=aiohttp.ClientTimeout(total=timeout),
+    ) as resp:
+        call.status = resp.status
+        resp.raise_for_status()
+        # The streamed body is newline-delimited JSON, one object per token batch
+        async for line in resp.content:
+            if not line.strip():
+                continue
+            data = json.loads(line)
+            if data.get("error"):
+                raise aiohttp.ClientPayloadError(data["error"])
+            if data.get("response"):
+                yield data["response"]
+            if data.get("done"):
+                break
@@ -1,35 +1,88 @@
 import os
 import discord
+from discord import app_commands
 from discord.ext import commands
 from dotenv import load_dotenv
 import asyncio
-from pymongo import MongoClient
 
+# Load .env before importing modules that read their settings at import time
 load_dotenv()
+
+import metrics
+from command_sync import sync_commands
+from credential_store import CredentialStore
+from github_client import GitHubClient
+from github_ratelimit import RateLimitExceeded
+from object_cache import ObjectCache
+from startup import discover_extensions, load_extensions
+from user_store import UserStore
+
 TOKEN = os.getenv("TOKEN")
 MONGO_URI = os.getenv("MONGO_URI")
 
+class InstrumentedTree(app_commands.CommandTree):
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.type == discord.InteractionType.application_command:
+            metrics.command_started(interaction)
+        return True
+
 intents = discord.Intents.default()
-bot = commands.Bot(command_prefix="!", intents=intents)
-bot.mongo = MongoClient(MONGO_URI)
+bot = commands.Bot(command_prefix="!", intents=intents, tree_cls=InstrumentedTree)
+bot.user_store = UserStore(MONGO_URI)
+bot.github = GitHubClient()
+bot.credentials = CredentialStore(bot.user_store)
+bot.git_objects = ObjectCache()
 
 @bot.event
 async def on_ready():
     print(f"Logged in as {bot.user}")
+    # on_ready fires again after every reconnect; the command tree only needs syncing once
+    if getattr(bot, "commands_synced", False):
+        return
     try:
-        synced = await bot.tree.sync()  # Global sync (takes up to 1 hour to propagate)
-        print(f"Globally synced {len(synced)} command(s).")
+        await sync_commands(bot)
+        bot.commands_synced = True
     except Exception as e:
         print(f"Command sync failed: {e}")
 
+@bot.tree.error
+async def on_app_command_error(interaction: discord.Interaction, error: discord.app_commands.AppCommandError):
+    original = getattr(error, "original", error)
+    metrics.command_finished(interaction, "rate_limited" if isinstance(original, RateLimitExceeded) else "error")
+    if not isinstance(original, RateLimitExceeded):
+        await discord.app_commands.CommandTree.on_error(bot.tree, interaction, error)
+        return
+    if interaction.response.is_done():
+        await interaction.followup.send(f"⏳ {original}", ephemeral=True)
+    else:
+        await interaction.response.send_message(f"⏳ {original}", ephemeral=True)
+
+@bot.event
+async def on_app_command_completion(interaction: discord.Interaction, command):
+    metrics.command_finished(interaction, "ok")
+
 async def load_cogs():
-    for filename in os.listdir("./cogs"):
-        if filename.endswith(".py") and not filename.startswith("__"):
-            await bot.load_extension(f"cogs.{filename[:-3]}")
+    await load_extensions(bot, discover_extensions("cogs"))
 
 async def main():
+    try:
+        await bot.user_store.ensure_indexes()
+    except Exception as e:
+        print(f"Could not ensure Mongo indexes: {e}")
     await load_cogs()
-    await bot.start(TOKEN)
+    try:
+        metrics_runner = await metrics.start_server()
+    except OSError as e:
+        print(f"Could not start metrics endpoint: {e}")
+        metrics_runner = None
+    try:
+        await bot.start(TOKEN)
+    finally:
+        await bot.github.aclose()
+        bot.user_store.close()
+        bot.git_objects.close()
+        if metrics_runner is not None:
+            await metrics_runner.cleanup()
 
 if __name__ == "__main__":
     asyncio.run(main())
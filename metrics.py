@@ -0,0 +1,175 @@
+import contextvars
+import os
+import time
+from contextlib import asynccontextmanager
+
+# Local Prometheus scrape endpoint; set METRICS_PORT to an empty string to disable it
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = os.getenv("METRICS_PORT", "9108")
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Name of the app command being handled, so upstream calls can be attributed to it
+current_command = contextvars.ContextVar("current_command", default="")
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    pairs.extend(f'{name}="{_escape(value)}"' for name, value in extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self.values = {}
+
+    def inc(self, *labels, amount=1):
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def samples(self):
+        for labels, value in sorted(self.values.items()):
+            yield f"{self.name}{_format_labels(self.labels, labels)} {value}"
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labels, amount=1):
+        self.inc(*labels, amount=-amount)
+
+    def set(self, *labels, value):
+        self.values[labels] = value
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labels=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self.buckets = buckets
+        self.values = {}  # labels -> [bucket counts..., sum, count]
+
+    def observe(self, *labels, value):
+        series = self.values.get(labels)
+        if series is None:
+            series = self.values[labels] = [0] * (len(self.buckets) + 2)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[i] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def samples(self):
+        for labels, series in sorted(self.values.items()):
+            for bound, count in zip(self.buckets, series):
+                yield f"{self.name}_bucket{_format_labels(self.labels, labels, [('le', bound)])} {count}"
+            yield f"{self.name}_bucket{_format_labels(self.labels, labels, [('le', '+Inf')])} {series[-1]}"
+            yield f"{self.name}_sum{_format_labels(self.labels, labels)} {series[-2]}"
+            yield f"{self.name}_count{_format_labels(self.labels, labels)} {series[-1]}"
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+command_seconds = registry.register(Histogram("gitbot_command_seconds", "Time spent handling app commands.", ("command",)))
+commands_total = registry.register(Counter("gitbot_commands_total", "App commands handled, by outcome.", ("command", "status")))
+commands_in_flight = registry.register(Gauge("gitbot_commands_in_flight", "App commands currently being handled.", ("command",)))
+
+upstream_seconds = registry.register(Histogram("gitbot_upstream_request_seconds", "Latency of calls to GitHub, Mongo and Ollama.", ("service", "operation")))
+upstream_total = registry.register(Counter("gitbot_upstream_requests_total", "Calls to GitHub, Mongo and Ollama, by status and originating command.", ("service", "operation", "status", "command")))
+github_coalesced = registry.register(Counter("gitbot_github_coalesced_total", "GitHub GETs that shared an identical request already in flight, by originating command.", ("command",)))
+upstream_in_flight = registry.register(Gauge("gitbot_upstream_in_flight", "Calls to GitHub, Mongo and Ollama currently in flight.", ("service",)))
+credential_lookups = registry.register(Counter("gitbot_credential_lookups_total", "Linked-account lookups, by whether the credential cache answered them.", ("result",)))
+github_cache_lookups = registry.register(Counter("gitbot_github_cache_lookups_total", "Cacheable GitHub GETs, by whether a cached response was revalidated (hit), not held (miss) or served after a 304 (not_modified).", ("result",)))
+# `scope` is the hashed credential scope from github_cache.token_scope, never a token
+github_ratelimit_remaining = registry.register(Gauge("gitbot_github_ratelimit_remaining", "GitHub quota left, by credential scope and resource.", ("scope", "resource")))
+github_ratelimit_limit = registry.register(Gauge("gitbot_github_ratelimit_limit", "GitHub quota per window, by credential scope and resource.", ("scope", "resource")))
+github_ratelimit_throttled = registry.register(Counter("gitbot_github_ratelimit_throttled_total", "GitHub requests held back to wait for quota, by credential scope and resource.", ("scope", "resource")))
+
+
+def command_started(interaction):
+    name = interaction.command.qualified_name if interaction.command else "unknown"
+    interaction.extras["metrics"] = (name, time.perf_counter())
+    current_command.set(name)
+    commands_in_flight.inc(name)
+
+
+def command_finished(interaction, status: str):
+    started = interaction.extras.pop("metrics", None)
+    if started is None:
+        return
+    name, began = started
+    command_seconds.observe(name, value=time.perf_counter() - began)
+    commands_total.inc(name, status)
+    commands_in_flight.dec(name)
+
+
+class CallStatus:
+    __slots__ = ("status",)
+
+    def __init__(self):
+        self.status = "ok"
+
+
+@asynccontextmanager
+async def track_call(service: str, operation: str):
+    """Time an outbound call; set `.status` on the yielded object (defaults to "ok", or the exception's name)."""
+    call = CallStatus()
+    upstream_in_flight.inc(service)
+    started = time.perf_counter()
+    try:
+        yield call
+    except BaseException as e:
+        if call.status == "ok":
+            call.status = type(e).__name__
+        raise
+    finally:
+        upstream_in_flight.dec(service)
+        upstream_seconds.observe(service, operation, value=time.perf_counter() - started)
+        upstream_total.inc(service, operation, str(call.status), current_command.get())
+
+
+async def start_server(host: str = METRICS_HOST, port: str = METRICS_PORT):
+    """Serve `registry` at http://host:port/metrics; returns the runner, or None if disabled."""
+    if not port:
+        return None
+    from aiohttp import web
+
+    async def handle(request):
+        return web.Response(text=registry.render(), content_type="text/plain", charset="utf-8", headers={"X-Content-Type-Options": "nosniff"})
+
+    app = web.Application()
+    app.router.add_get("/metrics", handle)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, int(port)).start()
+    print(f"Metrics available at http://{host}:{port}/metrics")
+    return runner
@@ -0,0 +1,210 @@
+import asyncio
+import heapq
+import os
+import time
+import zlib
+
+from github_ratelimit import PRIORITY_LOW, RateLimitExceeded
+
+# GitHub's usual X-Poll-Interval; a longer one sent by GitHub always wins
+NOTIFY_POLL_INTERVAL = float(os.getenv("NOTIFY_POLL_INTERVAL", "60"))
+NOTIFY_CONCURRENCY = int(os.getenv("NOTIFY_CONCURRENCY", "10"))
+
+
+def utc_timestamp(seconds: float = None) -> str:
+    """ISO 8601 in the form GitHub uses, so timestamps compare as strings."""
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(seconds))
+
+
+class Subscription:
+    __slots__ = ("discord_id", "since", "last_modified", "seen", "due")
+
+    def __init__(self, discord_id: str, since: str, seen: dict = None):
+        self.discord_id = discord_id
+        self.since = since          # nothing updated before this is delivered
+        self.last_modified = None   # Last-Modified of the previous 200, for If-Modified-Since
+        self.seen = seen or {}      # thread id -> updated_at last delivered, for threads at `since`
+        self.due = 0.0
+
+
+class NotificationPoller:
+    """Polls `/notifications` for subscribed users and hands new threads to `deliver`.
+
+    Every user owns a fixed slot within the poll interval, derived from their
+    Discord ID, so polls are spread over time instead of firing together. Each
+    request carries If-Modified-Since from the previous answer; GitHub replies to
+    an unchanged inbox with a 304 that costs no quota, and its X-Poll-Interval is
+    respected as the minimum wait before the next poll. A thread is delivered once
+    per update: only when it changed after the user last read it and after what
+    was last delivered to them.
+
+    Subscriptions live in the user's Mongo document under `notify`, so they
+    survive restarts and disappear with `/unauth`.
+    """
+
+    def __init__(self, bot, deliver, interval: float = NOTIFY_POLL_INTERVAL, concurrency: int = NOTIFY_CONCURRENCY):
+        self.bot = bot
+        self.deliver = deliver
+        self.interval = interval
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.subscriptions = {}
+        self.schedule = []  # heap of (due, discord_id)
+        self.wakeup = asyncio.Event()
+        self.task = None
+        self.polling = set()
+        self.polls = 0
+        self.not_modified = 0
+        self.delivered = 0
+
+    def start(self):
+        self.task = asyncio.create_task(self.run())
+        self.task.add_done_callback(self._stopped)
+
+    def _stopped(self, task):
+        if not task.cancelled() and task.exception() is not None:
+            e = task.exception()
+            print(f"[notify] Poller stopped: {type(e).__name__}: {e}")
+
+    def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+        for task in self.polling:
+            task.cancel()
+
+    def next_due(self, discord_id: str, delay: float) -> float:
+        """First moment at least `delay` seconds away that falls in the user's slot."""
+        offset = zlib.crc32(discord_id.encode()) % int(self.interval * 1000) / 1000
+        earliest = time.time() + delay
+        due = earliest - earliest % self.interval + offset
+        return due if due >= earliest else due + self.interval
+
+    def _schedule(self, subscription: Subscription, delay: float):
+        subscription.due = self.next_due(subscription.discord_id, delay)
+        heapq.heappush(self.schedule, (subscription.due, subscription.discord_id))
+        self.wakeup.set()
+
+    def _add(self, discord_id: str, since: str, seen: dict = None):
+        subscription = self.subscriptions[discord_id] = Subscription(discord_id, since, seen)
+        self._schedule(subscription, 0)
+
+    async def subscribe(self, discord_id) -> bool:
+        """Start pushing notifications updated from now on; False if the user has no linked account."""
+        discord_id = str(discord_id)
+        if discord_id in self.subscriptions:
+            return True
+        since = utc_timestamp()
+        if not await self.bot.user_store.set_notify(discord_id, enabled=True, since=since, seen={}):
+            return False
+        self._add(discord_id, since)
+        return True
+
+    async def unsubscribe(self, discord_id) -> bool:
+        discord_id = str(discord_id)
+        self.subscriptions.pop(discord_id, None)
+        return await self.bot.user_store.set_notify(discord_id, enabled=False)
+
+    async def run(self):
+        await self.bot.wait_until_ready()
+        try:
+            for user in await self.bot.user_store.notify_subscribers():
+                notify = user["notify"]
+                self._add(user["discord_id"], notify.get("since") or utc_timestamp(), notify.get("seen"))
+        except Exception as e:
+            print(f"[notify] Could not load subscriptions: {e}")
+        print(f"[notify] Polling notifications for {len(self.subscriptions)} subscriber(s)")
+
+        while True:
+            if not self.schedule:
+                self.wakeup.clear()
+                await self.wakeup.wait()
+                continue
+            due, discord_id = self.schedule[0]
+            delay = due - time.time()
+            if delay > 0:
+                self.wakeup.clear()
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            heapq.heappop(self.schedule)
+            subscription = self.subscriptions.get(discord_id)
+            # Entries for users who unsubscribed or were rescheduled are dropped lazily
+            if subscription is None or subscription.due != due:
+                continue
+            task = asyncio.create_task(self._poll(subscription))
+            self.polling.add(task)
+            task.add_done_callback(self.polling.discard)
+
+    async def _poll(self, subscription: Subscription):
+        delay = self.interval
+        try:
+            async with self.semaphore:
+                delay = await self.poll(subscription)
+        except RateLimitExceeded as e:
+            delay = max(e.retry_after, self.interval)
+        except Exception as e:
+            print(f"[notify] Poll for {subscription.discord_id} failed: {type(e).__name__}: {e}")
+        if delay is not None and self.subscriptions.get(subscription.discord_id) is subscription:
+            self._schedule(subscription, delay)
+
+    async def poll(self, subscription: Subscription):
+        """Check one inbox and deliver what is new; returns seconds until the next poll, or None to stop."""
+        token = await self.bot.credentials.get_token(subscription.discord_id)
+        if not token:
+            await self.unsubscribe(subscription.discord_id)
+            return None
+
+        headers = {"If-Modified-Since": subscription.last_modified} if subscription.last_modified else None
+        # The response cache would turn 304s back into 200s; this loop does its own revalidation
+        r = await self.bot.github.get(
+            "/notifications",
+            token=token,
+            headers=headers,
+            params={"since": subscription.since},
+            cache=False,
+            priority=PRIORITY_LOW,
+        )
+        self.polls += 1
+        delay = max(self.interval, float(r.headers.get("X-Poll-Interval") or 0))
+        if r.status_code == 304:
+            self.not_modified += 1
+            return delay
+        if r.status_code == 401:
+            # Token revoked on GitHub's side
+            await self.unsubscribe(subscription.discord_id)
+            return None
+        if r.status_code != 200:
+            return delay
+        subscription.last_modified = r.headers.get("Last-Modified")
+
+        fresh = []
+        for thread in r.json():
+            updated_at = thread["updated_at"]
+            if updated_at < subscription.since:
+                continue
+            if (thread.get("last_read_at") or "") >= updated_at:
+                continue
+            if subscription.seen.get(thread["id"], "") >= updated_at:
+                continue
+            fresh.append(thread)
+        if not fresh:
+            return delay
+
+        await self.deliver(subscription.discord_id, fresh)
+        self.delivered += len(fresh)
+        for thread in fresh:
+            subscription.seen[thread["id"]] = thread["updated_at"]
+        subscription.since = max(thread["updated_at"] for thread in fresh)
+        subscription.seen = {thread_id: updated_at for thread_id, updated_at in subscription.seen.items() if updated_at >= subscription.since}
+        if subscription.discord_id in self.subscriptions:
+            await self.bot.user_store.set_notify(subscription.discord_id, since=subscription.since, seen=subscription.seen)
+        return delay
+
+    def stats(self) -> dict:
+        return {
+            "subscribers": len(self.subscriptions),
+            "polls": self.polls,
+            "not_modified": self.not_modified,
+            "delivered": self.delivered,
+        }
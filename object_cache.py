@@ -0,0 +1,145 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+OBJECT_CACHE_MEMORY_BYTES = int(os.getenv("OBJECT_CACHE_MEMORY_BYTES", str(64 * 1024 * 1024)))
+# Directory holding the on-disk store; set to an empty string to keep objects in memory only
+OBJECT_CACHE_DIR = os.getenv("OBJECT_CACHE_DIR", ".object_cache")
+OBJECT_CACHE_DISK_BYTES = int(os.getenv("OBJECT_CACHE_DISK_BYTES", str(1024 * 1024 * 1024)))
+
+
+class ObjectCache:
+    """Cache for immutable GitHub objects, keyed by kind and SHA (or another stable key).
+
+    Objects are raw bytes held in a size-bounded in-memory LRU, backed by a
+    SQLite file in `OBJECT_CACHE_DIR` that survives restarts and redeploys.
+    Because a key names exactly one content, entries never need revalidation;
+    callers only learn a SHA through a GitHub call made with the user's own
+    credentials. When the file outgrows its budget the least recently used rows
+    are deleted and the freed pages handed back to the filesystem.
+    """
+
+    def __init__(self, max_memory_bytes: int = OBJECT_CACHE_MEMORY_BYTES, disk_dir: Optional[str] = OBJECT_CACHE_DIR, max_disk_bytes: int = OBJECT_CACHE_DISK_BYTES):
+        self.max_memory_bytes = max_memory_bytes
+        self.memory = OrderedDict()
+        self.memory_bytes = 0
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.db = None
+        self.lock = threading.Lock()
+        self.disk_bytes = self._open_disk() if disk_dir else 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evicted = 0
+
+    def _open_disk(self):
+        os.makedirs(self.disk_dir, exist_ok=True)
+        self.db = sqlite3.connect(os.path.join(self.disk_dir, "objects.sqlite3"), check_same_thread=False, isolation_level=None)
+        # auto_vacuum only takes effect on a new database, before the first table exists
+        self.db.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        self.db.execute("PRAGMA journal_mode = WAL")
+        self.db.execute("PRAGMA synchronous = NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS objects ("
+            "kind TEXT NOT NULL, sha TEXT NOT NULL, data BLOB NOT NULL, size INTEGER NOT NULL, used_at REAL NOT NULL, "
+            "PRIMARY KEY (kind, sha))"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS objects_used_at ON objects (used_at)")
+        return self.db.execute("SELECT COALESCE(SUM(size), 0) FROM objects").fetchone()[0]
+
+    def _remember(self, key, data: bytes):
+        if len(data) > self.max_memory_bytes:
+            return
+        old = self.memory.pop(key, None)
+        if old is not None:
+            self.memory_bytes -= len(old)
+        self.memory[key] = data
+        self.memory_bytes += len(data)
+        while self.memory_bytes > self.max_memory_bytes:
+            _, evicted = self.memory.popitem(last=False)
+            self.memory_bytes -= len(evicted)
+
+    async def get(self, kind: str, sha: str) -> Optional[bytes]:
+        key = (kind, sha)
+        data = self.memory.get(key)
+        if data is not None:
+            self.memory.move_to_end(key)
+            self.memory_hits += 1
+            return data
+        if self.db is not None:
+            data = await asyncio.to_thread(self._read_disk, kind, sha)
+            if data is not None:
+                self.disk_hits += 1
+                self._remember(key, data)
+                return data
+        self.misses += 1
+        return None
+
+    async def put(self, kind: str, sha: str, data: bytes):
+        self._remember((kind, sha), data)
+        if self.db is not None:
+            await asyncio.to_thread(self._write_disk, kind, sha, data)
+
+    async def get_json(self, kind: str, key: str):
+        data = await self.get(kind, key)
+        return None if data is None else json.loads(data)
+
+    async def put_json(self, kind: str, key: str, value):
+        await self.put(kind, key, json.dumps(value, separators=(",", ":")).encode())
+
+    def _read_disk(self, kind, sha):
+        with self.lock:
+            row = self.db.execute("SELECT data FROM objects WHERE kind = ? AND sha = ?", (kind, sha)).fetchone()
+            if row is None:
+                return None
+            # Keep recently used objects away from eviction
+            self.db.execute("UPDATE objects SET used_at = ? WHERE kind = ? AND sha = ?", (time.time(), kind, sha))
+        return row[0]
+
+    def _write_disk(self, kind, sha, data):
+        with self.lock:
+            inserted = self.db.execute(
+                "INSERT OR IGNORE INTO objects (kind, sha, data, size, used_at) VALUES (?, ?, ?, ?, ?)",
+                (kind, sha, data, len(data), time.time()),
+            ).rowcount
+            self.disk_bytes += len(data) if inserted else 0
+            if self.disk_bytes > self.max_disk_bytes:
+                self._evict_disk()
+
+    def _evict_disk(self):
+        # Drop least recently used rows until we are back under 90% of the budget, then compact
+        target = self.max_disk_bytes * 0.9
+        victims = []
+        for kind, sha, size in self.db.execute("SELECT kind, sha, size FROM objects ORDER BY used_at"):
+            if self.disk_bytes <= target:
+                break
+            victims.append((kind, sha))
+            self.disk_bytes -= size
+        self.db.execute("BEGIN")
+        self.db.executemany("DELETE FROM objects WHERE kind = ? AND sha = ?", victims)
+        self.db.execute("COMMIT")
+        self.evicted += len(victims)
+        self.db.execute("PRAGMA incremental_vacuum").fetchall()
+
+    def close(self):
+        if self.db is not None:
+            with self.lock:
+                self.db.close()
+                self.db = None
+
+    def stats(self) -> dict:
+        return {
+            "memory_entries": len(self.memory),
+            "memory_bytes": self.memory_bytes,
+            "disk_bytes": self.disk_bytes,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evicted": self.evicted,
+        }
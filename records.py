@@ -0,0 +1,43 @@
+import sys
+from datetime import datetime
+
+# Compact views of GitHub API objects for paginators. Each keeps only what its
+# embed renders, so a live paginator does not pin whole API payloads in memory.
+
+
+class CommitRecord:
+    __slots__ = ("sha", "message", "author", "date", "url")
+
+    def __init__(self, commit):
+        self.sha = commit["sha"][:7]
+        self.message = commit["commit"]["message"].splitlines()[0]
+        self.author = sys.intern(commit["commit"]["author"]["name"])
+        self.date = datetime.strptime(commit["commit"]["author"]["date"], "%Y-%m-%dT%H:%M:%SZ").strftime("%Y-%m-%d")
+        self.url = commit["html_url"]
+
+
+class ReleaseRecord:
+    __slots__ = ("name", "tag", "date", "url")
+
+    def __init__(self, release):
+        self.name = release.get("name", release.get("tag_name", "N/A"))
+        self.tag = release["tag_name"]
+        self.date = datetime.strptime(release["published_at"], "%Y-%m-%dT%H:%M:%SZ").strftime("%Y-%m-%d")
+        self.url = release["html_url"]
+
+
+class TagRecord:
+    __slots__ = ("name", "url")
+
+    def __init__(self, tag: dict):
+        self.name = tag['ref'].split('/')[-1]
+        self.url = tag['url']
+
+
+class CommentRecord:
+    __slots__ = ("user", "created_at", "body")
+
+    def __init__(self, comment):
+        self.user = comment["user"]["login"]
+        self.created_at = comment["created_at"][:10]
+        self.body = comment["body"][:500] + ("..." if len(comment["body"]) > 500 else "")
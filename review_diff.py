@@ -0,0 +1,107 @@
+import os
+
+REVIEW_CHUNK_TOKENS = int(os.getenv("REVIEW_CHUNK_TOKENS", "3000"))
+REVIEW_DIFF_MAX_BYTES = int(os.getenv("REVIEW_DIFF_MAX_BYTES", str(1024 * 1024)))
+
+
+def estimate_tokens(text: str) -> int:
+    # Roughly four characters per token for both code and English
+    return len(text) // 4 + 1
+
+
+class FileDiff:
+    __slots__ = ("path", "header", "hunks")
+
+    def __init__(self, path):
+        self.path = path
+        self.header = []
+        self.hunks = []
+
+
+async def parse_diff(lines, max_bytes: int = REVIEW_DIFF_MAX_BYTES):
+    """Group a streamed unified diff into per-file hunks; returns (files, truncated).
+
+    Reading stops once `max_bytes` have been consumed, so a huge diff is never
+    held in memory.
+    """
+    files = []
+    current = None
+    size = 0
+    async for line in lines:
+        size += len(line) + 1
+        if size > max_bytes:
+            return files, True
+        if line.startswith("diff --git "):
+            current = FileDiff(line.rsplit(" b/", 1)[-1])
+            files.append(current)
+        if current is None:
+            continue
+        if line.startswith("@@"):
+            current.hunks.append([line])
+        elif current.hunks:
+            current.hunks[-1].append(line)
+        else:
+            current.header.append(line)
+    return files, False
+
+
+def _split_hunk(hunk, budget):
+    # Slice an oversized hunk into runs of lines, each repeating the @@ line
+    parts = []
+    part = [hunk[0]]
+    used = estimate_tokens(hunk[0])
+    for line in hunk[1:]:
+        line = line[:budget * 4]
+        cost = estimate_tokens(line)
+        if used + cost > budget and len(part) > 1:
+            parts.append(part)
+            part = [hunk[0]]
+            used = estimate_tokens(hunk[0])
+        part.append(line)
+        used += cost
+    parts.append(part)
+    return parts
+
+
+def chunk_diff(files, budget: int = REVIEW_CHUNK_TOKENS):
+    """Pack file diffs into chunks of at most about `budget` tokens.
+
+    Small files are packed together whole; a file that does not fit on its own
+    is split on hunk boundaries (and oversized hunks on line boundaries), with
+    its header repeated at the top of every piece.
+    """
+    chunks = []
+    current = []
+    used = 0
+
+    def flush():
+        nonlocal current, used
+        if current:
+            chunks.append("\n".join(current))
+        current, used = [], 0
+
+    for diff in files:
+        text = "\n".join(diff.header + [line for hunk in diff.hunks for line in hunk])
+        cost = estimate_tokens(text)
+        if cost <= budget:
+            if used + cost > budget:
+                flush()
+            current.append(text)
+            used += cost
+            continue
+
+        flush()
+        header_cost = estimate_tokens("\n".join(diff.header))
+        room = max(budget - header_cost, 1)
+        for hunk in diff.hunks:
+            for part in _split_hunk(hunk, room):
+                part_cost = estimate_tokens("\n".join(part))
+                if used + part_cost > room:
+                    flush()
+                if not current:
+                    current.extend(diff.header)
+                current.extend(part)
+                used += part_cost
+        flush()
+    flush()
+    return chunks
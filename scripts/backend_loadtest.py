@@ -0,0 +1,83 @@
+# Measures concurrent OAuth callback throughput of backend/api.py against a local
+# GitHub stand-in (scripts/fake_github.py). Needs a reachable MongoDB; writes go to
+# the `gitbot_loadtest` database unless MONGO_DB is set.
+#
+#   MONGO_URI=mongodb://localhost:27017 python scripts/backend_loadtest.py -n 2000 -c 100
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+import httpx
+import uvicorn
+from cryptography.fernet import Fernet
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.fake_github import create_app
+
+
+async def serve(app, port):
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+    return server, task
+
+
+async def run(args):
+    github_url = f"http://127.0.0.1:{args.github_port}"
+    os.environ["GITHUB_OAUTH_URL"] = f"{github_url}/login/oauth"
+    os.environ["GITHUB_API_URL"] = github_url
+    os.environ.setdefault("MONGO_DB", "gitbot_loadtest")
+    os.environ.setdefault("MONGO_URI", "mongodb://localhost:27017")
+    os.environ.setdefault("ENCRYPTION_KEY", Fernet.generate_key().decode())
+
+    from backend.api import app as backend_app
+
+    github, github_task = await serve(create_app(args.latency), args.github_port)
+    backend, backend_task = await serve(backend_app, args.backend_port)
+
+    latencies = []
+    statuses = {}
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async with httpx.AsyncClient(
+        base_url=f"http://127.0.0.1:{args.backend_port}",
+        limits=httpx.Limits(max_connections=args.concurrency),
+        timeout=60,
+    ) as client:
+        async def one(i):
+            async with semaphore:
+                start = time.perf_counter()
+                r = await client.get("/callback", params={"code": f"c{i}", "discord": str(10_000_000 + i)})
+                latencies.append(time.perf_counter() - start)
+                statuses[r.status_code] = statuses.get(r.status_code, 0) + 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(args.requests)))
+        elapsed = time.perf_counter() - started
+
+    backend.should_exit = github.should_exit = True
+    await asyncio.gather(backend_task, github_task)
+
+    latencies.sort()
+    print(f"requests:    {args.requests} at concurrency {args.concurrency}")
+    print(f"statuses:    {statuses}")
+    print(f"elapsed:     {elapsed:.2f}s")
+    print(f"throughput:  {args.requests / elapsed:.1f} callbacks/s")
+    print(f"latency p50: {statistics.median(latencies) * 1000:.1f} ms")
+    print(f"latency p99: {latencies[int(len(latencies) * 0.99) - 1] * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concurrent /callback load test")
+    parser.add_argument("-n", "--requests", type=int, default=1000)
+    parser.add_argument("-c", "--concurrency", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.05, help="simulated GitHub latency in seconds")
+    parser.add_argument("--github-port", type=int, default=9000)
+    parser.add_argument("--backend-port", type=int, default=9001)
+    asyncio.run(run(parser.parse_args()))
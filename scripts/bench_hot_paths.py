@@ -0,0 +1,211 @@
+# Micro-benchmarks for pure, CPU-bound hot paths, on synthetic data at realistic
+# scales (100k-entry trees, 50k commits, ...). No network or Discord connection
+# is needed.
+#
+#   python scripts/bench_hot_paths.py                       # run and print
+#   python scripts/bench_hot_paths.py --save bench.json     # record a baseline
+#   python scripts/bench_hot_paths.py --compare bench.json  # exit 1 on regressions
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cogs.changelog import CommitPaginator
+from cogs.file import File, LinePages
+from cogs.issue import CommentPaginator
+from cogs.notifications import format_notifications
+from cogs.releases import ReleasePaginator
+from cogs.top import language_breakdown
+from tree_renderer import TreeListing
+
+BENCHMARKS = []
+LANGUAGES = ["Python", "JavaScript", "TypeScript", "Go", "Rust", "C", "C++", "Java", "Ruby", None]
+
+
+def benchmark(name):
+    def register(factory):
+        BENCHMARKS.append((name, factory))
+        return factory
+    return register
+
+
+class ExhaustedCursor:
+    has_more = False
+
+    def prefetch(self):
+        pass
+
+
+def make_tree(entries):
+    # A balanced layout: 20 top-level dirs, 25 subdirs each, files spread below
+    tree = []
+    files_per_dir = max(entries // 500 - 1, 1)
+    for a in range(20):
+        tree.append({"path": f"pkg{a}", "type": "tree"})
+        for b in range(25):
+            base = f"pkg{a}/mod{b}"
+            tree.append({"path": base, "type": "tree"})
+            tree.extend({"path": f"{base}/file{c}.py", "type": "blob"} for c in range(files_per_dir))
+    return tree[:entries]
+
+
+def make_commits(n):
+    return [
+        {
+            "sha": f"{i:040x}",
+            "html_url": f"https://github.com/o/r/commit/{i:040x}",
+            "commit": {"message": f"Fix issue #{i}\n\nLonger body {i}", "author": {"name": f"dev{i % 50}", "date": "2024-01-01T00:00:00Z"}},
+        }
+        for i in range(n)
+    ]
+
+
+def make_releases(n):
+    return [
+        {"name": f"v{i}.0.0", "tag_name": f"v{i}.0.0", "html_url": f"https://github.com/o/r/releases/v{i}", "published_at": "2024-01-01T00:00:00Z", "body": "Changes " * 40, "author": {"login": "dev"}}
+        for i in range(n)
+    ]
+
+
+def make_comments(n):
+    return [{"user": {"login": f"user{i}"}, "created_at": "2024-01-01T00:00:00Z", "body": "Looks good " * 80} for i in range(n)]
+
+
+def make_notifications(n):
+    return [
+        {
+            "repository": {"full_name": f"org/repo{i % 40}"},
+            "subject": {"title": f"Bug {i}", "type": "PullRequest" if i % 2 else "Issue", "url": f"https://api.github.com/repos/org/repo{i % 40}/{'pulls' if i % 2 else 'issues'}/{i}"},
+        }
+        for i in range(n)
+    ]
+
+
+@benchmark("tree: generate_tree_string, 100k entries")
+def _():
+    tree = make_tree(100_000)
+    cog = File(bot=None)
+    return lambda: cog.generate_tree_string(tree)
+
+
+@benchmark("tree: render page 200 of 100k-entry listing")
+def _():
+    listing = TreeListing(make_tree(100_000))
+    start = listing.render(0)[1] * 200
+    return lambda: listing.render(start)
+
+
+@benchmark("tree: filtered listing (*.py under one dir), 100k entries")
+def _():
+    tree = make_tree(100_000)
+    return lambda: TreeListing(tree, subdir="pkg3", pattern="*7.py").render(0)
+
+
+@benchmark("file view: paginate 20k lines")
+def _():
+    lines = [f"    value_{i} = compute({i}, option=True)  # comment" for i in range(20_000)]
+    return lambda: LinePages(lines, 1, len(lines))
+
+
+@benchmark("changelog: _create_embed, last page of 50k commits")
+def _():
+    view = CommitPaginator(ExhaustedCursor(), make_commits(50_000), "o/r")
+    view.current_page = view.total_pages - 1
+    return view._create_embed
+
+
+@benchmark("releases: _create_embed, page 100 of 5k releases")
+def _():
+    view = ReleasePaginator(ExhaustedCursor(), make_releases(5_000), "o/r")
+    view.current_page = 100
+    return view._create_embed
+
+
+@benchmark("comments: format_embed, page 500 of 10k comments")
+def _():
+    view = CommentPaginator(make_comments(10_000))
+    view.page = 500
+    return view.format_embed
+
+
+@benchmark("notifications: format 50 (one API page)")
+def _():
+    notifications = make_notifications(50)
+    return lambda: format_notifications(notifications)
+
+
+@benchmark("notifications: format 5k with limit 5k")
+def _():
+    notifications = make_notifications(5_000)
+    return lambda: format_notifications(notifications, limit=5_000)
+
+
+@benchmark("top langs: aggregate 10k repos")
+def _():
+    repos = [{"language": LANGUAGES[i % len(LANGUAGES)]} for i in range(10_000)]
+    return lambda: language_breakdown(repos)
+
+
+def measure(fn, repeat):
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    runs = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    return {"best_s": min(runs), "median_s": statistics.median(runs), "loops": number}
+
+
+def fmt(seconds):
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:8.2f} {unit}"
+    return f"{seconds / 1e-9:8.0f} ns"
+
+
+async def run(args):
+    # discord.ui.View needs a running event loop to be constructed
+    results = {}
+    for name, factory in BENCHMARKS:
+        if args.filter and args.filter not in name:
+            continue
+        results[name] = measure(factory(), args.repeat)
+        print(f"{fmt(results[name]['best_s'])}  (median {fmt(results[name]['median_s']).strip()})  {name}", flush=True)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for pure hot paths")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--filter", help="only run benchmarks whose name contains this")
+    parser.add_argument("--save", metavar="PATH", help="write results as JSON")
+    parser.add_argument("--compare", metavar="PATH", help="compare against a saved baseline")
+    parser.add_argument("--threshold", type=float, default=1.25, help="slowdown ratio that counts as a regression")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = 0
+        print()
+        for name, result in results.items():
+            if name not in baseline:
+                continue
+            ratio = result["best_s"] / baseline[name]["best_s"]
+            flag = "REGRESSION" if ratio > args.threshold else ""
+            regressions += bool(flag)
+            print(f"{ratio:6.2f}x  {name} {flag}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
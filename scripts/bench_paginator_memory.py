@@ -0,0 +1,126 @@
+# Memory held by paginators: raw GitHub JSON (what the paginators used to keep)
+# versus the compact records they keep now, on synthetic payloads shaped like
+# the real API responses (author objects, verification blobs, URLs, ...).
+#
+#   python scripts/bench_paginator_memory.py                # 10k-commit history
+#   python scripts/bench_paginator_memory.py --commits 50000 --views 2000
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cogs.changelog import CommitPaginator
+from records import CommentRecord, CommitRecord, ReleaseRecord
+
+SIGNATURE = "-----BEGIN PGP SIGNATURE-----\n" + "\n".join("wsBcBAABCAAQBQJl" * 4 for _ in range(12)) + "\n-----END PGP SIGNATURE-----\n"
+
+
+class ExhaustedCursor:
+    has_more = False
+
+    def prefetch(self):
+        pass
+
+
+def github_user(login, user_id):
+    base = f"https://api.github.com/users/{login}"
+    return {
+        "login": login, "id": user_id, "node_id": f"MDQ6VXNlcj{user_id:08d}", "avatar_url": f"https://avatars.githubusercontent.com/u/{user_id}?v=4",
+        "gravatar_id": "", "url": base, "html_url": f"https://github.com/{login}", "followers_url": f"{base}/followers",
+        "following_url": f"{base}/following{{/other_user}}", "gists_url": f"{base}/gists{{/gist_id}}", "starred_url": f"{base}/starred{{/owner}}{{/repo}}",
+        "subscriptions_url": f"{base}/subscriptions", "organizations_url": f"{base}/orgs", "repos_url": f"{base}/repos",
+        "events_url": f"{base}/events{{/privacy}}", "received_events_url": f"{base}/received_events", "type": "User", "site_admin": False,
+    }
+
+
+def commit_json(i):
+    sha = f"{i:040x}"
+    api = f"https://api.github.com/repos/octo/hello/commits/{sha}"
+    person = {"name": f"Developer {i % 50}", "email": f"dev{i % 50}@example.com", "date": "2024-01-01T00:00:00Z"}
+    return {
+        "sha": sha, "node_id": f"C_kwDOABCD{i:012d}",
+        "commit": {
+            "author": person, "committer": person, "message": f"Fix issue #{i} in the parser\n\nLonger explanation of change {i}.\n\nSigned-off-by: Developer",
+            "tree": {"sha": f"{i + 1:040x}", "url": f"https://api.github.com/repos/octo/hello/git/trees/{i + 1:040x}"},
+            "url": f"https://api.github.com/repos/octo/hello/git/commits/{sha}", "comment_count": 0,
+            "verification": {"verified": True, "reason": "valid", "signature": SIGNATURE, "payload": f"tree {i + 1:040x}\nparent {i - 1:040x}\n" * 3, "verified_at": "2024-01-01T00:00:01Z"},
+        },
+        "url": api, "html_url": f"https://github.com/octo/hello/commit/{sha}", "comments_url": f"{api}/comments",
+        "author": github_user(f"dev{i % 50}", 1000 + i % 50), "committer": github_user("web-flow", 19864447),
+        "parents": [{"sha": f"{i - 1:040x}", "url": api, "html_url": f"https://github.com/octo/hello/commit/{i - 1:040x}"}],
+    }
+
+
+def release_json(i):
+    return {
+        "url": f"https://api.github.com/repos/octo/hello/releases/{i}", "html_url": f"https://github.com/octo/hello/releases/tag/v{i}.0.0",
+        "assets_url": f"https://api.github.com/repos/octo/hello/releases/{i}/assets", "id": i, "node_id": f"RE_kwDO{i:010d}",
+        "tag_name": f"v{i}.0.0", "target_commitish": "main", "name": f"Version {i}.0.0", "draft": False, "prerelease": False,
+        "created_at": "2024-01-01T00:00:00Z", "published_at": "2024-01-01T00:00:00Z", "author": github_user("releaser", 42),
+        "assets": [], "body": "## What's changed\n" + "* Fixed a bug in the parser by @dev\n" * 40,
+    }
+
+
+def comment_json(i):
+    return {
+        "url": f"https://api.github.com/repos/octo/hello/issues/comments/{i}", "html_url": f"https://github.com/octo/hello/issues/1#issuecomment-{i}",
+        "id": i, "node_id": f"IC_kwDO{i:010d}", "user": github_user(f"user{i % 200}", 5000 + i % 200),
+        "created_at": "2024-01-01T00:00:00Z", "updated_at": "2024-01-01T00:00:00Z", "author_association": "CONTRIBUTOR",
+        "body": "Thanks, this looks good to me. " * 30, "reactions": {"total_count": 0, "+1": 0, "-1": 0, "url": "https://api.github.com/reactions"},
+    }
+
+
+def measure(build):
+    """Bytes still allocated after `build()` returns, with its result kept alive."""
+    gc.collect()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0] - before, result
+
+
+def compare(name, payload, record):
+    # Parse from bytes, as the client does, so the raw side owns fresh objects
+    raw_bytes, raw = measure(lambda: json.loads(payload))
+    compact_bytes, _ = measure(lambda: [record(item) for item in json.loads(payload)])
+    del raw
+    print(f"{name:<42} {raw_bytes / 2**20:9.2f} MB  {compact_bytes / 2**20:9.2f} MB  {raw_bytes / max(compact_bytes, 1):6.1f}x")
+
+
+async def live_views(count, per_view):
+    page = json.dumps([commit_json(i) for i in range(per_view)]).encode()
+    # Before: each message's paginator kept its page of raw commits
+    raw_bytes, raw = measure(lambda: [json.loads(page) for _ in range(count)])
+    del raw
+    views_bytes, views = measure(lambda: [CommitPaginator(ExhaustedCursor(), json.loads(page), "octo/hello") for _ in range(count)])
+    view_overhead, _ = measure(lambda: [CommitPaginator(ExhaustedCursor(), [], "octo/hello") for _ in range(count)])
+    records_bytes = views_bytes - view_overhead
+    print(f"{f'{count} live /changelog views ({per_view} commits)':<42} {raw_bytes / 2**20:9.2f} MB  {records_bytes / 2**20:9.2f} MB  {raw_bytes / max(records_bytes, 1):6.1f}x"
+          f"   (+{view_overhead / 2**20:.2f} MB of View objects either way)")
+    del views
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Paginator memory: raw GitHub JSON vs compact records")
+    parser.add_argument("--commits", type=int, default=10_000)
+    parser.add_argument("--releases", type=int, default=1_000)
+    parser.add_argument("--comments", type=int, default=5_000)
+    parser.add_argument("--views", type=int, default=1_000, help="live /changelog messages to simulate")
+    args = parser.parse_args()
+
+    tracemalloc.start()
+    print(f"{'':<42} {'raw JSON':>12}  {'records':>12}  {'saving':>7}")
+    compare(f"{args.commits} commits", json.dumps([commit_json(i) for i in range(args.commits)]).encode(), CommitRecord)
+    compare(f"{args.releases} releases", json.dumps([release_json(i) for i in range(args.releases)]).encode(), ReleaseRecord)
+    compare(f"{args.comments} comments", json.dumps([comment_json(i) for i in range(args.comments)]).encode(), CommentRecord)
+    asyncio.run(live_views(args.views, 30))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+# Fires concurrent slash-command invocations at the real cogs, with GitHub replaced
+# by the local stand-in (scripts/fake_github.py) and Discord by fake interactions.
+# Reports latency percentiles, GitHub requests per command and memory use.
+#
+#   python scripts/bot_loadtest.py -n 2000 -c 200 --latency 0.05
+#   python scripts/bot_loadtest.py --mix "repo view=3,pr open=1" --repos 20
+
+import argparse
+import asyncio
+import itertools
+import os
+import resource
+import statistics
+import sys
+import time
+
+import discord
+import uvicorn
+from discord.ext import commands
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import metrics
+from credential_store import LinkedUser
+from github_client import GitHubClient
+from object_cache import ObjectCache
+from scripts.fake_github import create_app
+
+EXTENSIONS = ["cogs.repo", "cogs.changelog", "cogs.file", "cogs.pr"]
+DEFAULT_MIX = "repo view=1,changelog=1,file tree=1,pr open=1"
+
+
+class FakeCredentials:
+    # Every user is linked; avoids needing Mongo
+    async def get_user(self, discord_id):
+        return LinkedUser(f"user{discord_id}", f"gho_fake_{discord_id}")
+
+    async def get_token(self, discord_id):
+        return f"gho_fake_{discord_id}"
+
+
+class FakeMessage:
+    async def edit(self, **kwargs):
+        pass
+
+
+class FakeResponse:
+    def __init__(self):
+        self.done = False
+
+    def is_done(self):
+        return self.done
+
+    async def defer(self, **kwargs):
+        self.done = True
+
+    async def send_message(self, *args, **kwargs):
+        self.done = True
+
+    async def edit_message(self, **kwargs):
+        self.done = True
+
+    async def send_modal(self, modal):
+        self.done = True
+
+
+class FakeFollowup:
+    def __init__(self, interaction):
+        self.interaction = interaction
+
+    async def send(self, *args, **kwargs):
+        self.interaction.replies += 1
+        return FakeMessage()
+
+
+class FakeInteraction:
+    """Just enough of discord.Interaction for the cogs under test."""
+
+    def __init__(self, bot, user_id, command):
+        self.client = bot
+        self.user = discord.Object(id=user_id)
+        self.command = command
+        self.type = discord.InteractionType.application_command
+        self.extras = {}
+        self.replies = 0
+        self.response = FakeResponse()
+        self.followup = FakeFollowup(self)
+
+    async def edit_original_response(self, **kwargs):
+        return FakeMessage()
+
+
+def rss_mb():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def find_command(bot, qualified_name):
+    parent, _, child = qualified_name.partition(" ")
+    command = bot.tree.get_command(parent)
+    return command.get_command(child) if child else command
+
+
+def command_args(name, repo, i):
+    if name == "repo view":
+        return {"repo": repo}
+    if name == "changelog":
+        return {"repo": repo}
+    if name == "file tree":
+        return {"repo": repo, "branch": "main", "path": None, "pattern": None, "depth": None}
+    if name == "pr open":
+        return {"repo": repo, "pr_id": (i % 5) + 1 if i % 2 else None}
+    raise ValueError(f"No arguments known for /{name}")
+
+
+async def serve(app, port):
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+    return server, task
+
+
+async def run(args):
+    fake = create_app(args.latency, fixtures_dir=args.fixtures, rate_limit=args.rate_limit)
+    server, server_task = await serve(fake, args.port)
+
+    bot = commands.Bot(command_prefix="!", intents=discord.Intents.none())
+    bot.github = GitHubClient(f"http://127.0.0.1:{args.port}", http2=False)
+    bot.credentials = FakeCredentials()
+    bot.git_objects = ObjectCache(disk_dir=None)
+    for extension in EXTENSIONS:
+        await bot.load_extension(extension)
+
+    mix = []
+    for part in args.mix.split(","):
+        name, _, weight = part.partition("=")
+        mix += [name.strip()] * int(weight or 1)
+    commands_by_name = {name: find_command(bot, name) for name in set(mix)}
+    repos = [f"loadtest/repo{r}" for r in range(args.repos)]
+
+    latencies = {name: [] for name in commands_by_name}
+    failures = {name: 0 for name in commands_by_name}
+    semaphore = asyncio.Semaphore(args.concurrency)
+    rss_before = rss_mb()
+
+    async def one(i, name):
+        command = commands_by_name[name]
+        interaction = FakeInteraction(bot, 1000 + i % args.users, command)
+        async with semaphore:
+            metrics.current_command.set(name)
+            started = time.perf_counter()
+            try:
+                await command.callback(command.binding, interaction, **command_args(name, repos[i % len(repos)], i))
+            except Exception as e:
+                failures[name] += 1
+                if failures[name] == 1:
+                    print(f"/{name} failed: {type(e).__name__}: {e}")
+                return
+            latencies[name].append(time.perf_counter() - started)
+            if not interaction.replies:
+                failures[name] += 1
+
+    schedule = list(itertools.islice(itertools.cycle(mix), args.requests))
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i, name) for i, name in enumerate(schedule)))
+    elapsed = time.perf_counter() - started
+
+    await bot.github.aclose()
+    server.should_exit = True
+    await server_task
+
+    github_calls = {}
+    for (service, _, status, command), count in metrics.upstream_total.values.items():
+        if service == "github":
+            github_calls.setdefault(command, {}).setdefault(status, 0)
+            github_calls[command][status] += count
+
+    print(f"invocations: {args.requests} at concurrency {args.concurrency}, {elapsed:.2f}s, {args.requests / elapsed:.1f}/s")
+    print(f"fake GitHub: {fake.state.requests} requests, {fake.state.not_modified} answered 304")
+    print(f"{'command':<12} {'ok':>6} {'fail':>5} {'p50 ms':>8} {'p99 ms':>8} {'gh req/cmd':>10}  statuses")
+    for name in commands_by_name:
+        samples = sorted(latencies[name])
+        calls = github_calls.get(name, {})
+        per_command = sum(calls.values()) / max(len(samples) + failures[name], 1)
+        p50 = statistics.median(samples) * 1000 if samples else float("nan")
+        p99 = samples[max(int(len(samples) * 0.99) - 1, 0)] * 1000 if samples else float("nan")
+        print(f"{name:<12} {len(samples):>6} {failures[name]:>5} {p50:>8.1f} {p99:>8.1f} {per_command:>10.2f}  {dict(sorted(calls.items()))}")
+    print(f"memory: RSS {rss_before:.1f} -> {rss_mb():.1f} MB, peak {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} MB")
+    print(f"response cache: {bot.github.cache.stats()}, coalesced GETs: {bot.github.coalesced}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent slash-command load test against a local GitHub stand-in")
+    parser.add_argument("-n", "--requests", type=int, default=2000)
+    parser.add_argument("-c", "--concurrency", type=int, default=200)
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="comma-separated `command=weight` pairs")
+    parser.add_argument("--repos", type=int, default=50, help="distinct repositories to spread invocations over")
+    parser.add_argument("--users", type=int, default=500, help="distinct Discord users")
+    parser.add_argument("--latency", type=float, default=0.05, help="simulated GitHub latency in seconds")
+    parser.add_argument("--rate-limit", type=int, default=1_000_000, help="fake GitHub hourly budget per token")
+    parser.add_argument("--fixtures", help="directory of recorded GitHub responses (see scripts/fake_github.py)")
+    parser.add_argument("--port", type=int, default=9002)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
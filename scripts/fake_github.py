@@ -0,0 +1,225 @@
+# A local stand-in for the parts of GitHub that GitBot talks to, for load tests.
+#
+# Besides the OAuth endpoints used by the backend it serves synthetic repos,
+# commits (paginated with Link headers), git trees and pull requests. Every
+# response carries X-RateLimit-* headers and an ETag, and honours If-None-Match.
+# Recorded responses can be dropped into a fixtures directory as
+# `<fixtures>/<url path>.json` (e.g. `repos/octo/hello/pulls/1.json`) and are
+# served in place of the synthetic data.
+#
+# Run standalone with:
+#   python scripts/fake_github.py --port 9000 --latency 0.05
+
+import argparse
+import asyncio
+import hashlib
+import itertools
+import json
+import os
+import time
+from urllib.parse import parse_qs
+from fastapi import FastAPI, Header, Request
+from fastapi.responses import JSONResponse, Response
+
+_ids = itertools.count(1)
+
+
+def _sha(*parts):
+    return hashlib.sha1("/".join(map(str, parts)).encode()).hexdigest()
+
+
+def create_app(
+    latency: float = 0.0,
+    fixtures_dir: str = None,
+    rate_limit: int = 1_000_000,
+    commits: int = 300,
+    tree_size: int = 5000,
+    pulls: int = 30,
+) -> FastAPI:
+    """Build the stand-in app; every endpoint sleeps `latency` seconds to mimic GitHub.
+
+    `rate_limit` is the hourly core budget per token (or for anonymous calls);
+    once spent, requests get GitHub's 403 with `X-RateLimit-Remaining: 0`.
+    """
+    app = FastAPI()
+    app.state.requests = 0
+    app.state.not_modified = 0
+    budgets = {}
+    reset_at = int(time.time()) + 3600
+
+    def rate_headers(request):
+        key = request.headers.get("authorization", "anon")
+        remaining = budgets[key] = budgets.get(key, rate_limit) - 1
+        return {
+            "X-RateLimit-Limit": str(rate_limit),
+            "X-RateLimit-Remaining": str(max(remaining, 0)),
+            "X-RateLimit-Used": str(rate_limit - max(remaining, 0)),
+            "X-RateLimit-Reset": str(reset_at),
+            "X-RateLimit-Resource": "core",
+        }, remaining >= 0
+
+    def load_fixture(request):
+        if not fixtures_dir:
+            return None
+        path = os.path.join(fixtures_dir, request.url.path.strip("/") + ".json")
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    async def respond(request, build, media_type="application/json", headers=None):
+        """Serve `build()` (or a recorded fixture) with rate-limit headers and ETag revalidation."""
+        app.state.requests += 1
+        await asyncio.sleep(latency)
+        limit_headers, allowed = rate_headers(request)
+        if not allowed:
+            return JSONResponse({"message": "API rate limit exceeded"}, status_code=403, headers=limit_headers)
+
+        body = load_fixture(request)
+        if body is None:
+            payload = build()
+            if payload is None:
+                return JSONResponse({"message": "Not Found"}, status_code=404, headers=limit_headers)
+            body = payload.encode() if isinstance(payload, str) else json.dumps(payload).encode()
+        etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        all_headers = {**limit_headers, **(headers or {}), "ETag": etag}
+        if request.headers.get("if-none-match") == etag:
+            app.state.not_modified += 1
+            return Response(status_code=304, headers=all_headers)
+        return Response(body, media_type=media_type, headers=all_headers)
+
+    def repo_json(owner, repo):
+        full_name = f"{owner}/{repo}"
+        return {
+            "id": int(_sha(full_name)[:8], 16),
+            "name": repo,
+            "full_name": full_name,
+            "owner": {"login": owner},
+            "private": False,
+            "html_url": f"https://github.com/{full_name}",
+            "description": f"Synthetic repository {full_name}",
+            "language": "Python",
+            "stargazers_count": 1234,
+            "forks_count": 56,
+            "open_issues_count": pulls,
+            "default_branch": "main",
+            "license": {"name": "MIT License"},
+            "created_at": "2020-01-01T00:00:00Z",
+            "updated_at": "2024-01-01T00:00:00Z",
+            "pushed_at": "2024-01-01T00:00:00Z",
+        }
+
+    def pull_json(owner, repo, number):
+        return {
+            "id": int(_sha(owner, repo, "pull", number)[:8], 16),
+            "number": number,
+            "title": f"Synthetic change #{number}",
+            "user": {"login": f"dev{number % 7}"},
+            "state": "open",
+            "draft": False,
+            "html_url": f"https://github.com/{owner}/{repo}/pull/{number}",
+            "created_at": "2024-01-01T00:00:00Z",
+            "updated_at": "2024-01-02T00:00:00Z",
+            "body": "Synthetic pull request body.",
+            "commits": 3,
+            "additions": 120,
+            "deletions": 30,
+            "changed_files": 4,
+            "head": {"sha": _sha(owner, repo, "head", number)},
+            "base": {"sha": _sha(owner, repo, "base")},
+        }
+
+    @app.post("/login/oauth/access_token")
+    async def access_token(request: Request):
+        await asyncio.sleep(latency)
+        form = parse_qs((await request.body()).decode())
+        code = form.get("code", [""])[0]
+        if not code:
+            return {"error": "bad_verification_code"}
+        return {"access_token": f"gho_fake_{code}", "token_type": "bearer", "scope": "repo"}
+
+    @app.get("/user")
+    async def user(authorization: str = Header(None)):
+        await asyncio.sleep(latency)
+        if not authorization:
+            return JSONResponse({"message": "Requires authentication"}, status_code=401)
+        user_id = next(_ids)
+        return {
+            "id": user_id,
+            "login": f"user{user_id}",
+            "avatar_url": f"https://avatars.example.invalid/{user_id}",
+        }
+
+    @app.get("/repos/{owner}/{repo}")
+    async def get_repo(request: Request, owner: str, repo: str):
+        return await respond(request, lambda: repo_json(owner, repo))
+
+    @app.get("/repos/{owner}/{repo}/commits")
+    async def list_commits(request: Request, owner: str, repo: str, per_page: int = 30, page: int = 1):
+        per_page = min(per_page, 100)
+        start = (page - 1) * per_page
+        headers = {}
+        if start + per_page < commits:
+            next_url = request.url.include_query_params(page=page + 1)
+            headers["Link"] = f'<{next_url}>; rel="next"'
+
+        def build():
+            return [
+                {
+                    "sha": _sha(owner, repo, "commit", i),
+                    "html_url": f"https://github.com/{owner}/{repo}/commit/{_sha(owner, repo, 'commit', i)}",
+                    "commit": {
+                        "message": f"Synthetic commit {i}\n\nDetails for commit {i}.",
+                        "author": {"name": f"dev{i % 7}", "date": "2024-01-01T00:00:00Z"},
+                    },
+                }
+                for i in range(start, min(start + per_page, commits))
+            ]
+
+        return await respond(request, build, headers=headers)
+
+    @app.get("/repos/{owner}/{repo}/commits/{ref}")
+    async def get_commit(request: Request, owner: str, repo: str, ref: str):
+        sha = _sha(owner, repo, "commit", 0) if ref in ("main", "HEAD") else ref
+        if request.headers.get("accept") == "application/vnd.github.sha":
+            return await respond(request, lambda: sha, media_type="text/plain")
+        return await respond(request, lambda: {"sha": sha, "commit": {"message": "Synthetic commit 0"}})
+
+    @app.get("/repos/{owner}/{repo}/git/trees/{sha}")
+    async def get_tree(request: Request, owner: str, repo: str, sha: str):
+        def build():
+            tree = []
+            for d in range(max(tree_size // 50, 1)):
+                tree.append({"path": f"src/pkg{d}", "type": "tree", "sha": _sha(sha, d)})
+                tree.extend(
+                    {"path": f"src/pkg{d}/module{f}.py", "type": "blob", "sha": _sha(sha, d, f), "size": 1024}
+                    for f in range(49)
+                )
+            return {"sha": sha, "tree": tree[:tree_size], "truncated": False}
+
+        return await respond(request, build)
+
+    @app.get("/repos/{owner}/{repo}/pulls")
+    async def list_pulls(request: Request, owner: str, repo: str, state: str = "open"):
+        return await respond(request, lambda: [dict(pull_json(owner, repo, n), state=state) for n in range(1, pulls + 1)])
+
+    @app.get("/repos/{owner}/{repo}/pulls/{number}")
+    async def get_pull(request: Request, owner: str, repo: str, number: int):
+        return await respond(request, lambda: pull_json(owner, repo, number) if number <= pulls else None)
+
+    return app
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Local GitHub stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=int(os.getenv("FAKE_GITHUB_PORT", "9000")))
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds of simulated latency per request")
+    parser.add_argument("--fixtures", help="directory of recorded JSON responses to serve instead of synthetic data")
+    parser.add_argument("--rate-limit", type=int, default=1_000_000, help="hourly request budget per token")
+    args = parser.parse_args()
+    app = create_app(args.latency, fixtures_dir=args.fixtures, rate_limit=args.rate_limit)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
@@ -0,0 +1,65 @@
+# A local stand-in for Ollama's /api/generate, for exercising /review without a model.
+#
+# Run standalone with:
+#   python scripts/fake_ollama.py --port 11434 --tokens 200 --token-delay 0.02
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+
+
+def create_app(tokens: int = 200, token_delay: float = 0.02) -> FastAPI:
+    """Build the stand-in app; each generation emits `tokens` words, `token_delay` seconds apart."""
+    app = FastAPI()
+    app.state.running = 0
+    app.state.peak = 0
+
+    @app.post("/api/generate")
+    async def generate(request: Request):
+        body = await request.json()
+        model = body.get("model", "fake")
+        words = [f"token{i} " for i in range(tokens)]
+
+        async def run():
+            app.state.running += 1
+            app.state.peak = max(app.state.peak, app.state.running)
+            try:
+                for word in words:
+                    await asyncio.sleep(token_delay)
+                    yield word
+            finally:
+                app.state.running -= 1
+
+        if not body.get("stream", True):
+            text = "".join([word async for word in run()])
+            return {"model": model, "response": text, "done": True}
+
+        async def ndjson():
+            started = time.monotonic()
+            async for word in run():
+                yield json.dumps({"model": model, "response": word, "done": False}) + "\n"
+            yield json.dumps({"model": model, "response": "", "done": True, "total_duration": int((time.monotonic() - started) * 1e9)}) + "\n"
+
+        return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+    @app.get("/stats")
+    async def stats():
+        return {"running": app.state.running, "peak": app.state.peak}
+
+    return app
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Local Ollama stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=int(os.getenv("FAKE_OLLAMA_PORT", "11434")))
+    parser.add_argument("--tokens", type=int, default=200, help="words generated per request")
+    parser.add_argument("--token-delay", type=float, default=0.02, help="seconds between words")
+    args = parser.parse_args()
+    uvicorn.run(create_app(args.tokens, args.token_delay), host=args.host, port=args.port, log_level="warning")
@@ -0,0 +1,106 @@
+# Replays recorded GitHub webhook deliveries against the backend's /webhook,
+# signed the way GitHub signs them, so the fan-out can be exercised locally.
+# Each payload is signed with its repository's hook secret, derived from the
+# backend's GITHUB_WEBHOOK_SECRET as /watch add does.
+#
+# A recording is a JSON file holding {"event": "<X-GitHub-Event>", "payload": {...}};
+# scripts/webhook_payloads/ has one per supported event. With --discord-port the
+# script also serves a stand-in for Discord's REST API that prints every message
+# the backend posts; start the backend with DISCORD_API_URL pointing at it:
+#
+#   DISCORD_API_URL=http://127.0.0.1:9003 uvicorn backend.api:app --port 2000
+#   python scripts/replay_webhooks.py scripts/webhook_payloads --discord-port 9003
+#
+# Replays only reach a channel that watches the payload's repository (`/watch add`).
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import uuid
+
+import httpx
+import uvicorn
+from fastapi import FastAPI, Request
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from webhook_signing import repo_webhook_secret, sign
+
+
+def load_recordings(paths):
+    recordings = []
+    for path in paths:
+        files = [os.path.join(path, name) for name in sorted(os.listdir(path)) if name.endswith(".json")] if os.path.isdir(path) else [path]
+        for file in files:
+            with open(file) as f:
+                recording = json.load(f)
+            repo = recording["payload"]["repository"]["full_name"]
+            recordings.append((os.path.basename(file), recording["event"], repo, json.dumps(recording["payload"]).encode()))
+    return recordings
+
+
+def create_discord_app():
+    app = FastAPI()
+    app.state.messages = 0
+
+    @app.post("/channels/{channel_id}/messages")
+    async def create_message(channel_id: str, request: Request):
+        message = await request.json()
+        app.state.messages += 1
+        titles = ", ".join(embed.get("title", "") for embed in message.get("embeds", []))
+        print(f"  -> channel {channel_id}: {len(message.get('embeds', []))} embed(s): {titles}")
+        return {"id": str(app.state.messages), "channel_id": channel_id}
+
+    return app
+
+
+async def run(args):
+    recordings = load_recordings(args.paths) * args.repeat
+    server = None
+    if args.discord_port:
+        server = uvicorn.Server(uvicorn.Config(create_discord_app(), host="127.0.0.1", port=args.discord_port, log_level="warning"))
+        server_task = asyncio.create_task(server.serve())
+        while not server.started:
+            await asyncio.sleep(0.05)
+
+    statuses = {}
+    started = time.perf_counter()
+    async with httpx.AsyncClient(timeout=10) as http:
+        for name, event, repo, body in recordings:
+            headers = {
+                "Content-Type": "application/json",
+                "X-GitHub-Event": event,
+                "X-GitHub-Delivery": str(uuid.uuid4()),
+                "X-Hub-Signature-256": sign(repo_webhook_secret(args.secret, repo), body),
+            }
+            res = await http.post(args.url, content=body, headers=headers)
+            statuses[res.status_code] = statuses.get(res.status_code, 0) + 1
+            print(f"{name:<28} {event:<14} {res.status_code}")
+    print(f"Replayed {len(recordings)} deliveries in {time.perf_counter() - started:.2f}s: {statuses}")
+
+    if server is not None:
+        # Give the backend's batch window time to flush
+        await asyncio.sleep(args.wait)
+        server.should_exit = True
+        await server_task
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded GitHub webhook deliveries")
+    parser.add_argument("paths", nargs="+", help="recording files or directories of them")
+    parser.add_argument("--url", default="http://127.0.0.1:2000/webhook")
+    parser.add_argument("--secret", default=os.getenv("GITHUB_WEBHOOK_SECRET"), help="defaults to $GITHUB_WEBHOOK_SECRET")
+    parser.add_argument("--repeat", type=int, default=1, help="send every recording this many times")
+    parser.add_argument("--discord-port", type=int, help="serve a Discord REST stand-in on this port and print what it receives")
+    parser.add_argument("--wait", type=float, default=5.0, help="seconds to keep the Discord stand-in up after replaying")
+    args = parser.parse_args()
+    if not args.secret:
+        parser.error("a webhook secret is required (--secret or GITHUB_WEBHOOK_SECRET)")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
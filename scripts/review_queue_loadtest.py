@@ -0,0 +1,84 @@
+# Drives the /review inference queue (inference.py) against the local Ollama
+# stand-in (scripts/fake_ollama.py) and reports queue fairness and latency.
+# One "heavy" user submits several reviews at once alongside many light users.
+#
+#   python scripts/review_queue_loadtest.py --users 8 --heavy-jobs 4 --concurrency 2
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+import aiohttp
+import uvicorn
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from inference import InferenceQueue, QueueFull, stream_generate
+from scripts.fake_ollama import create_app
+
+
+async def serve(app, port):
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+    return server, task
+
+
+async def review(queue, session, url, user, results):
+    started = time.perf_counter()
+    first_token = None
+    try:
+        async with queue.slot(user):
+            async for _ in stream_generate(session, "Review this repository", url=url):
+                if first_token is None:
+                    first_token = time.perf_counter() - started
+    except QueueFull:
+        results.append((user, None, None, time.perf_counter()))
+        return
+    results.append((user, first_token, time.perf_counter() - started, time.perf_counter()))
+
+
+async def run(args):
+    app = create_app(args.tokens, args.token_delay)
+    server, task = await serve(app, args.port)
+    url = f"http://127.0.0.1:{args.port}"
+    queue = InferenceQueue(concurrency=args.concurrency, max_queued=args.max_queued, max_per_user=args.heavy_jobs)
+    results = []
+    try:
+        async with aiohttp.ClientSession() as session:
+            jobs = [review(queue, session, url, "heavy", results) for _ in range(args.heavy_jobs)]
+            jobs += [review(queue, session, url, f"user{i}", results) for i in range(args.users)]
+            await asyncio.gather(*jobs)
+    finally:
+        server.should_exit = True
+        await task
+
+    done = [r for r in results if r[1] is not None]
+    order = [user for user, *_ in sorted(done, key=lambda r: r[3])]
+    firsts = sorted(r[1] for r in done)
+    totals = sorted(r[2] for r in done)
+    print(f"completed     {len(done)}/{len(results)} (rejected {len(results) - len(done)})")
+    print(f"peak parallel {app.state.peak} (limit {args.concurrency})")
+    print(f"first token   p50 {statistics.median(firsts) * 1000:.0f} ms, max {firsts[-1] * 1000:.0f} ms")
+    print(f"total         p50 {statistics.median(totals) * 1000:.0f} ms, max {totals[-1] * 1000:.0f} ms")
+    print(f"heavy user finished at positions {[i + 1 for i, user in enumerate(order) if user == 'heavy']} of {len(order)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=8, help="light users, one review each")
+    parser.add_argument("--heavy-jobs", type=int, default=4, help="reviews queued at once by one user")
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--max-queued", type=int, default=50)
+    parser.add_argument("--tokens", type=int, default=50)
+    parser.add_argument("--token-delay", type=float, default=0.005)
+    parser.add_argument("--port", type=int, default=9101)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""Extension loading with a per-extension startup report.
+
+Loading happens in two phases. The modules the extensions import (found by
+reading their import statements) are imported first, concurrently in worker
+threads, and each gets its own import time in the report (wall time in its
+thread, so a module that waits on another thread's import of a shared
+dependency includes the wait). The extensions are
+then loaded one at a time with `bot.load_extension`. Extensions are not
+gathered: `load_extension` executes the module and awaits `setup` without
+yielding in between, so gathering them would run them back to back anyway and
+only blur the per-extension numbers. Splitting the phases is what lets one
+extension's timing stop including a heavy dependency it happens to import
+first.
+
+For each extension the time spent executing its module body (`import_s`) is
+reported separately from the time spent in `setup` (`setup_s`). discord.py
+always executes the module itself, so the split comes from a finder that wraps
+the extension's loader rather than from importing the module ahead of time,
+which would only make discord.py execute it a second time.
+"""
+
+import ast
+import asyncio
+import importlib
+import importlib.abc
+import importlib.machinery
+import importlib.util
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+# Where the startup report is written; set to an empty string to skip the file
+STARTUP_REPORT_PATH = os.getenv("STARTUP_REPORT_PATH", "startup_report.json")
+# Measure each extension's memory with tracemalloc, which slows the whole boot down
+STARTUP_TRACE_MEMORY = os.getenv("STARTUP_TRACE_MEMORY", "").lower() in ("1", "true", "yes")
+
+
+def discover_extensions(directory: str = "cogs") -> list:
+    return sorted(
+        f"{directory}.{filename[:-3]}"
+        for filename in os.listdir(directory)
+        if filename.endswith(".py") and not filename.startswith("__")
+    )
+
+
+def extension_dependencies(names: list) -> list:
+    """Top-level modules imported by the extensions in `names` that aren't imported yet."""
+    found = set()
+    for name in names:
+        spec = importlib.util.find_spec(name)
+        if spec is None or not spec.origin:
+            continue
+        try:
+            with open(spec.origin, encoding="utf-8") as f:
+                tree = ast.parse(f.read(), spec.origin)
+        except (OSError, SyntaxError):
+            continue
+        for node in tree.body:
+            if isinstance(node, ast.Import):
+                found.update(alias.name for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+                found.add(node.module)
+    return sorted(module for module in found if module not in sys.modules and module not in names)
+
+
+class _TimedLoader(importlib.abc.Loader):
+    def __init__(self, loader, timings: dict, name: str):
+        self.loader = loader
+        self.timings = timings
+        self.name = name
+
+    def create_module(self, spec):
+        return self.loader.create_module(spec)
+
+    def exec_module(self, module):
+        started = time.perf_counter()
+        try:
+            self.loader.exec_module(module)
+        finally:
+            self.timings[self.name] = time.perf_counter() - started
+
+    def __getattr__(self, attr):
+        # get_source, get_code and friends, for tracebacks and inspect
+        return getattr(self.loader, attr)
+
+
+class _ExtensionTimer(importlib.abc.MetaPathFinder):
+    """Records how long each of `names` takes to execute its module body."""
+
+    def __init__(self, names: list):
+        self.names = set(names)
+        self.timings = {}
+
+    def find_spec(self, fullname, path=None, target=None):
+        if fullname not in self.names:
+            return None
+        spec = importlib.machinery.PathFinder.find_spec(fullname, path, target)
+        if spec is not None and spec.loader is not None:
+            spec.loader = _TimedLoader(spec.loader, self.timings, fullname)
+        return spec
+
+    def __enter__(self):
+        sys.meta_path.insert(0, self)
+        return self
+
+    def __exit__(self, *exc):
+        sys.meta_path.remove(self)
+
+
+async def _import_timed(module: str) -> dict:
+    row = {"name": module, "import_s": None, "error": None}
+    started = time.perf_counter()
+    try:
+        await asyncio.to_thread(importlib.import_module, module)
+    except Exception as e:
+        # Left for the extension that needs it to fail on, with its own error
+        row["error"] = f"{type(e).__name__}: {e}"
+        return row
+    row["import_s"] = round(time.perf_counter() - started, 4)
+    return row
+
+
+async def load_extensions(bot, names: list, report_path: str = STARTUP_REPORT_PATH, trace_memory: bool = STARTUP_TRACE_MEMORY) -> dict:
+    """Load `names` as bot extensions and report what each one cost.
+
+    Dependencies are imported concurrently first, then each extension is loaded
+    with its module execution and `setup` timed separately. With
+    `trace_memory` the memory allocated by each extension is recorded too. The
+    report is printed and, unless `report_path` is empty, written as JSON. The
+    first extension failure is re-raised after reporting.
+    """
+    started_tracing = trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    tracing = tracemalloc.is_tracing()
+    started = time.perf_counter()
+    memory_start = tracemalloc.get_traced_memory()[0] if tracing else 0
+
+    dependencies = list(await asyncio.gather(*(_import_timed(module) for module in extension_dependencies(names))))
+    dependencies_s = round(time.perf_counter() - started, 4)
+
+    rows = []
+    errors = []
+    with _ExtensionTimer(names) as timer:
+        for name in names:
+            row = {"name": name, "load_s": None, "import_s": None, "setup_s": None, "memory_kb": None, "error": None}
+            rows.append(row)
+            memory_before = tracemalloc.get_traced_memory()[0] if tracing else 0
+            load_started = time.perf_counter()
+            try:
+                await bot.load_extension(name)
+            except Exception as e:
+                row["error"] = f"{type(e).__name__}: {e}"
+                errors.append(e)
+                continue
+            load_s = time.perf_counter() - load_started
+            import_s = timer.timings.get(name, 0.0)
+            row["load_s"] = round(load_s, 4)
+            row["import_s"] = round(import_s, 4)
+            row["setup_s"] = round(load_s - import_s, 4)
+            if tracing:
+                row["memory_kb"] = round((tracemalloc.get_traced_memory()[0] - memory_before) / 1024, 1)
+
+    report = {
+        "timestamp": time.time(),
+        "python": sys.version.split()[0],
+        "total_s": round(time.perf_counter() - started, 4),
+        "dependencies_s": dependencies_s,
+        "total_memory_kb": round((tracemalloc.get_traced_memory()[0] - memory_start) / 1024, 1) if tracing else None,
+        "dependencies": dependencies,
+        "extensions": rows,
+    }
+    if started_tracing:
+        tracemalloc.stop()
+
+    print_report(report)
+    if report_path:
+        try:
+            with open(report_path, "w") as f:
+                json.dump(report, f, indent=2)
+        except OSError as e:
+            print(f"Could not write startup report: {e}")
+    if errors:
+        raise errors[0]
+    return report
+
+
+def print_report(report: dict):
+    memory = f" (+{report['total_memory_kb'] / 1024:.1f} MB)" if report["total_memory_kb"] is not None else ""
+    print(f"Loaded {len(report['extensions'])} extension(s) in {report['total_s'] * 1000:.0f} ms{memory}")
+    if report["dependencies"]:
+        print(f"  {len(report['dependencies'])} shared import(s) in {report['dependencies_s'] * 1000:.0f} ms:")
+        for row in sorted(report["dependencies"], key=lambda row: row["import_s"] or 0, reverse=True):
+            if row["error"]:
+                print(f"    {row['name']:<22} FAILED {row['error']}")
+            else:
+                print(f"    {row['name']:<22} import {row['import_s'] * 1000:7.1f} ms")
+    for row in sorted(report["extensions"], key=lambda row: row["load_s"] or 0, reverse=True):
+        if row["error"]:
+            print(f"  {row['name']:<24} FAILED {row['error']}")
+            continue
+        line = f"  {row['name']:<24} import {row['import_s'] * 1000:7.1f} ms  setup {row['setup_s'] * 1000:7.1f} ms"
+        if row["memory_kb"] is not None:
+            line += f"  {row['memory_kb']:+8.1f} KB"
+        print(line)
@@ -0,0 +1,134 @@
+import sys
+from fnmatch import fnmatch
+
+TREE_OUTPUT_BUDGET = 1900
+
+
+class CompactTree:
+    """The paths of a recursive tree response and a dir flag per path, without a dict per entry.
+
+    A 100k-entry tree parsed from JSON takes tens of megabytes; this keeps a
+    fraction of that, and `nbytes` estimates it for size-bounded caches.
+    """
+
+    __slots__ = ("paths", "dirs", "truncated", "nbytes")
+
+    def __init__(self, tree_data: dict):
+        items = tree_data.get("tree", [])
+        self.paths = tuple(item["path"] for item in items)
+        self.dirs = bytes(item["type"] != "blob" for item in items)
+        self.truncated = bool(tree_data.get("truncated"))
+        self.nbytes = sys.getsizeof(self.paths) + sum(map(sys.getsizeof, self.paths)) + sys.getsizeof(self.dirs)
+
+    def entries(self):
+        return zip(self.paths, self.dirs)
+
+
+class TreeListing:
+    """A git tree flattened into depth-first order, ready to be rendered in pages.
+
+    Built once from the `tree` array of a recursive tree response (or a
+    CompactTree of it) in a single
+    sort plus two linear passes; rendering then walks forward from any entry and
+    stops as soon as the output budget is used up, so cost is proportional to
+    what is shown rather than to the size of the repository.
+    """
+
+    def __init__(self, tree_data, subdir: str = "", pattern: str = None, max_depth: int = None):
+        subdir = subdir.strip("/")
+        prefix = f"{subdir}/" if subdir else ""
+
+        if isinstance(tree_data, CompactTree):
+            items = tree_data.entries()
+        else:
+            items = ((item["path"], item["type"] != "blob") for item in tree_data)
+        entries = []
+        for path, is_dir in items:
+            if prefix:
+                if not path.startswith(prefix):
+                    continue
+                path = path[len(prefix):]
+            parts = path.split("/")
+            if max_depth is not None and len(parts) > max_depth:
+                continue
+            entries.append((parts, bool(is_dir)))
+
+        if pattern:
+            entries = self._filter(entries, pattern)
+
+        entries.sort(key=lambda entry: entry[0])
+        self.names = [parts[-1] for parts, _ in entries]
+        self.is_dir = [is_dir for _, is_dir in entries]
+        self.depth = [len(parts) - 1 for parts, _ in entries]
+        self.parent = self._parents(self.depth)
+        self.is_last = self._last_flags(self.depth)
+
+    def __len__(self):
+        return len(self.names)
+
+    @staticmethod
+    def _filter(entries, pattern):
+        # Keep matching entries plus the directories leading to them
+        keep = set()
+        for parts, _ in entries:
+            if fnmatch("/".join(parts), pattern) or fnmatch(parts[-1], pattern):
+                for i in range(1, len(parts) + 1):
+                    keep.add(tuple(parts[:i]))
+        return [entry for entry in entries if tuple(entry[0]) in keep]
+
+    @staticmethod
+    def _parents(depth):
+        parent = [-1] * len(depth)
+        stack = []
+        for i, d in enumerate(depth):
+            del stack[d:]
+            if stack:
+                parent[i] = stack[-1]
+            stack.append(i)
+        return parent
+
+    @staticmethod
+    def _last_flags(depth):
+        # Walking backwards, an entry is the last of its siblings if no later
+        # sibling has been seen since its parent's subtree started
+        is_last = [False] * len(depth)
+        seen = []
+        for i in range(len(depth) - 1, -1, -1):
+            d = depth[i]
+            del seen[d + 1:]
+            seen.extend([False] * (d + 1 - len(seen)))
+            is_last[i] = not seen[d]
+            seen[d] = True
+        return is_last
+
+    def _indent(self, index):
+        # One guide per ancestor, outermost first
+        guides = []
+        node = self.parent[index]
+        while node != -1:
+            guides.append("    " if self.is_last[node] else "│   ")
+            node = self.parent[node]
+        guides.reverse()
+        return guides
+
+    def render(self, start: int = 0, budget: int = TREE_OUTPUT_BUDGET):
+        """Render entries from `start` until `budget` characters; return (text, next_start)."""
+        lines = []
+        used = 0
+        guides = self._indent(start) if start < len(self) else []
+        i = start
+        while i < len(self):
+            d = self.depth[i]
+            del guides[d:]
+            name = self.names[i] + ("/" if self.is_dir[i] else "")
+            if d == 0:
+                line = name
+            else:
+                line = "".join(guides) + ("└── " if self.is_last[i] else "├── ") + name
+            if used + len(line) + 1 > budget and lines:
+                break
+            lines.append(line)
+            used += len(line) + 1
+            guides.append("    " if self.is_last[i] else "│   ")
+            i += 1
+        return "\n".join(lines), i
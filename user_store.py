@@ -0,0 +1,89 @@
+import os
+from typing import Optional
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import OperationFailure
+
+from metrics import track_call
+
+MONGO_URI = os.getenv("MONGO_URI")
+# Shared with the backend, which writes to the same database
+MONGO_DB = os.getenv("MONGO_DB", "gitbot")
+
+# Pool tuning, overridable from the environment
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "50"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "2"))
+MONGO_MAX_IDLE_MS = int(os.getenv("MONGO_MAX_IDLE_MS", "60000"))
+MONGO_TIMEOUT_MS = int(os.getenv("MONGO_TIMEOUT_MS", "5000"))
+
+
+class UserStore:
+    """Async access to the `users` collection (and the backend's `webhook_subscriptions`) in `MONGO_DB`
+    over the bot's single Mongo connection pool.
+
+    Owned by the bot as `bot.user_store`; cogs never open their own clients.
+    """
+
+    def __init__(self, uri: str = MONGO_URI, database: str = MONGO_DB):
+        self.client = AsyncIOMotorClient(
+            uri,
+            maxPoolSize=MONGO_MAX_POOL_SIZE,
+            minPoolSize=MONGO_MIN_POOL_SIZE,
+            maxIdleTimeMS=MONGO_MAX_IDLE_MS,
+            serverSelectionTimeoutMS=MONGO_TIMEOUT_MS,
+            appname="gitbot",
+        )
+        self.users = self.client[database].users
+        self.webhook_subscriptions = self.client[database].webhook_subscriptions
+
+    async def ensure_indexes(self):
+        try:
+            await self.users.create_index("discord_id", unique=True)
+        except OperationFailure as e:
+            # Legacy duplicate rows block a unique index; still index the lookups
+            print(f"Unique discord_id index failed ({e}); creating a non-unique index.")
+            await self.users.create_index("discord_id")
+        await self.webhook_subscriptions.create_index([("repo", 1), ("channel_id", 1)], unique=True)
+
+    async def find(self, discord_id, projection: dict = None) -> Optional[dict]:
+        async with track_call("mongo", "find"):
+            return await self.users.find_one({"discord_id": str(discord_id)}, projection)
+
+    async def set_notify(self, discord_id, **fields) -> bool:
+        """Update the user's notification subscription; False if the user is not linked."""
+        update = {f"notify.{name}": value for name, value in fields.items()}
+        async with track_call("mongo", "update"):
+            result = await self.users.update_one({"discord_id": str(discord_id)}, {"$set": update})
+        return bool(result.matched_count)
+
+    async def notify_subscribers(self) -> list:
+        async with track_call("mongo", "find"):
+            cursor = self.users.find({"notify.enabled": True}, {"_id": 0, "discord_id": 1, "notify": 1})
+            return await cursor.to_list(None)
+
+    async def watch(self, repo: str, channel_id, guild_id, events: list, private: bool = False):
+        """Subscribe a channel to a repository; `private` records that its access was checked for a private repo."""
+        async with track_call("mongo", "update"):
+            await self.webhook_subscriptions.update_one(
+                {"repo": repo.lower(), "channel_id": str(channel_id)},
+                {"$addToSet": {"events": {"$each": events}}, "$set": {"guild_id": str(guild_id), "private": private}},
+                upsert=True,
+            )
+
+    async def unwatch(self, repo: str, channel_id) -> bool:
+        async with track_call("mongo", "delete"):
+            result = await self.webhook_subscriptions.delete_one({"repo": repo.lower(), "channel_id": str(channel_id)})
+        return bool(result.deleted_count)
+
+    async def watched(self, guild_id) -> list:
+        async with track_call("mongo", "find"):
+            cursor = self.webhook_subscriptions.find({"guild_id": str(guild_id)}, {"_id": 0})
+            return await cursor.to_list(None)
+
+    async def delete(self, discord_id) -> bool:
+        async with track_call("mongo", "delete"):
+            result = await self.users.delete_one({"discord_id": str(discord_id)})
+        return bool(result.deleted_count)
+
+    def close(self):
+        self.client.close()
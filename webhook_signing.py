@@ -0,0 +1,18 @@
+import hashlib
+import hmac
+
+
+def repo_webhook_secret(master_secret: str, repo: str) -> str:
+    """Secret for one repository's hook, derived from `master_secret` (GITHUB_WEBHOOK_SECRET) so it cannot sign for any other."""
+    return hmac.new(master_secret.encode(), repo.lower().encode(), hashlib.sha256).hexdigest()
+
+
+def sign(secret: str, body: bytes) -> str:
+    """X-Hub-Signature-256 value for `body`: sha256=<hex HMAC of the raw body>, as GitHub sends it."""
+    return "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+def verify_signature(secret: str, body: bytes, signature: str) -> bool:
+    if not secret or not signature:
+        return False
+    return hmac.compare_digest(sign(secret, body), signature)